@@ -0,0 +1,246 @@
+"""
+Selectable backends for the inverse FFTs used to construct the wave fields.
+
+Three backends are available
+
+* *numpy*: the :mod:`numpy.fft` module. Single threaded, always allocates the output.
+  This is the default backend
+* *scipy*: the :mod:`scipy.fft` module, which is multi-threaded via the *workers*
+  argument and can overwrite its input
+* *pyfftw*: the FFTW library via the optional `pyFFTW` package. The FFTW plans are
+  cached per transform type, shape and data type, such that they are only created once
+
+The backend can be set globally with *set_default_fft_backend*, or per object by
+passing a backend name or :class:`FFTBackend` instance to the *fft_backend* argument of
+the wave classes.
+
+Examples
+--------
+
+>>> backend = FFTBackend("scipy", workers=2)
+>>> spectrum = np.fft.fft(np.arange(8.0))
+>>> bool(np.allclose(backend.ifft(spectrum).real, np.arange(8.0)))
+True
+
+"""
+
+import logging
+import os
+
+import numpy as np
+import scipy.fft
+
+try:
+    import pyfftw
+    import pyfftw.builders
+except ImportError:
+    pyfftw = None
+
+logger = logging.getLogger(__name__)
+
+FFT_BACKENDS = ("numpy", "scipy", "pyfftw")
+
+
+class FFTBackend:
+    """
+    Inverse FFTs of a selectable backend
+
+    Parameters
+    ----------
+    name: {"numpy", "scipy", "pyfftw"}
+        Name of the backend. Default = "numpy"
+    workers: int, optional
+        Number of threads used by the *scipy* and *pyfftw* backends. Negative values
+        count back from the number of CPUs, as in :mod:`scipy.fft`. Default = -1, i.e.
+        all CPUs
+    overwrite_x: bool, optional
+        Allow the *scipy* and *pyfftw* backends to overwrite the input array.
+        Default = False
+    planner_effort: str, optional
+        Planner effort of the FFTW plans of the *pyfftw* backend. Default =
+        "FFTW_MEASURE"
+
+    Notes
+    -----
+    * All the transforms accept an *out* array to store the result in. For the
+      *pyfftw* backend, the result is written directly into *out* by the cached plan,
+      such that a preallocated *out* saves the allocation of the output array. The
+      *numpy* and *scipy* backends always allocate the output and only copy it into
+      *out*, so passing *out* costs an extra copy. See *writes_to_out*
+    * The transforms accept an *overwrite_x* argument as well. Pass False in case the
+      input array must be preserved, even if the backend allows to overwrite it
+    * The *numpy* backend gives the exact same results as calling :mod:`numpy.fft`
+      directly
+    """
+
+    def __init__(
+        self, name="numpy", workers=-1, overwrite_x=False, planner_effort="FFTW_MEASURE"
+    ):
+        if name not in FFT_BACKENDS:
+            raise ValueError(
+                "FFT backend must be one of {}. Found {}".format(FFT_BACKENDS, name)
+            )
+        if name == "pyfftw" and pyfftw is None:
+            raise ImportError(
+                "The pyfftw FFT backend requires the pyFFTW package. Please install it "
+                "or select the numpy or scipy backend"
+            )
+        self.name = name
+        self.workers = workers
+        self.overwrite_x = overwrite_x
+        self.planner_effort = planner_effort
+
+        # cached FFTW plans with the transform type, shape, dtype and sizes as key
+        self.plans = dict()
+
+    def __getstate__(self):
+        # the FFTW plans can not be pickled. They are created again when required
+        state = self.__dict__.copy()
+        state["plans"] = dict()
+        return state
+
+    def __repr__(self):
+        return "FFTBackend(name={!r}, workers={})".format(self.name, self.workers)
+
+    @property
+    def n_threads(self):
+        """int: Number of threads corresponding to the *workers* attribute"""
+        if self.workers is None:
+            return 1
+        if self.workers < 0:
+            return max(1, (os.cpu_count() or 1) + 1 + self.workers)
+        return self.workers
+
+    @property
+    def writes_to_out(self):
+        """bool: True if the transforms write into *out* directly instead of copying"""
+        return self.name == "pyfftw"
+
+    def empty_out(self, shape, dtype):
+        """
+        Empty array to pass as *out* to the transforms
+
+        Parameters
+        ----------
+        shape: tuple
+            Shape of the output of the transform
+        dtype: dtype
+            Data type of the output of the transform
+
+        Returns
+        -------
+        ndarray
+            Empty array, which is aligned for FFTW in case of the *pyfftw* backend
+        """
+        if self.name == "pyfftw":
+            return pyfftw.empty_aligned(shape, dtype=dtype)
+        return np.empty(shape, dtype=dtype)
+
+    def ifft(self, a, n=None, axis=-1, out=None, overwrite_x=None):
+        """Inverse FFT along one axis. See :func:`numpy.fft.ifft`"""
+        return self._transform("ifft", a, out, overwrite_x, n=n, axis=axis)
+
+    def ifft2(self, a, s=None, axes=(-2, -1), out=None, overwrite_x=None):
+        """Inverse 2D FFT over two axes. See :func:`numpy.fft.ifft2`"""
+        return self._transform("ifft2", a, out, overwrite_x, s=s, axes=axes)
+
+    def irfft(self, a, n=None, axis=-1, out=None, overwrite_x=None):
+        """Inverse FFT of a half spectrum along one axis. See :func:`numpy.fft.irfft`"""
+        return self._transform("irfft", a, out, overwrite_x, n=n, axis=axis)
+
+    def irfft2(self, a, s=None, axes=(-2, -1), out=None, overwrite_x=None):
+        """Inverse 2D FFT of a half spectrum. See :func:`numpy.fft.irfft2`"""
+        return self._transform("irfft2", a, out, overwrite_x, s=s, axes=axes)
+
+    def _transform(self, kind, a, out, overwrite_x, **kwargs):
+        """Carry out the transform *kind* with the backend and store it in *out*"""
+        # the input may only be overwritten if both the backend and the caller allow it
+        overwrite_x = self.overwrite_x and overwrite_x is not False
+
+        if self.name == "pyfftw":
+            return self._pyfftw_transform(kind, a, out, overwrite_x, **kwargs)
+
+        if self.name == "scipy":
+            result = getattr(scipy.fft, kind)(
+                a, overwrite_x=overwrite_x, workers=self.n_threads, **kwargs
+            )
+        else:
+            result = getattr(np.fft, kind)(a, **kwargs)
+
+        if out is None:
+            return result
+        out[...] = result
+        return out
+
+    def _pyfftw_transform(self, kind, a, out, overwrite_x, **kwargs):
+        """Carry out the transform *kind* with a cached FFTW plan"""
+        a = np.asarray(a)
+        key = (kind, a.shape, a.dtype.str, overwrite_x) + tuple(
+            tuple(value) if isinstance(value, (list, tuple)) else value
+            for value in kwargs.values()
+        )
+        try:
+            plan = self.plans[key]
+        except KeyError:
+            logger.debug(f"Creating FFTW plan for {key}")
+            plan = getattr(pyfftw.builders, kind)(
+                a,
+                overwrite_input=overwrite_x,
+                planner_effort=self.planner_effort,
+                threads=self.n_threads,
+                **kwargs,
+            )
+            self.plans[key] = plan
+
+        if out is None:
+            out = pyfftw.empty_aligned(plan.output_shape, dtype=plan.output_dtype)
+        return plan(input_array=a, output_array=out)
+
+
+_default_fft_backend = FFTBackend()
+
+
+def set_default_fft_backend(backend="numpy", **kwargs):
+    """
+    Set the FFT backend used by all objects without their own backend
+
+    Parameters
+    ----------
+    backend: str or FFTBackend
+        Name of the backend or a backend instance. Default = "numpy"
+    kwargs:
+        Arguments passed to :class:`FFTBackend` in case *backend* is a name
+
+    Returns
+    -------
+    FFTBackend
+        The new default backend
+    """
+    global _default_fft_backend
+    if isinstance(backend, FFTBackend):
+        _default_fft_backend = backend
+    else:
+        _default_fft_backend = FFTBackend(backend, **kwargs)
+    return _default_fft_backend
+
+
+def get_fft_backend(backend=None):
+    """
+    Get the FFT backend belonging to *backend*
+
+    Parameters
+    ----------
+    backend: str, FFTBackend or None
+        Name of the backend, a backend instance, or None for the default backend set
+        with *set_default_fft_backend*. Default = None
+
+    Returns
+    -------
+    FFTBackend
+        The FFT backend
+    """
+    if backend is None:
+        return _default_fft_backend
+    if isinstance(backend, FFTBackend):
+        return backend
+    return FFTBackend(backend)
@@ -2,15 +2,28 @@
 Collection of functions dealing with geographical coordinates based on the *LatLon* module.
 """
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
 import fastkml as kml
 import numpy as np
 import pandas as pd
 from latloncalc.latlon import LatLon
 from scipy.constants import nautical_mile
+from scipy.spatial import cKDTree
 
 
 _logger = logging.getLogger(__name__)
 
+# semi-major axis in m and flattening of the WGS84 ellipsoid
+WGS84_SEMI_MAJOR_AXIS = 6378137.0
+WGS84_FLATTENING = 1 / 298.257223563
+
+# radius of the FAI sphere in m
+EARTH_RADIUS = 6371.0e3
+
+DISTANCE_METHODS = ("vincenty", "haversine")
+
 
 class LocationCheck(object):
     """
@@ -134,6 +147,262 @@ class LocationCheck(object):
         )
 
 
+class MultiLocationCheck(object):
+    """
+    Class to store many target locations in lat/lon and check if positions are out of
+    range of all of them
+
+    Parameters
+    ----------
+    longitudes : array_like
+        Longitudes of the target locations
+    latitudes : array_like
+        Latitudes of the target locations
+    distance_deviation_allowed: float, optional
+        Maximum allowed distance from the nearest target location in km, Default = 10 km
+    n_candidates: int, optional
+        Number of nearest targets on the sphere of which the distance is calculated on
+        the earth model given by *method* first. Only affects the speed, not the
+        result. Default = 4
+    method : {"vincenty", "haversine"}
+        Model of the earth. See `great_circle_distance_and_bearing` (Default value =
+        "vincenty")
+
+    Attributes
+    ----------
+    distance : ndarray
+        Distances in km to the nearest target of the positions of the last check
+    i_target : ndarray
+        Indices of the nearest target of the positions of the last check
+
+    Raises
+    ------
+    ValueError
+        In case the latitudes and longitudes of the targets do not have the same size or
+        are not finite
+
+    Examples
+    --------
+
+    Check the positions of a vessel against a port and two wind farms
+
+    >>> targets = MultiLocationCheck(latitudes=[51.95, 52.60, 54.03],
+    ...                              longitudes=[4.05, 4.40, 6.58],
+    ...                              distance_deviation_allowed=20)
+    >>> out_range = targets.out_of_range(current_latitudes=[51.90, 53.00, 53.95],
+    ...                                  current_longitudes=[4.10, 4.40, 6.40])
+    >>> out_range
+    array([False,  True, False])
+    >>> targets.i_target
+    array([0, 1, 2])
+    >>> np.round(targets.distance, 1)
+    array([ 6.5, 44.5, 14.8])
+
+    Notes
+    -----
+    * This is the batch version of :class:`LocationCheck` for many positions and
+      targets. The distances are equal to the distances of a :class:`LocationCheck` of
+      the nearest target, which uses the WGS84 ellipsoid as well
+    * The targets are stored in a KD-tree of their positions on the unit sphere, such
+      that the nearest targets of a position are found without calculating the
+      distance to all the targets. The straight line distance on the unit sphere
+      increases monotonically with the great circle distance, also across the 180th
+      meridian and the poles
+    * The distances of the *n_candidates* nearest targets on the sphere are calculated
+      on the ellipsoid and the nearest one is taken. The order on the sphere may differ
+      from the order on the ellipsoid, but a distance *s* on the ellipsoid spans an
+      angle of at most *s / radius_min* on the unit sphere, with *radius_min* the
+      meridional radius of curvature at the equator. In case the candidates do not
+      cover this angle, all the targets within it are checked as well, so the nearest
+      target on the ellipsoid is always found
+    """
+
+    def __init__(
+        self,
+        longitudes,
+        latitudes,
+        distance_deviation_allowed=10,
+        n_candidates=4,
+        method="vincenty",
+    ):
+        self.target_latitudes = np.atleast_1d(
+            np.asarray(latitudes, dtype=float)
+        ).ravel()
+        self.target_longitudes = np.atleast_1d(
+            np.asarray(longitudes, dtype=float)
+        ).ravel()
+        if self.target_latitudes.size != self.target_longitudes.size:
+            raise ValueError(
+                "Got {} latitudes and {} longitudes of the targets".format(
+                    self.target_latitudes.size, self.target_longitudes.size
+                )
+            )
+        if self.target_latitudes.size == 0 or not np.all(
+            np.isfinite(self.target_latitudes) & np.isfinite(self.target_longitudes)
+        ):
+            raise ValueError("The target locations must be given and finite")
+        if method not in DISTANCE_METHODS:
+            raise ValueError(
+                "method must be one of {}. Found {}".format(DISTANCE_METHODS, method)
+            )
+
+        self.distance_deviation_allowed = float(distance_deviation_allowed)
+        self.n_candidates = min(int(n_candidates), self.target_latitudes.size)
+        self.method = method
+        # the smallest ratio of a distance on the earth model in m and the angle on the
+        # unit sphere
+        if method == "vincenty":
+            self.radius_min = WGS84_SEMI_MAJOR_AXIS * (1 - WGS84_FLATTENING) ** 2
+        else:
+            self.radius_min = EARTH_RADIUS
+        self.tree = cKDTree(
+            _unit_sphere_coordinates(self.target_latitudes, self.target_longitudes)
+        )
+        self.distance = None
+        self.i_target = None
+
+    def nearest_target(self, current_latitudes, current_longitudes):
+        """
+        Get the nearest target location of positions and the distance to it
+
+        Parameters
+        ----------
+        current_latitudes : array_like
+            Latitudes of the positions
+        current_longitudes : array_like
+            Longitudes of the positions
+
+        Returns
+        -------
+        tuple (distance, i_target)
+            Arrays with the shape of the positions with the distance in km to the
+            nearest target and the index of that target. Invalid positions get a NaN
+            distance and index -1
+        """
+        latitudes, longitudes = np.broadcast_arrays(
+            np.asarray(current_latitudes, dtype=float),
+            np.asarray(current_longitudes, dtype=float),
+        )
+        shape = latitudes.shape
+        latitudes = latitudes.ravel()
+        longitudes = longitudes.ravel()
+
+        distance = np.full(latitudes.size, np.nan)
+        i_target = np.full(latitudes.size, -1, dtype=int)
+        is_valid = np.isfinite(latitudes) & np.isfinite(longitudes)
+        if np.any(is_valid):
+            latitudes = latitudes[is_valid, np.newaxis]
+            longitudes = longitudes[is_valid, np.newaxis]
+            points = _unit_sphere_coordinates(latitudes[:, 0], longitudes[:, 0])
+            chord_candidates, i_candidates = self.tree.query(
+                points, k=self.n_candidates
+            )
+            chord_candidates = chord_candidates.reshape(latitudes.size, -1)
+            i_candidates = i_candidates.reshape(latitudes.size, -1)
+            candidate_distance, _ = great_circle_distance_and_bearing(
+                latitudes,
+                longitudes,
+                self.target_latitudes[i_candidates],
+                self.target_longitudes[i_candidates],
+                method=self.method,
+            )
+            j_nearest = np.argmin(candidate_distance, axis=1)
+            i_rows = np.arange(latitudes.size)
+            nearest_distance = candidate_distance[i_rows, j_nearest]
+            nearest_target = i_candidates[i_rows, j_nearest]
+
+            # the chord on the unit sphere of the largest angle of a target which may be
+            # nearer on the earth model than the nearest candidate
+            angle_max = np.minimum(nearest_distance / self.radius_min, np.pi)
+            chord_max = 2 * np.sin(angle_max / 2) * (1 + 1e-9)
+            is_uncovered = chord_candidates[:, -1] < chord_max
+            if self.n_candidates < self.target_latitudes.size and np.any(is_uncovered):
+                i_check = np.flatnonzero(is_uncovered)
+                i_targets = self.tree.query_ball_point(
+                    points[i_check], r=chord_max[i_check]
+                )
+                i_check = np.repeat(i_check, [len(i_ball) for i_ball in i_targets])
+                i_targets = np.concatenate(i_targets).astype(int)
+                check_distance, _ = great_circle_distance_and_bearing(
+                    latitudes[i_check, 0],
+                    longitudes[i_check, 0],
+                    self.target_latitudes[i_targets],
+                    self.target_longitudes[i_targets],
+                    method=self.method,
+                )
+                # the nearest target of each position is the first one after sorting
+                order = np.lexsort((i_targets, check_distance, i_check))
+                i_check = i_check[order]
+                check_distance = check_distance[order]
+                i_targets = i_targets[order]
+                is_nearest = np.append(True, i_check[1:] != i_check[:-1])
+                nearest_distance[i_check[is_nearest]] = check_distance[is_nearest]
+                nearest_target[i_check[is_nearest]] = i_targets[is_nearest]
+
+            distance[is_valid] = nearest_distance / 1000
+            i_target[is_valid] = nearest_target
+
+        return distance.reshape(shape), i_target.reshape(shape)
+
+    def out_of_range(self, current_latitudes, current_longitudes):
+        """Check for all positions if they are outside the allowed distance of all
+        targets
+
+        Parameters
+        ----------
+        current_latitudes : array_like
+            Latitudes of the positions
+        current_longitudes : array_like
+            Longitudes of the positions
+
+        Returns
+        -------
+        ndarray
+            Boolean array with the shape of the positions which is True for the
+            positions further than `distance_deviation_allowed` from the nearest target.
+            Invalid positions are not out of range
+
+        Notes
+        -----
+        The distance to and the index of the nearest target are stored in the attributes
+        *distance* and *i_target*
+        """
+        self.distance, self.i_target = self.nearest_target(
+            current_latitudes, current_longitudes
+        )
+        out_of_range = self.distance > self.distance_deviation_allowed
+
+        _logger.debug(
+            "{} of {} positions out of range of {} targets".format(
+                np.count_nonzero(out_of_range),
+                out_of_range.size,
+                self.target_latitudes.size,
+            )
+        )
+
+        return out_of_range
+
+
+def _unit_sphere_coordinates(latitudes, longitudes):
+    """Get the cartesian coordinates on the unit sphere of latitudes and longitudes"""
+    latitudes = np.deg2rad(latitudes)
+    longitudes = np.deg2rad(longitudes)
+    cos_latitudes = np.cos(latitudes)
+    return np.stack(
+        (
+            cos_latitudes * np.cos(longitudes),
+            cos_latitudes * np.sin(longitudes),
+            np.sin(latitudes),
+        ),
+        axis=-1,
+    )
+
+
+def _to_date_time_series(date_time):
+    """Convert the date/times or strings to a Series of Timestamps with a range index"""
+    return pd.Series(pd.to_datetime(date_time)).reset_index(drop=True)
+
+
 def get_speed_from_distance_and_time(
     trajectory,
     distance_name="travel_distance",
@@ -213,7 +482,7 @@ def get_speed_from_distance_and_time(
         delete_datetime_column_at_end = True
 
     # make sure we are dealing with date/time, not strings
-    date_time = pd.Series([pd.Timestamp(t) for t in date_time])
+    date_time = _to_date_time_series(date_time)
 
     time_in_hour = (date_time - date_time[0]) / pd.Timedelta("1 hour")
     delta_time = time_in_hour.diff().fillna(1).values
@@ -222,15 +491,14 @@ def get_speed_from_distance_and_time(
 
     # with the diff method we can not get the first position. Just assume it to be the same as the
     # next one
-    trajectory.ix[0, speed_name] = trajectory.ix[1, speed_name]
+    if trajectory.index.size > 1:
+        i_speed = trajectory.columns.get_loc(speed_name)
+        trajectory.iloc[0, i_speed] = trajectory.iloc[1, i_speed]
 
-    trajectory[speed_name].fillna(0, inplace=True)
-
-    if speed_max_clip is not None:
-        # clip the speed above the threshold value with nan and then interpolate between the missing
-        # values
-        trajectory.ix[trajectory[speed_name] > speed_max_clip, speed_name] = np.nan
-        trajectory[speed_name].bfill(inplace=True)
+    # clip the speed above the threshold value and fill it with the next valid speed
+    trajectory[speed_name] = _fill_speeds(
+        trajectory[speed_name].to_numpy(), speed_max_clip
+    ).to_numpy()
 
     if delete_datetime_column_at_end:
         # only delete the date time column if we have created it internally
@@ -239,12 +507,362 @@ def get_speed_from_distance_and_time(
     return trajectory
 
 
+def haversine_distance_and_bearing(
+    latitude_1, longitude_1, latitude_2, longitude_2, radius=EARTH_RADIUS
+):
+    """
+    Calculate the great circle distance and initial bearing on a sphere
+
+    Parameters
+    ----------
+    latitude_1 : array_like
+        Latitudes of the start points in degrees
+    longitude_1 : array_like
+        Longitudes of the start points in degrees
+    latitude_2 : array_like
+        Latitudes of the end points in degrees
+    longitude_2 : array_like
+        Longitudes of the end points in degrees
+    radius : float, optional
+        Radius of the sphere in m. Default = 6371 km, the FAI sphere
+
+    Returns
+    -------
+    tuple (distance, bearing)
+        Arrays with the distance in m and the initial bearing in degrees in the range
+        [-180, 180] from the start to the end points
+
+    Examples
+    --------
+
+    >>> distance, bearing = haversine_distance_and_bearing(0, 179.5, 0, -179.5)
+    >>> print("{:.1f} km {:.1f}".format(distance / 1000, bearing))
+    111.2 km 90.0
+
+    Notes
+    -----
+    * All the input arrays are broadcast against each other
+    * Invalid coordinates, such as NaN, give a NaN distance and bearing
+    """
+    phi_1 = np.deg2rad(latitude_1)
+    phi_2 = np.deg2rad(latitude_2)
+    delta_lambda = np.deg2rad(np.subtract(longitude_2, longitude_1))
+
+    sin_half_delta_phi = np.sin((phi_2 - phi_1) / 2)
+    sin_half_delta_lambda = np.sin(delta_lambda / 2)
+    cos_phi_1 = np.cos(phi_1)
+    cos_phi_2 = np.cos(phi_2)
+
+    a = sin_half_delta_phi**2 + cos_phi_1 * cos_phi_2 * sin_half_delta_lambda**2
+    distance = 2 * radius * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+    bearing = np.arctan2(
+        np.sin(delta_lambda) * cos_phi_2,
+        cos_phi_1 * np.sin(phi_2) - np.sin(phi_1) * cos_phi_2 * np.cos(delta_lambda),
+    )
+
+    return distance, np.rad2deg(bearing)
+
+
+def vincenty_distance_and_bearing(
+    latitude_1,
+    longitude_1,
+    latitude_2,
+    longitude_2,
+    tolerance=1e-12,
+    max_iterations=200,
+):
+    """
+    Calculate the distance and initial bearing on the WGS84 ellipsoid
+
+    Parameters
+    ----------
+    latitude_1 : array_like
+        Latitudes of the start points in degrees
+    longitude_1 : array_like
+        Longitudes of the start points in degrees
+    latitude_2 : array_like
+        Latitudes of the end points in degrees
+    longitude_2 : array_like
+        Longitudes of the end points in degrees
+    tolerance : float, optional
+        Convergence tolerance of the longitude on the auxiliary sphere in rad.
+        Default = 1e-12
+    max_iterations : int, optional
+        Maximum number of iterations. Default = 200
+
+    Returns
+    -------
+    tuple (distance, bearing)
+        Arrays with the distance in m and the initial bearing in degrees in the range
+        [-180, 180] from the start to the end points
+
+    Examples
+    --------
+
+    >>> distance, bearing = vincenty_distance_and_bearing(55.40, 3.34, 55.15, 3.29)
+    >>> print("{:.3f} m {:.4f}".format(distance, bearing))
+    28012.971 m -173.4658
+
+    Notes
+    -----
+    * The inverse formula of Vincenty (1975) is iterated for all the coordinates at
+      once, until the longitudes of all the points have converged. The accuracy is in
+      the order of 0.1 mm. The result of a point does not depend on the other points
+    * For nearly antipodal points the iteration may not converge. For those points
+      the haversine distance and bearing on a sphere with the mean radius of the
+      ellipsoid are used and a warning is logged
+    * Invalid coordinates, such as NaN, give a NaN distance and bearing
+    """
+    a = WGS84_SEMI_MAJOR_AXIS
+    f = WGS84_FLATTENING
+    b = (1 - f) * a
+
+    latitude_1, longitude_1, latitude_2, longitude_2 = np.broadcast_arrays(
+        *[
+            np.asarray(value, dtype=float)
+            for value in (latitude_1, longitude_1, latitude_2, longitude_2)
+        ]
+    )
+
+    u_1 = np.arctan((1 - f) * np.tan(np.deg2rad(latitude_1)))
+    u_2 = np.arctan((1 - f) * np.tan(np.deg2rad(latitude_2)))
+    sin_u_1, cos_u_1 = np.sin(u_1), np.cos(u_1)
+    sin_u_2, cos_u_2 = np.sin(u_2), np.cos(u_2)
+
+    # the difference in longitude in the range [-pi, pi], such that crossing the
+    # 180-meridian is handled
+    delta_lon = np.angle(np.exp(1j * np.deg2rad(longitude_2 - longitude_1)))
+
+    # iterate the longitude on the auxiliary sphere. A converged point is not updated
+    # anymore, such that its result does not depend on the other points
+    lambda_ = delta_lon.copy()
+    converged = ~np.isfinite(lambda_ + u_1 + u_2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for _ in range(max_iterations):
+            (
+                sin_sigma,
+                cos_sigma,
+                sigma,
+                sin_alpha,
+                cos_sq_alpha,
+                cos_2_sigma_m,
+            ) = _vincenty_auxiliary_sphere(lambda_, sin_u_1, cos_u_1, sin_u_2, cos_u_2)
+            c = f / 16 * cos_sq_alpha * (4 + f * (4 - 3 * cos_sq_alpha))
+            lambda_next = delta_lon + (1 - c) * f * sin_alpha * (
+                sigma
+                + c
+                * sin_sigma
+                * (cos_2_sigma_m + c * cos_sigma * (-1 + 2 * cos_2_sigma_m**2))
+            )
+            lambda_next = np.where(converged, lambda_, lambda_next)
+            converged |= abs(lambda_next - lambda_) <= tolerance
+            lambda_ = lambda_next
+            if converged.all():
+                break
+
+        (
+            sin_sigma,
+            cos_sigma,
+            sigma,
+            sin_alpha,
+            cos_sq_alpha,
+            cos_2_sigma_m,
+        ) = _vincenty_auxiliary_sphere(lambda_, sin_u_1, cos_u_1, sin_u_2, cos_u_2)
+        u_sq = cos_sq_alpha * (a**2 - b**2) / b**2
+        a_coefficient = 1 + u_sq / 16384 * (
+            4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq))
+        )
+        b_coefficient = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+        delta_sigma = (
+            b_coefficient
+            * sin_sigma
+            * (
+                cos_2_sigma_m
+                + b_coefficient
+                / 4
+                * (
+                    cos_sigma * (-1 + 2 * cos_2_sigma_m**2)
+                    - b_coefficient
+                    / 6
+                    * cos_2_sigma_m
+                    * (-3 + 4 * sin_sigma**2)
+                    * (-3 + 4 * cos_2_sigma_m**2)
+                )
+            )
+        )
+        distance = b * a_coefficient * (sigma - delta_sigma)
+
+        bearing = np.arctan2(
+            cos_u_2 * np.sin(lambda_),
+            cos_u_1 * sin_u_2 - sin_u_1 * cos_u_2 * np.cos(lambda_),
+        )
+    bearing = np.rad2deg(bearing)
+
+    if not converged.all():
+        _logger.warning(
+            "Vincenty's formula did not converge for {} nearly antipodal points. Using "
+            "the haversine formula for those".format(np.sum(~converged))
+        )
+        mean_radius = (2 * a + b) / 3
+        distance_sphere, bearing_sphere = haversine_distance_and_bearing(
+            latitude_1, longitude_1, latitude_2, longitude_2, radius=mean_radius
+        )
+        distance = np.where(converged, distance, distance_sphere)
+        bearing = np.where(converged, bearing, bearing_sphere)
+
+    return distance, bearing
+
+
+def _vincenty_auxiliary_sphere(lambda_, sin_u_1, cos_u_1, sin_u_2, cos_u_2):
+    """Get the angles on the auxiliary sphere of Vincenty's formula for a longitude"""
+    sin_lambda, cos_lambda = np.sin(lambda_), np.cos(lambda_)
+    sin_sigma = np.hypot(
+        cos_u_2 * sin_lambda, cos_u_1 * sin_u_2 - sin_u_1 * cos_u_2 * cos_lambda
+    )
+    cos_sigma = sin_u_1 * sin_u_2 + cos_u_1 * cos_u_2 * cos_lambda
+    sigma = np.arctan2(sin_sigma, cos_sigma)
+
+    # coincident points have sin_sigma = 0
+    sin_alpha = np.where(sin_sigma > 0, cos_u_1 * cos_u_2 * sin_lambda / sin_sigma, 0.0)
+    cos_sq_alpha = 1 - sin_alpha**2
+
+    # on the equator cos_sq_alpha = 0
+    cos_2_sigma_m = np.where(
+        cos_sq_alpha > 0, cos_sigma - 2 * sin_u_1 * sin_u_2 / cos_sq_alpha, 0.0
+    )
+    return sin_sigma, cos_sigma, sigma, sin_alpha, cos_sq_alpha, cos_2_sigma_m
+
+
+def great_circle_distance_and_bearing(
+    latitude_1, longitude_1, latitude_2, longitude_2, method="vincenty"
+):
+    """
+    Calculate the distance and initial bearing between coordinates
+
+    Parameters
+    ----------
+    latitude_1 : array_like
+        Latitudes of the start points in degrees
+    longitude_1 : array_like
+        Longitudes of the start points in degrees
+    latitude_2 : array_like
+        Latitudes of the end points in degrees
+    longitude_2 : array_like
+        Longitudes of the end points in degrees
+    method : {"vincenty", "haversine"}
+        Model of the earth: the WGS84 ellipsoid with Vincenty's formula or a sphere
+        with the haversine formula. Default = "vincenty"
+
+    Returns
+    -------
+    tuple (distance, bearing)
+        Arrays with the distance in m and the initial bearing in degrees in the range
+        [-180, 180] from the start to the end points
+
+    See Also
+    --------
+    vincenty_distance_and_bearing : distance and bearing on the WGS84 ellipsoid
+    haversine_distance_and_bearing : distance and bearing on a sphere
+    """
+    if method == "vincenty":
+        return vincenty_distance_and_bearing(
+            latitude_1, longitude_1, latitude_2, longitude_2
+        )
+    if method == "haversine":
+        return haversine_distance_and_bearing(
+            latitude_1, longitude_1, latitude_2, longitude_2
+        )
+    raise ValueError(
+        "method must be one of {}. Found {}".format(DISTANCE_METHODS, method)
+    )
+
+
+def _fill_invalid_coordinates(latitudes, longitudes, group=None):
+    """
+    Replace the invalid coordinates by the last valid coordinate before them
+
+    Rows of which the latitude or longitude is not finite get both coordinates of the
+    last valid row, or NaN if there is none. With *group*, the coordinates are only
+    filled from the rows of the same group. Returns the filled latitudes and
+    longitudes, and a boolean array which is True for the valid rows
+    """
+    is_valid = np.isfinite(latitudes) & np.isfinite(longitudes)
+    coordinates = pd.DataFrame(
+        {
+            "latitude": np.where(is_valid, latitudes, np.nan),
+            "longitude": np.where(is_valid, longitudes, np.nan),
+        }
+    )
+    if group is None:
+        coordinates = coordinates.ffill()
+    else:
+        coordinates = coordinates.groupby(group).ffill()
+    return (
+        coordinates["latitude"].to_numpy(),
+        coordinates["longitude"].to_numpy(),
+        is_valid,
+    )
+
+
+def _travel_steps(latitudes, longitudes, is_valid, method):
+    """
+    Get the displacement in nautical miles and the heading of the steps between rows
+
+    The coordinates must be filled with `_fill_invalid_coordinates` first. Steps which
+    are not finite, such as the steps before the first valid coordinate, have no
+    displacement. The heading of a step to an invalid row is NaN, such that it is
+    filled backwards from the next valid step. Returns the displacements and headings
+    of the n - 1 steps between the n rows
+    """
+    distance, bearing = great_circle_distance_and_bearing(
+        latitudes[:-1], longitudes[:-1], latitudes[1:], longitudes[1:], method=method
+    )
+    bearing[~is_valid[1:]] = np.nan
+    displacement = distance / nautical_mile
+    displacement[~np.isfinite(displacement)] = 0
+    return displacement, bearing
+
+
+def _fill_headings(headings, group=None):
+    """
+    Fill the missing headings backwards and wrap them to the range 0 - 360
+
+    With *group*, the headings are only filled from the rows of the same group.
+    Returns a Series with a range index
+    """
+    headings = pd.Series(headings)
+    if group is None:
+        headings = headings.bfill()
+    else:
+        headings = headings.groupby(group).bfill()
+    return headings.mod(360)
+
+
+def _fill_speeds(speeds, speed_max_clip, group=None):
+    """
+    Replace the missing speeds by zero and the clipped speeds by the next valid speed
+
+    The speeds above *speed_max_clip* are clipped. With *group*, the speeds are only
+    filled from the rows of the same group. Returns a Series with a range index
+    """
+    speeds = pd.Series(speeds).fillna(0)
+    if speed_max_clip is not None:
+        speeds[speeds > speed_max_clip] = np.nan
+        if group is None:
+            speeds = speeds.bfill()
+        else:
+            speeds = speeds.groupby(group).bfill()
+    return speeds
+
+
 def travel_distance_and_heading_from_coordinates(
     db,
     latitude_name="GPS_LATITUDE",
     longitude_name="GPS_LONGITUDE",
     heading_name="HEADING",
     travel_distance_name="travel_distance",
+    method="vincenty",
 ):
     """
     Calculate the travel distance and optionally the heading based on the latitude and longitude
@@ -264,6 +882,9 @@ def travel_distance_and_heading_from_coordinates(
     travel_distance_name : str, optional
         name of the newly created column with the travel distance in nautical miles
         (Default value = "travel_distance")
+    method : {"vincenty", "haversine"}
+        Model of the earth used for the distances and headings. See
+        `great_circle_distance_and_bearing` (Default value = "vincenty")
 
     Returns
     -------
@@ -313,8 +934,11 @@ def travel_distance_and_heading_from_coordinates(
     * The DataFrame `db` must have at least two columns containing the latitude and longitude. In
       case more columns are present this is not a problem: all columns will be copied the the output
     * Based on the latitude and longitude values, the travel distance and heading is calculated
-      using the LatLon package * In case the heading field already exists, only the missing
-      values will be updated.
+      for all the rows at once with `great_circle_distance_and_bearing`.
+    * Rows with invalid coordinates, such as NaN, get the coordinates of the last valid
+      row. They do not add to the travel distance and the next valid row is measured
+      from the last valid coordinate. Their heading and the heading of the valid row
+      before them is the heading from the last valid to the next valid coordinate.
     * The column names of the latitude, longitude, distance and headding can be defined via the
       arguments of the function.
 
@@ -327,10 +951,8 @@ def travel_distance_and_heading_from_coordinates(
 
     n_rows = db.index.size
 
-    last_coordinates = None
-
-    # create a list with the current distances (starting with 0 for the first location)
-    delta_distance = [0]
+    # create an array with the current distances, starting with 0 for the first location
+    delta_distance = np.zeros(1)
     try:
         headings = db[heading_name].values
     except KeyError:
@@ -341,51 +963,502 @@ def travel_distance_and_heading_from_coordinates(
             _logger.debug("empty heading. filling it with zeros")
             headings = np.zeros(n_rows)
 
-    _logger.debug("Start loop {} ".format(LatLon))
-    # loop over all the lines
-    for i in range(n_rows):
-        # get the coordinates from the GPS_LATITUDE and GPS_LONGITUDE columns and turn into a LatLon
-        # object
-        latitude = db[latitude_name].values[i]
-        longitude = db[longitude_name].values[i]
-        _logger.debug("Converting {} {} with {}".format(latitude, longitude, LatLon))
-        coordinates = LatLon(latitude, longitude)
-
-        if last_coordinates is None:
-            # for the first row, the travel distance =0, just store the coordinates
-            last_coordinates = coordinates
-        else:
-            # for all other row, calculate the travel distance wro the last position. Convert to
-            # miles
-            try:
-                displacement = coordinates.distance(last_coordinates) / (
-                    nautical_mile / 1000.0
-                )
-            except ValueError:
-                displacement = 0
-
-            # now store the displacement and the current position to last_position for the next row
-            delta_distance.append(displacement)
+    latitudes, longitudes, is_valid = _fill_invalid_coordinates(
+        db[latitude_name].to_numpy(dtype=float),
+        db[longitude_name].to_numpy(dtype=float),
+    )
 
-            # heading from last coordinate to coordinate
-            try:
-                headings[i - 1] = last_coordinates.heading_initial(coordinates)
-                headings[i] = headings[i - 1]
-            except ValueError:
-                headings[i] = np.nan
+    # the distance and heading from each row to the next row, for all rows at once. The
+    # heading of a step to an invalid row is taken from the next valid row
+    displacement, bearing = _travel_steps(latitudes, longitudes, is_valid, method)
+    delta_distance = np.append(delta_distance, displacement)
 
-            # finally, update the last_coordinates with the current
-            last_coordinates = coordinates
+    # the heading of each row is the heading to the next row. The last row gets the
+    # heading of the row before
+    if n_rows > 1:
+        headings = np.append(bearing, bearing[-1])
 
     # turn the displacement array into a cumulative sum to get the total travel distance
-    db[travel_distance_name] = np.array(delta_distance).cumsum()
-    db[heading_name] = headings
-    db[heading_name].bfill(inplace=True)
-    db[heading_name] = db[heading_name].mod(360)
+    db[travel_distance_name] = delta_distance.cumsum()
+    db[heading_name] = _fill_headings(headings).to_numpy()
 
     return db
 
 
+def process_trajectory_chunks(
+    chunks,
+    latitude_name="GPS_LATITUDE",
+    longitude_name="GPS_LONGITUDE",
+    heading_name="HEADING",
+    travel_distance_name="travel_distance",
+    speed_name="speed_sustained",
+    datetime_name="DateTime",
+    travel_time_name="travel_time",
+    speed_max_clip=None,
+    method="vincenty",
+):
+    """
+    Calculate the travel distance, heading and speed of a trajectory given in chunks
+
+    Parameters
+    ----------
+    chunks : iterable of DataFrame
+        Consecutive chunks of the trajectory, such as returned by `pd.read_csv` with the
+        *chunksize* argument
+    latitude_name : str, optional
+         Name of the latitude column (Default value = "GPS_LATITUDE")
+    longitude_name : str, optional
+         Name of the longitude column (Default value = "GPS_LONGITUDE")
+    heading_name : str, optional
+        Name of the heading column (Default value = "HEADING")
+    travel_distance_name : str, optional
+        Name of the travel distance column (Default value = "travel_distance")
+    speed_name : str, optional
+        Name of the speed column (Default value = "speed_sustained")
+    datetime_name : str, optional
+        Name of the column with the date time. In case the column does not exist, the
+        index is used (Default value = "DateTime")
+    travel_time_name : str, optional
+        Name of the travel time column (Default value = "travel_time")
+    speed_max_clip : float, optional
+        Replace all speeds above this value in knots by the next valid speed. Default
+        value = None, which means that the speed is not clipped
+    method : {"vincenty", "haversine"}
+        Model of the earth. See `great_circle_distance_and_bearing` (Default value =
+        "vincenty")
+
+    Yields
+    ------
+    DataFrame
+        The rows of the trajectory with the travel distance, heading, travel time and
+        speed columns added
+
+    Examples
+    --------
+
+    >>> data = pd.DataFrame(
+    ...     index=pd.date_range(start="20160101", end="20160101T120000", freq="3h")
+    ... )
+    >>> data["GPS_LATITUDE"] = np.linspace(start=55.4, stop=54.4, num=data.index.size)
+    >>> data["GPS_LONGITUDE"] = np.linspace(start=3.34, stop=3.14, num=data.index.size)
+    >>> chunks = [data.iloc[i_start : i_start + 2] for i_start in range(0, 5, 2)]
+    >>> result = pd.concat(process_trajectory_chunks(chunks))
+    >>> result[["travel_distance", "HEADING", "speed_sustained"]]
+                         travel_distance     HEADING  speed_sustained
+    2016-01-01 00:00:00         0.000000  186.534194         5.041932
+    2016-01-01 03:00:00        15.125795  186.574900         5.041932
+    2016-01-01 06:00:00        30.252197  186.615478         5.042134
+    2016-01-01 09:00:00        45.379211  186.655928         5.042338
+    2016-01-01 12:00:00        60.506836  186.655928         5.042542
+
+    Notes
+    -----
+    * The concatenated chunks are identical to the result of
+      `travel_distance_and_heading_from_coordinates` followed by
+      `get_speed_from_distance_and_time` on the whole trajectory
+    * The last valid coordinate, travel distance and time are carried over to the next
+      chunk.
+      The heading of a row depends on the next row and the missing headings and
+      clipped speeds are filled backwards, so rows are only yielded once their values
+      are known. The other rows are kept until the next chunk, such that the memory
+      usage is bounded by the chunk size, plus the length of the longest run of
+      invalid headings or clipped speeds
+    * Empty chunks are skipped. The yielded chunks may therefore have another size than
+      the input chunks
+
+    See Also
+    --------
+    travel_distance_and_heading_from_coordinates : travel distance from coordinates
+    get_speed_from_distance_and_time : calculate the speed from the distance and time
+    """
+    # the rows which are not yielded yet with their heading and raw speed
+    pending = None
+    pending_headings = np.empty(0)
+    pending_speeds = np.empty(0)
+
+    # the values of the last row carried over to the next chunk
+    last_latitude = None
+    last_longitude = None
+    last_distance = 0.0
+    last_time = None
+    start_time = None
+    last_bearing = None
+    first_heading = 0.0
+    first_speed_is_set = False
+
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        chunk = chunk.copy()
+        latitudes = chunk[latitude_name].to_numpy(dtype=float)
+        longitudes = chunk[longitude_name].to_numpy(dtype=float)
+
+        try:
+            date_time = chunk[datetime_name]
+        except KeyError:
+            date_time = chunk.index
+        date_time = _to_date_time_series(date_time)
+
+        is_first_chunk = last_latitude is None
+        if is_first_chunk:
+            start_time = date_time[0]
+            if heading_name in chunk.columns and chunk.index.size == 1:
+                first_heading = float(chunk[heading_name].iloc[0])
+        else:
+            # prepend the last valid coordinate of the previous chunk for the first step
+            latitudes = np.append(last_latitude, latitudes)
+            longitudes = np.append(last_longitude, longitudes)
+        latitudes, longitudes, is_valid = _fill_invalid_coordinates(
+            latitudes, longitudes
+        )
+
+        displacement, bearing = _travel_steps(latitudes, longitudes, is_valid, method)
+        if bearing.size > 0:
+            last_bearing = bearing[-1]
+        travel_distance = np.append(last_distance, displacement).cumsum()
+
+        time_in_hour = ((date_time - start_time) / pd.Timedelta("1 hour")).to_numpy()
+        if is_first_chunk:
+            delta_distance = np.append(0.0, np.diff(travel_distance))
+            delta_time = np.append(1.0, np.diff(time_in_hour))
+        else:
+            # the first bearing belongs to the last pending row
+            pending_headings[-1] = bearing[0]
+            bearing = bearing[1:]
+            delta_distance = np.diff(travel_distance)
+            delta_time = np.diff(np.append(last_time, time_in_hour))
+            travel_distance = travel_distance[1:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            speeds = delta_distance / delta_time
+        last_latitude = latitudes[-1]
+        last_longitude = longitudes[-1]
+        last_distance = travel_distance[-1]
+        last_time = time_in_hour[-1]
+
+        # the heading of the last row is only known with the next chunk
+        chunk[travel_distance_name] = travel_distance
+        chunk[heading_name] = np.nan
+        chunk[travel_time_name] = time_in_hour
+        chunk[speed_name] = np.nan
+
+        if pending is None:
+            pending = chunk
+        else:
+            pending = pd.concat([pending, chunk])
+        pending_headings = np.append(pending_headings, np.append(bearing, np.nan))
+        pending_speeds = np.append(pending_speeds, speeds)
+
+        # the first row of the trajectory gets the speed of the second row
+        if not first_speed_is_set:
+            if pending_speeds.size < 2:
+                continue
+            pending_speeds[0] = pending_speeds[1]
+            first_speed_is_set = True
+
+        pending, pending_headings, pending_speeds, ready = _release_trajectory_rows(
+            pending,
+            pending_headings,
+            pending_speeds,
+            heading_name,
+            speed_name,
+            speed_max_clip,
+            is_final=False,
+        )
+        if ready is not None:
+            yield ready
+
+    if pending is None or pending.empty:
+        return
+
+    # the last row gets the heading of the row before
+    pending_headings[-1] = last_bearing if last_bearing is not None else first_heading
+    pending, pending_headings, pending_speeds, ready = _release_trajectory_rows(
+        pending,
+        pending_headings,
+        pending_speeds,
+        heading_name,
+        speed_name,
+        speed_max_clip,
+        is_final=True,
+    )
+    yield ready
+
+
+def _release_trajectory_rows(
+    pending, headings, speeds, heading_name, speed_name, speed_max_clip, is_final
+):
+    """
+    Get the leading rows of a trajectory of which the heading and speed are known
+
+    Parameters
+    ----------
+    pending : DataFrame
+        Rows of the trajectory which have not been released yet
+    headings : ndarray
+        Headings of the pending rows, with the unknown heading of the last row
+    speeds : ndarray
+        Raw speeds of the pending rows
+    heading_name : str
+        Name of the heading column
+    speed_name : str
+        Name of the speed column
+    speed_max_clip : float or None
+        Maximum speed
+    is_final : bool
+        True for the last rows of the trajectory, which are all released
+
+    Returns
+    -------
+    tuple (pending, headings, speeds, ready)
+        The rows which are kept with their headings and speeds, and the released rows
+        or None if no rows can be released
+    """
+    n_known = headings.size if is_final else headings.size - 1
+    headings_known = _fill_headings(headings[:n_known])
+    speeds_known = _fill_speeds(speeds, speed_max_clip)
+
+    # after the backward fill the invalid values are only found at the end
+    if is_final:
+        n_ready = pending.index.size
+    else:
+        n_ready = min(headings_known.count(), speeds_known.count())
+    if n_ready == 0:
+        return pending, headings, speeds, None
+
+    ready = pending.iloc[:n_ready].copy()
+    ready[heading_name] = headings_known.iloc[:n_ready].to_numpy()
+    ready[speed_name] = speeds_known.iloc[:n_ready].to_numpy()
+
+    pending = pending.iloc[n_ready:]
+    return pending, headings[n_ready:], speeds[n_ready:], ready
+
+
+def trajectories_by_vessel(
+    db,
+    vessel_name="MMSI",
+    latitude_name="GPS_LATITUDE",
+    longitude_name="GPS_LONGITUDE",
+    heading_name="HEADING",
+    travel_distance_name="travel_distance",
+    speed_name="speed_sustained",
+    datetime_name="DateTime",
+    travel_time_name="travel_time",
+    speed_max_clip=None,
+    method="vincenty",
+    n_workers=None,
+):
+    """
+    Calculate the travel distance, heading and speed of the trajectories of many vessels
+
+    Parameters
+    ----------
+    db : DataFrame
+        Table with the positions of all the vessels. The rows of each vessel must be in
+        order of time, but the vessels may be interleaved
+    vessel_name : str, optional
+        Name of the column with the vessel identifier (Default value = "MMSI")
+    latitude_name : str, optional
+         Name of the latitude column (Default value = "GPS_LATITUDE")
+    longitude_name : str, optional
+         Name of the longitude column (Default value = "GPS_LONGITUDE")
+    heading_name : str, optional
+        Name of the heading column (Default value = "HEADING")
+    travel_distance_name : str, optional
+        Name of the travel distance column (Default value = "travel_distance")
+    speed_name : str, optional
+        Name of the speed column (Default value = "speed_sustained")
+    datetime_name : str, optional
+        Name of the column with the date time. In case the column does not exist, the
+        index is used (Default value = "DateTime")
+    travel_time_name : str, optional
+        Name of the travel time column (Default value = "travel_time")
+    speed_max_clip : float, optional
+        Replace all speeds above this value in knots by the next valid speed of the same
+        vessel. Default value = None, which means that the speed is not clipped
+    method : {"vincenty", "haversine"}
+        Model of the earth. See `great_circle_distance_and_bearing` (Default value =
+        "vincenty")
+    n_workers : int, optional
+        Number of processes over which the vessels are distributed. Default = None, i.e.
+        all vessels are calculated in the current process
+
+    Returns
+    -------
+    DataFrame
+        Copy of `db` in the same row order with the travel distance, heading, travel
+        time and speed columns added, calculated per vessel
+
+    Examples
+    --------
+
+    >>> data = pd.DataFrame(
+    ...     {
+    ...         "MMSI": [1, 2, 1, 2, 1, 2],
+    ...         "GPS_LATITUDE": [55.0, 10.0, 55.1, 10.0, 55.2, 10.0],
+    ...         "GPS_LONGITUDE": [3.0, 4.0, 3.0, 4.1, 3.0, 4.2],
+    ...     },
+    ...     index=pd.date_range(start="20160101", periods=3, freq="1h").repeat(2),
+    ... )
+    >>> result = trajectories_by_vessel(data)
+    >>> result[["MMSI", "travel_distance", "HEADING", "speed_sustained"]]
+                         MMSI  travel_distance    HEADING  speed_sustained
+    2016-01-01 00:00:00     1         0.000000   0.000000         6.011039
+    2016-01-01 00:00:00     2         0.000000  89.991318         5.920052
+    2016-01-01 01:00:00     1         6.011039   0.000000         6.011039
+    2016-01-01 01:00:00     2         5.920052  89.991318         5.920052
+    2016-01-01 02:00:00     1        12.022178   0.000000         6.011139
+    2016-01-01 02:00:00     2        11.840104  89.991318         5.920052
+
+    Notes
+    -----
+    * The result of each vessel equals the result of
+      `travel_distance_and_heading_from_coordinates` followed by
+      `get_speed_from_distance_and_time` on the rows of that vessel only, up to the
+      rounding of the cumulative travel distance
+    * The table is sorted once by vessel with a stable sort, such that the rows of a
+      vessel keep their order. The distances and headings of all the vessels are then
+      calculated in one call of `great_circle_distance_and_bearing`, and the cumulative
+      distances, travel times and filled values are reset at the first row of each
+      vessel
+    * With `n_workers`, the sorted table is split at the vessel boundaries into blocks
+      with about the same number of rows, which are calculated by a pool of processes
+
+    See Also
+    --------
+    travel_distance_and_heading_from_coordinates : travel distance from coordinates
+    get_speed_from_distance_and_time : calculate the speed from the distance and time
+    """
+    order = np.argsort(db[vessel_name].to_numpy(), kind="stable")
+    trajectories = db.iloc[order].copy()
+
+    calculate = partial(
+        _sorted_trajectories_by_vessel,
+        vessel_name=vessel_name,
+        latitude_name=latitude_name,
+        longitude_name=longitude_name,
+        heading_name=heading_name,
+        travel_distance_name=travel_distance_name,
+        speed_name=speed_name,
+        datetime_name=datetime_name,
+        travel_time_name=travel_time_name,
+        speed_max_clip=speed_max_clip,
+        method=method,
+    )
+
+    if n_workers is None or n_workers == 1:
+        trajectories = calculate(trajectories)
+    else:
+        # split at the first row of the vessels closest to equal block sizes
+        vessels = trajectories[vessel_name].to_numpy()
+        i_first = np.flatnonzero(np.append(True, vessels[1:] != vessels[:-1]))
+        sizes = np.linspace(0, vessels.size, n_workers + 1)[1:-1]
+        i_split = np.unique(
+            i_first[np.minimum(np.searchsorted(i_first, sizes), i_first.size - 1)]
+        )
+        blocks = [
+            trajectories.iloc[i_start:i_end]
+            for i_start, i_end in zip(
+                np.append(0, i_split), np.append(i_split, vessels.size)
+            )
+            if i_end > i_start
+        ]
+        _logger.info(
+            "Calculating {} vessels in {} blocks with {} workers".format(
+                i_first.size, len(blocks), n_workers
+            )
+        )
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            trajectories = pd.concat(list(executor.map(calculate, blocks)))
+
+    # restore the original order of the rows
+    return trajectories.iloc[np.argsort(order, kind="stable")]
+
+
+def _sorted_trajectories_by_vessel(
+    trajectories,
+    vessel_name,
+    latitude_name,
+    longitude_name,
+    heading_name,
+    travel_distance_name,
+    speed_name,
+    datetime_name,
+    travel_time_name,
+    speed_max_clip,
+    method,
+):
+    """
+    Calculate the travel distance, heading and speed of trajectories sorted by vessel
+
+    See `trajectories_by_vessel` for the parameters. The rows of `trajectories` are
+    updated in place and returned
+    """
+    n_rows = trajectories.index.size
+    if n_rows == 0:
+        return trajectories
+
+    vessels = trajectories[vessel_name].to_numpy()
+    is_first = np.append(True, vessels[1:] != vessels[:-1])
+    is_last = np.append(is_first[1:], True)
+    group = np.cumsum(is_first) - 1
+    i_first = np.flatnonzero(is_first)
+
+    latitudes, longitudes, is_valid = _fill_invalid_coordinates(
+        trajectories[latitude_name].to_numpy(dtype=float),
+        trajectories[longitude_name].to_numpy(dtype=float),
+        group=group,
+    )
+
+    # the distance and heading from each row to the next row of all vessels at once.
+    # The steps from the last row of a vessel to the next vessel are dropped below
+    displacement, bearing = _travel_steps(latitudes, longitudes, is_valid, method)
+    displacement = np.append(0.0, displacement)
+    displacement[is_first] = 0
+    travel_distance = pd.Series(displacement).groupby(group).cumsum().to_numpy()
+
+    # the heading of each row is the heading to the next row. The last row of a vessel
+    # gets the heading of the row before, or keeps its heading for a single row
+    headings = np.append(bearing, np.nan)
+    i_last = np.flatnonzero(is_last)
+    is_single = is_first[i_last]
+    headings[i_last[~is_single]] = headings[i_last[~is_single] - 1]
+    try:
+        headings[i_last[is_single]] = trajectories[heading_name].to_numpy()[
+            i_last[is_single]
+        ]
+    except KeyError:
+        headings[i_last[is_single]] = 0
+    headings = _fill_headings(headings, group=group).to_numpy()
+
+    try:
+        date_time = trajectories[datetime_name]
+    except KeyError:
+        date_time = trajectories.index
+    date_time = _to_date_time_series(date_time)
+    time_in_hour = (
+        (date_time - date_time[i_first[group]].to_numpy()) / pd.Timedelta("1 hour")
+    ).to_numpy()
+
+    delta_time = np.append(1.0, np.diff(time_in_hour))
+    delta_time[is_first] = 1
+    delta_distance = np.append(0.0, np.diff(travel_distance))
+    delta_distance[is_first] = 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        speeds = delta_distance / delta_time
+
+    # the first row of a vessel gets the speed of its second row
+    has_next = ~is_last[i_first]
+    speeds[i_first[has_next]] = speeds[i_first[has_next] + 1]
+    speeds = _fill_speeds(speeds, speed_max_clip, group=group)
+
+    trajectories[travel_distance_name] = travel_distance
+    trajectories[heading_name] = headings
+    trajectories[travel_time_name] = time_in_hour
+    trajectories[speed_name] = speeds.to_numpy()
+
+    return trajectories
+
+
 def import_way_points(
     file_name,
     latitude_name="latitude",
@@ -429,8 +1502,10 @@ def import_way_points(
       and pick the kml format.
     * If the `n_distance_points` is set to None, only the coordinates of the  pin locations as found
       in the kml file are imported.
-    * If `n_distance_points` is specified, an equidistant set of coordinates obtained from the
-      interpolated values between the pin location in the kml file is returned.
+    * If `n_distance_points` is specified, an equidistant set of coordinates is
+      interpolated along the great circles between the pin locations in the kml file.
+      The travel distances are the requested equidistant distances and the heading is
+      the bearing to the next point. See `_resample_way_points`.
     * In case that interpolation is used, make sure that there is at least one sample point in
       between the pin
       locations as defined in the kml file.
@@ -476,19 +1551,19 @@ def import_way_points(
     >>> data["latitude"].head()
     travel_distance
     0.000000    32.400000
-    2.441572    32.371429
-    3.662502    32.357143
-    4.883529    32.342857
-    6.104652    32.328571
+    1.260299    32.385324
+    2.520597    32.370646
+    3.780896    32.355965
+    5.041194    32.341281
     Name: latitude, dtype: float64
 
     >>> data["longitude"].head()
     travel_distance
     0.000000   -17.180000
-    2.441572   -17.214286
-    3.662502   -17.231429
-    4.883529   -17.248571
-    6.104652   -17.265714
+    1.260299   -17.197784
+    2.520597   -17.215562
+    3.780896   -17.233334
+    5.041194   -17.251100
     Name: longitude, dtype: float64
 
     """
@@ -535,24 +1610,9 @@ def import_way_points(
     )
 
     if n_distance_points is not None:
-        df.set_index(travel_distance_name, inplace=True, drop=False)
-        distances = np.linspace(0, df.index[-1], n_distance_points, endpoint=True)
-        df2 = pd.DataFrame(
-            index=distances, columns=[latitude_name, longitude_name, heading_name]
-        )
-        df2[travel_distance_name] = distances
-        df3 = pd.concat([df, df2]).sort_index().interpolate()
-        df3 = (
-            df3.reset_index()
-            .drop_duplicates(keep="first", subset=travel_distance_name)
-            .set_index(travel_distance_name)
-        )
-        df3 = df3.reindex(df2.index)
-        df3.reset_index(inplace=True, drop=True)
-        df3.drop("index", axis=1, inplace=True)
-
-        df = travel_distance_and_heading_from_coordinates(
-            df3,
+        df = _resample_way_points(
+            df,
+            n_distance_points=n_distance_points,
             latitude_name=latitude_name,
             longitude_name=longitude_name,
             heading_name=heading_name,
@@ -562,3 +1622,164 @@ def import_way_points(
     df.set_index(travel_distance_name, inplace=True, drop=True)
 
     return df
+
+
+def _resample_way_points(
+    way_points,
+    n_distance_points,
+    latitude_name,
+    longitude_name,
+    heading_name,
+    travel_distance_name,
+):
+    """
+    Resample way points at equidistant travel distances along the great circle legs
+
+    Parameters
+    ----------
+    way_points : DataFrame
+        Way points with the latitude, longitude and travel distance columns, as
+        returned by `travel_distance_and_heading_from_coordinates`
+    n_distance_points : int
+        Number of equidistant points from the first to the last way point
+    latitude_name : str
+        Name of the latitude column
+    longitude_name : str
+        Name of the longitude column
+    heading_name : str
+        Name of the heading column
+    travel_distance_name : str
+        Name of the travel distance column
+
+    Returns
+    -------
+    DataFrame
+        New data frame with the latitude, longitude, heading and travel distance of the
+        resampled points
+
+    Notes
+    -----
+    * The leg of each point is found with a binary search of its travel distance in the
+      cumulative distances of the way points. The point is then interpolated along the
+      great circle of the leg with a spherical linear interpolation (slerp) by the
+      fraction of the leg distance
+    * The travel distances are the requested equidistant distances, not distances
+      measured on the ellipsoid between the interpolated coordinates. The points are
+      placed with a slerp on the sphere by fractions of the leg lengths, which are
+      calculated on the WGS84 ellipsoid with Vincenty's formula. Only the way points
+      themselves are at their measured distances. Within a leg, the distance on the
+      ellipsoid from the start of the leg may differ slightly from the travel distance,
+      as the scale of the ellipsoid relative to the sphere varies along the leg
+    * The heading is the bearing to the next point and the last point gets the heading
+      of the point before, as in `travel_distance_and_heading_from_coordinates`
+    """
+    latitudes = way_points[latitude_name].to_numpy(dtype=float)
+    longitudes = way_points[longitude_name].to_numpy(dtype=float)
+    cumulative_distance = way_points[travel_distance_name].to_numpy(dtype=float)
+
+    distances = np.linspace(
+        0, cumulative_distance[-1], n_distance_points, endpoint=True
+    )
+
+    if latitudes.size > 1:
+        # the index of the way point at the start of the leg of each distance
+        i_leg = np.searchsorted(cumulative_distance, distances, side="right") - 1
+        i_leg = np.clip(i_leg, 0, latitudes.size - 2)
+        leg_distance = cumulative_distance[i_leg + 1] - cumulative_distance[i_leg]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fraction = np.where(
+                leg_distance > 0,
+                (distances - cumulative_distance[i_leg]) / leg_distance,
+                0.0,
+            )
+        new_latitudes, new_longitudes = _great_circle_interpolation(
+            latitudes[i_leg],
+            longitudes[i_leg],
+            latitudes[i_leg + 1],
+            longitudes[i_leg + 1],
+            fraction,
+        )
+    else:
+        new_latitudes = np.full(distances.size, latitudes[0])
+        new_longitudes = np.full(distances.size, longitudes[0])
+
+    headings = way_points[heading_name].to_numpy(dtype=float)[:1].repeat(distances.size)
+    if distances.size > 1:
+        _, bearing = great_circle_distance_and_bearing(
+            new_latitudes[:-1],
+            new_longitudes[:-1],
+            new_latitudes[1:],
+            new_longitudes[1:],
+        )
+        headings = np.append(bearing, bearing[-1])
+
+    resampled = pd.DataFrame(
+        {
+            latitude_name: new_latitudes,
+            longitude_name: new_longitudes,
+            heading_name: headings,
+            travel_distance_name: distances,
+        }
+    )
+    resampled[heading_name] = resampled[heading_name].bfill().mod(360)
+
+    return resampled
+
+
+def _great_circle_interpolation(
+    latitude_1, longitude_1, latitude_2, longitude_2, fraction
+):
+    """
+    Interpolate between two locations along the great circle on the sphere
+
+    Parameters
+    ----------
+    latitude_1 : ndarray
+        Latitudes in degrees of the start locations
+    longitude_1 : ndarray
+        Longitudes in degrees of the start locations
+    latitude_2 : ndarray
+        Latitudes in degrees of the end locations
+    longitude_2 : ndarray
+        Longitudes in degrees of the end locations
+    fraction : ndarray
+        Fraction of the angle between the start and end location, between 0 and 1
+
+    Returns
+    -------
+    tuple (latitude, longitude)
+        Latitudes and longitudes in degrees of the interpolated locations
+
+    Notes
+    -----
+    The spherical linear interpolation (slerp) of the unit vectors :math:`a` and
+    :math:`b` with the angle :math:`\\Omega` in between is
+
+    .. math ::
+
+        p = \\frac{\\sin((1 - f) \\Omega)}{\\sin \\Omega} a +
+            \\frac{\\sin(f \\Omega)}{\\sin \\Omega} b
+
+    For coinciding locations, the linear interpolation of the unit vectors is used
+    """
+    start = _unit_sphere_coordinates(latitude_1, longitude_1)
+    end = _unit_sphere_coordinates(latitude_2, longitude_2)
+
+    # the angle between the unit vectors, accurate for small angles as well
+    omega = np.arctan2(
+        np.linalg.norm(np.cross(start, end), axis=-1), np.sum(start * end, axis=-1)
+    )
+    sin_omega = np.sin(omega)
+    is_arc = sin_omega > 1e-12
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weight_start = np.where(
+            is_arc, np.sin((1 - fraction) * omega) / sin_omega, 1 - fraction
+        )
+        weight_end = np.where(is_arc, np.sin(fraction * omega) / sin_omega, fraction)
+    point = weight_start[..., np.newaxis] * start + weight_end[..., np.newaxis] * end
+
+    latitude = np.rad2deg(
+        np.arctan2(point[..., 2], np.hypot(point[..., 0], point[..., 1]))
+    )
+    longitude = np.rad2deg(np.arctan2(point[..., 1], point[..., 0]))
+    return latitude, longitude
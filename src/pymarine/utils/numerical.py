@@ -2,11 +2,21 @@
 Some numerical utilities used in other modules
 """
 
+import base64
+import hashlib
+import json
+import logging
+import os
 import re
 
+import h5py
 import numpy as np
 import scipy.io as spio
 
+from pymarine.utils.fft_backends import get_fft_backend
+
+logger = logging.getLogger(__name__)
+
 
 def ecdf2percentile(ecdf, percentile):
     """Calculate a percentile of an Empirical CDF function as returned by the
@@ -614,6 +624,144 @@ def extrap1d(interpolator):
     return ufunclike
 
 
+def searchsorted_columns(a, v, side="left"):
+    """Find the indices where the values *v* should be inserted in the columns of *a*
+
+    Parameters
+    ----------
+    a: ndarray
+        2D array of shape (n_a, n_columns) which is sorted along the first axis
+    v: ndarray
+        2D array of shape (n_v, n_columns) with the values to insert per column
+    side: {"left", "right"}
+        For values equal to an element of *a*, "left" gives the index of the first
+        equal element and "right" the index after the last. Default = "left"
+
+    Returns
+    -------
+    ndarray
+        Integer array of shape (n_v, n_columns) equal to *np.searchsorted(a[:, j],
+        v[:, j], side)* for all the columns j
+
+    Examples
+    --------
+
+    >>> a = np.array([[0.0, 10.0], [1.0, 20.0], [2.0, 30.0]])
+    >>> v = np.array([[0.5, 35.0], [1.0, 5.0]])
+    >>> searchsorted_columns(a, v)
+    array([[1, 3],
+           [1, 0]])
+
+    Notes
+    -----
+    The values of *a* and *v* are merged with a single stable sort of all the columns
+    instead of a Python loop over the columns. The index of a value of *v* in its
+    column of *a* equals the number of elements of *a* preceding it in the merged
+    column. In case *v* is sorted as well, the merged columns consist of two sorted
+    runs, which the stable sort merges in linear time
+    """
+    # work on the transposed arrays, such that each column is contiguous in memory
+    a = np.ascontiguousarray(np.asarray(a).T)
+    v = np.ascontiguousarray(np.asarray(v).T)
+    n_columns, n_a = a.shape
+    n_v = v.shape[1]
+
+    # the stable sort keeps the order of the merged arrays for equal values. Put v in
+    # front of a for the left side, such that equal values of a are counted after v
+    if side == "left":
+        merged = np.concatenate((v, a), axis=1)
+        from_a = np.arange(n_v + n_a) >= n_v
+    elif side == "right":
+        merged = np.concatenate((a, v), axis=1)
+        from_a = np.arange(n_a + n_v) < n_a
+    else:
+        raise ValueError("side must be 'left' or 'right'. Found {}".format(side))
+
+    order = np.argsort(merged, axis=1, kind="stable")
+    from_a_sorted = from_a[order]
+    n_a_preceding = np.cumsum(from_a_sorted, axis=1) - from_a_sorted
+
+    # scatter the counts back to the original positions of the merged values
+    n_merged = n_a + n_v
+    order += np.arange(n_columns)[:, None] * n_merged
+    indices = np.empty(n_columns * n_merged, dtype=int)
+    indices[order.ravel()] = n_a_preceding.ravel()
+    indices = indices.reshape(n_columns, n_merged)
+
+    if side == "left":
+        return indices[:, :n_v].T
+    return indices[:, n_a:].T
+
+
+def interp1d_columns(x, xp, fp, i_columns=None):
+    """Linear interpolation of all the columns of a 2D array at once
+
+    Parameters
+    ----------
+    x: ndarray
+        2D array of shape (n_x, n_columns) with the coordinates to evaluate per column
+    xp: ndarray
+        2D array of shape (n_p, n_columns) with the coordinates of the data points per
+        column. Do not need to be sorted
+    fp: ndarray
+        2D array of shape (n_p, n_columns) with the values of the data points. In case
+        *i_columns* is given, the shape is (n_p, n_fp_columns)
+    i_columns: ndarray, optional
+        1D array of size n_fp_columns with the column of *x* and *xp* belonging to each
+        column of *fp*. Default = None, i.e. each column of *fp* has its own column in
+        *x* and *xp*
+
+    Returns
+    -------
+    ndarray
+        2D array of shape (n_x, n_columns) with the interpolated values, or
+        (n_x, n_fp_columns) in case *i_columns* is given
+
+    Notes
+    -----
+    * The result is equal to *interp1d(xp[:, j], fp[:, j], bounds_error=False,
+      fill_value="extrapolate")(x[:, j])* of scipy for all the columns j, so values
+      outside the range of *xp* are extrapolated linearly from the first or last two
+      points
+    * The data points are only sorted per column if they are not sorted already. All
+      the columns are searched at once with *searchsorted_columns*
+    * With *i_columns*, the interpolation intervals are searched once per column of
+      *xp* and shared by all the columns of *fp* with the same coordinates
+    """
+    xp = np.asarray(xp)
+    fp = np.asarray(fp)
+    x = np.asarray(x)
+    if np.any(np.diff(xp, axis=0) < 0):
+        order = np.argsort(xp, axis=0)
+        xp = np.take_along_axis(xp, order, axis=0)
+        if i_columns is not None:
+            order = order[:, i_columns]
+        fp = np.take_along_axis(fp, order, axis=0)
+
+    i_high = searchsorted_columns(xp, x)
+    i_high = np.clip(i_high, 1, xp.shape[0] - 1)
+
+    # gather the points of the intervals by the indices in the flattened transposed
+    # arrays, in which each column is contiguous
+    n_p = xp.shape[0]
+    i_high_xp = i_high + np.arange(xp.shape[1]) * n_p
+    xp = np.ravel(xp.T)
+    x_low = xp[i_high_xp - 1]
+    delta_x = xp[i_high_xp] - x_low
+    x_minus_low = x - x_low
+    if i_columns is not None:
+        i_high = i_high[:, i_columns]
+        delta_x = delta_x[:, i_columns]
+        x_minus_low = x_minus_low[:, i_columns]
+
+    i_high = i_high + np.arange(fp.shape[1]) * n_p
+    fp = np.ravel(fp.T)
+    f_low = fp[i_high - 1]
+
+    slope = (fp[i_high] - f_low) / delta_x
+    return slope * x_minus_low + f_low
+
+
 def print_mat_nested(d, indent=0, nkeys=0):
     """
     Pretty print nested structures from .mat files
@@ -651,7 +799,7 @@ def print_mat_nested(d, indent=0, nkeys=0):
             print_mat_nested(d[n], indent + 1)
 
 
-def loadmat(filename):
+def loadmat(filename, cache=False, cache_dir=None):
     """
     Load a matlab data file with a complex data structure
 
@@ -659,6 +807,14 @@ def loadmat(filename):
     ----------
     filename: str
         Name of the matlab file to import
+    cache: bool, optional
+        Store the converted data in a HDF5 sidecar file and memory-map the arrays of
+        the sidecar on later calls instead of parsing the matlab file again.
+        Default = False
+    cache_dir: str, optional
+        Directory of the sidecar files. Default = None, i.e. the sidecar is stored
+        next to the matlab file as *<filename>.cache.h5*. The sidecar files only
+        contain data, so a directory shared with other users can be used
 
     Returns
     -------
@@ -697,6 +853,14 @@ def loadmat(filename):
     * This function should be called instead of direct spio.loadmat as it cures the
       problem of not properly recovering python dictionaries from mat files. It calls
       the function check keys to cure all entries which are still mat-objects
+    * With *cache*, the sidecar is keyed by the absolute path, size and modification
+      time of the matlab file and written again when one of them changes. The
+      numerical arrays are returned as copy-on-write memory maps of the sidecar:
+      they can be modified, but the changes are not written to the file
+    * The structure of the data is stored as JSON, so reading a sidecar never
+      executes code. Matlab structures inside structure or cell arrays are restored as
+      the same *mat_struct* objects as returned without a cache. Data which can not
+      be stored as JSON, like matlab class objects, is returned without a cache
 
     References
     ----------
@@ -704,8 +868,207 @@ def loadmat(filename):
     * http://stackoverflow.com/questions/7008608/
       scipy-io-loadmat-nested-structures-i-e-dictionaries
     """
-    data = spio.loadmat(filename, struct_as_record=False, squeeze_me=True)
-    return _check_keys(data)
+    if not cache:
+        data = spio.loadmat(filename, struct_as_record=False, squeeze_me=True)
+        return _check_keys(data)
+
+    source_key = _mat_source_key(filename)
+    cache_file = _mat_cache_file_name(source_key[0], cache_dir)
+    data = _read_mat_cache(cache_file, source_key)
+    if data is None:
+        logger.debug(f"Creating matlab cache {cache_file} for {filename}")
+        data = spio.loadmat(filename, struct_as_record=False, squeeze_me=True)
+        data = _check_keys(data)
+        try:
+            _write_mat_cache(cache_file, source_key, data)
+        except TypeError as error:
+            logger.warning(f"Matlab data of {filename} is not cached: {error}")
+            return data
+        data = _read_mat_cache(cache_file, source_key)
+    return data
+
+
+def _mat_source_key(filename):
+    """Get the absolute path, size and modification time in ns of a file"""
+    stat = os.stat(filename)
+    return os.path.abspath(filename), stat.st_size, stat.st_mtime_ns
+
+
+def _mat_cache_file_name(path, cache_dir=None):
+    """Get the name of the sidecar file of the matlab file *path*"""
+    if cache_dir is None:
+        return path + ".cache.h5"
+    # the hash of the path prevents clashes of equal file names in other directories
+    path_hash = hashlib.sha1(path.encode()).hexdigest()[:12]
+    base_name = os.path.basename(path)
+    return os.path.join(cache_dir, f"{base_name}.{path_hash}.cache.h5")
+
+
+def _split_mat_arrays(data, arrays):
+    """
+    Replace the numerical arrays of a nested dictionary by their index in *arrays*
+
+    Returns a copy of the nested dictionary in which all numerical arrays are replaced
+    by a _MatCachedArray place holder. The arrays are appended to *arrays*
+    """
+    if isinstance(data, dict):
+        return {key: _split_mat_arrays(value, arrays) for key, value in data.items()}
+    if isinstance(data, np.ndarray) and data.dtype.kind in "biufc" and data.size > 0:
+        arrays.append(data)
+        return _MatCachedArray(len(arrays) - 1)
+    return data
+
+
+def _join_mat_arrays(data, arrays):
+    """Put the arrays back in the nested dictionary. Inverse of _split_mat_arrays"""
+    if isinstance(data, dict):
+        return {key: _join_mat_arrays(value, arrays) for key, value in data.items()}
+    if isinstance(data, _MatCachedArray):
+        return arrays[data.index]
+    return data
+
+
+class _MatCachedArray:
+    """Place holder of an array stored in the matlab sidecar file"""
+
+    def __init__(self, index):
+        self.index = index
+
+
+def _encode_mat_tree(data):
+    """
+    Convert the nested dictionary of _split_mat_arrays to JSON compatible objects
+
+    All the values are stored as a dictionary with a single key telling the type of
+    the value, except for strings, booleans, integers, floats and None. Matlab
+    structures, like the elements of a structure array, are stored with their field
+    names in order. Raises a TypeError for values of any other type
+    """
+    if isinstance(data, dict):
+        return {"dict": {key: _encode_mat_tree(value) for key, value in data.items()}}
+    if isinstance(data, spio.matlab.mio5_params.mat_struct):
+        return {
+            "struct": [
+                [name, _encode_mat_tree(getattr(data, name))]
+                for name in data._fieldnames
+            ]
+        }
+    if isinstance(data, _MatCachedArray):
+        return {"array": data.index}
+    if isinstance(data, np.ndarray):
+        if data.dtype.kind not in "biufcUSO":
+            raise TypeError(f"Can not cache arrays of type {data.dtype}")
+        return {
+            "ndarray": [_encode_mat_tree(value) for value in data.ravel()],
+            "dtype": data.dtype.str,
+            "shape": list(data.shape),
+        }
+    if isinstance(data, bytes):
+        return {"bytes": base64.b64encode(data).decode("ascii")}
+    if isinstance(data, str):
+        return str(data)
+    if isinstance(data, np.generic):
+        return {"scalar": _encode_mat_tree(data.item()), "dtype": data.dtype.str}
+    if data is None or isinstance(data, (bool, int, float)):
+        return data
+    if isinstance(data, complex):
+        return {"complex": [data.real, data.imag]}
+    if isinstance(data, (list, tuple)):
+        return {type(data).__name__: [_encode_mat_tree(value) for value in data]}
+    raise TypeError(f"Can not cache values of type {type(data)}")
+
+
+def _decode_mat_tree(data):
+    """Convert the JSON objects of _encode_mat_tree back to the nested dictionary"""
+    if not isinstance(data, dict):
+        return data
+    if "dict" in data:
+        return {key: _decode_mat_tree(value) for key, value in data["dict"].items()}
+    if "struct" in data:
+        matobj = spio.matlab.mio5_params.mat_struct()
+        matobj._fieldnames = [name for name, _ in data["struct"]]
+        for name, value in data["struct"]:
+            setattr(matobj, name, _decode_mat_tree(value))
+        return matobj
+    if "array" in data:
+        return _MatCachedArray(data["array"])
+    if "ndarray" in data:
+        array = np.empty(len(data["ndarray"]), dtype=np.dtype(data["dtype"]))
+        for index, value in enumerate(data["ndarray"]):
+            array[index] = _decode_mat_tree(value)
+        return array.reshape(data["shape"])
+    if "bytes" in data:
+        return base64.b64decode(data["bytes"])
+    if "scalar" in data:
+        return np.dtype(data["dtype"]).type(_decode_mat_tree(data["scalar"]))
+    if "complex" in data:
+        return complex(*data["complex"])
+    if "list" in data:
+        return [_decode_mat_tree(value) for value in data["list"]]
+    return tuple(_decode_mat_tree(value) for value in data["tuple"])
+
+
+def _write_mat_cache(cache_file, source_key, data):
+    """
+    Write the converted matlab data to a HDF5 sidecar file
+
+    The numerical arrays are stored as contiguous, uncompressed data sets, such that
+    they can be memory-mapped. All the other data, like the structure of the nested
+    dictionary, strings and cell arrays are stored as JSON in the *tree* data set.
+    Raises a TypeError before writing in case the data can not be stored as JSON
+    """
+    arrays = list()
+    tree = json.dumps(_encode_mat_tree(_split_mat_arrays(data, arrays)))
+
+    # write to a temporary file first, such that other processes never see a partial
+    # sidecar file
+    temporary_file = f"{cache_file}.{os.getpid()}.tmp"
+    with h5py.File(temporary_file, "w") as hf:
+        hf.attrs["source_path"] = source_key[0]
+        hf.attrs["source_size"] = source_key[1]
+        hf.attrs["source_mtime_ns"] = source_key[2]
+        hf.create_dataset("tree", data=np.frombuffer(tree.encode(), dtype=np.uint8))
+        for index, array in enumerate(arrays):
+            hf.create_dataset(f"arrays/{index}", data=np.ascontiguousarray(array))
+    os.replace(temporary_file, cache_file)
+
+
+def _read_mat_cache(cache_file, source_key):
+    """
+    Read the matlab data of a HDF5 sidecar file with memory-mapped arrays
+
+    Returns None in case the sidecar does not exist, belongs to another version of
+    the matlab file or was written in another format
+    """
+    if not os.path.exists(cache_file):
+        return None
+
+    with h5py.File(cache_file, "r") as hf:
+        stored_key = (
+            hf.attrs["source_path"],
+            int(hf.attrs["source_size"]),
+            int(hf.attrs["source_mtime_ns"]),
+        )
+        if stored_key != source_key:
+            logger.debug(f"Matlab cache {cache_file} is outdated")
+            return None
+
+        try:
+            tree = _decode_mat_tree(json.loads(hf["tree"][()].tobytes()))
+        except ValueError:
+            logger.debug(f"Matlab cache {cache_file} has an unknown format")
+            return None
+        layouts = list()
+        if "arrays" in hf:
+            for index in range(len(hf["arrays"])):
+                dataset = hf[f"arrays/{index}"]
+                layouts.append((dataset.id.get_offset(), dataset.dtype, dataset.shape))
+
+    arrays = [
+        np.memmap(cache_file, mode="c", dtype=dtype, offset=offset, shape=shape)
+        for offset, dtype, shape in layouts
+    ]
+    return _join_mat_arrays(tree, arrays)
 
 
 def _check_keys(dict):
@@ -756,6 +1119,298 @@ def _todict(matobj):
     return dict
 
 
+def _nufft_gaussian_kernel(n_modes, tolerance=1e-10, oversampling=2):
+    """
+    Get the parameters of the Gaussian gridding kernel of the non-uniform FFT
+
+    Parameters
+    ----------
+    n_modes: int
+        Number of output modes (spatial points) along the dimension
+    tolerance: float, optional
+        Requested relative accuracy of the transform. Default = 1e-10
+    oversampling: float, optional
+        Oversampling ratio of the fine grid. Must be larger than 1. Default = 2
+
+    Returns
+    -------
+    tuple (n_grid, n_spread, tau)
+        * n_grid: number of points of the oversampled grid
+        * n_spread: number of grid points the Gaussian is spread to at each side of a
+          source
+        * tau: width of the Gaussian kernel
+
+    Notes
+    -----
+    The choice of the spreading width and the Gaussian width follows Greengard and Lee
+    (2004): for an oversampling ratio R, the error decays as
+    :math:`\\exp(-\\pi M_{sp} (R-1) / (R - 1/2))` and the width is
+    :math:`\\tau = \\pi M_{sp} / (M^2 R (R - 1/2))`
+    """
+    if oversampling <= 1:
+        raise ValueError(f"oversampling must be larger than 1. Found {oversampling}")
+
+    ratio = (oversampling - 0.5) / (oversampling - 1)
+    n_spread = max(2, int(np.ceil(-np.log(tolerance) * ratio / np.pi)))
+    n_grid = max(int(np.ceil(oversampling * n_modes)), 2 * n_spread)
+    # use the actual oversampling ratio of the grid to get the kernel width
+    oversampling = n_grid / n_modes
+    tau = np.pi * n_spread / (n_modes**2 * oversampling * (oversampling - 0.5))
+    return n_grid, n_spread, tau
+
+
+def _nufft_spreading_weights(angles, n_grid, n_spread, tau):
+    """
+    Get the indices and weights of the Gaussian spread of sources on the periodic grid
+
+    Parameters
+    ----------
+    angles: ndarray
+        Location of the n_s sources on the periodic interval [0, 2 pi)
+    n_grid: int
+        Number of points of the oversampled grid
+    n_spread: int
+        Number of grid points to spread to at each side of a source
+    tau: float
+        Width of the Gaussian kernel
+
+    Returns
+    -------
+    tuple (indices, weights)
+        n_s x (2 n_spread) arrays with the grid indices and Gaussian weights per source
+    """
+    delta_grid = 2 * np.pi / n_grid
+    i_nearest = np.floor(angles / delta_grid).astype(int)
+    i_grid = i_nearest[:, np.newaxis] + np.arange(-n_spread + 1, n_spread + 1)
+    distance = angles[:, np.newaxis] - i_grid * delta_grid
+    weights = np.exp(-(distance**2) / (4 * tau))
+    return np.mod(i_grid, n_grid), weights
+
+
+def _nufft_deconvolution(n_modes, n_grid, tau):
+    """
+    Get the grid indices of the output modes and the factors to deconvolve the Gaussian
+
+    Parameters
+    ----------
+    n_modes: int
+        Number of output modes
+    n_grid: int
+        Number of points of the oversampled grid
+    tau: float
+        Width of the Gaussian kernel
+
+    Returns
+    -------
+    tuple (indices, factors)
+        The indices of the modes in the inverse FFT of the oversampled grid and the
+        factors to multiply the modes with
+    """
+    modes = np.arange(n_modes) - n_modes // 2
+    factors = np.sqrt(np.pi / tau) * np.exp(modes**2 * tau)
+    return np.mod(modes, n_grid), factors
+
+
+def nufft1d(
+    amplitudes,
+    k_nodes,
+    x_start,
+    delta_x,
+    nx_points,
+    tolerance=1e-10,
+    oversampling=2,
+    fft_backend=None,
+):
+    """
+    Calculate the Fourier sum of non-uniform wave vectors on a uniform spatial grid
+    with a non-uniform FFT
+
+    Parameters
+    ----------
+    amplitudes: ndarray
+        Complex amplitudes of the n_k wave vectors. Leading dimensions (e.g. time) are
+        allowed, in which case the transform is carried out for each leading index
+    k_nodes: ndarray
+        Wave vectors of size n_k. Can have any (non-uniform) distribution
+    x_start: float
+        Position of the first spatial point
+    delta_x: float
+        Distance between the spatial points
+    nx_points: int
+        Number of spatial points
+    tolerance: float, optional
+        Requested relative accuracy of the transform. Default = 1e-10
+    oversampling: float, optional
+        Oversampling ratio of the fine grid. Default = 2
+    fft_backend: str or FFTBackend, optional
+        Backend used for the inverse FFT of the oversampled grid. Default = None, i.e.
+        the default backend of the *fft_backends* module
+
+    Returns
+    -------
+    ndarray
+        Complex array with the Fourier sum at the *nx_points* spatial points
+
+    Notes
+    -----
+    The sum
+
+    .. math::
+
+        f(x_n) = \\sum_j A_j \\exp(j k_j x_n), \\quad x_n = x_0 + n \\Delta x
+
+    is calculated in :math:`O(N \\log N)` instead of the :math:`O(n_k n_x)` of the
+    direct DFT. Each wave vector is mapped on the angle :math:`k_j\\Delta x` on the
+    periodic interval :math:`[0, 2\\pi)` and spread to an oversampled grid with a
+    Gaussian kernel. The grid is transformed with an inverse FFT, after which the
+    Gaussian is deconvolved from the modes. See Greengard and Lee (2004), Accelerating
+    the Nonuniform Fast Fourier Transform, SIAM Review 46, 443--454
+
+    Examples
+    --------
+    >>> k_nodes = np.array([0.01, 0.0234, 0.05])
+    >>> amplitudes = np.array([1.0, 0.5j, 0.25])
+    >>> x_nodes = np.linspace(0, 100, 11)
+    >>> f_nufft = nufft1d(amplitudes, k_nodes, 0, 10, 11)
+    >>> f_dft = np.dot(amplitudes, np.exp(1j * np.outer(k_nodes, x_nodes)))
+    >>> bool(np.allclose(f_nufft, f_dft))
+    True
+    """
+    amplitudes = np.asarray(amplitudes, dtype=complex)
+    k_nodes = np.asarray(k_nodes, dtype=float)
+    lead_shape = amplitudes.shape[:-1]
+    amplitudes = amplitudes.reshape(-1, k_nodes.size)
+
+    n_grid, n_spread, tau = _nufft_gaussian_kernel(nx_points, tolerance, oversampling)
+
+    # shift the origin to the center mode of the output grid
+    x_center = x_start + (nx_points // 2) * delta_x
+    amplitudes = amplitudes * np.exp(1j * k_nodes * x_center)
+
+    angles = np.mod(k_nodes * delta_x, 2 * np.pi)
+    indices, weights = _nufft_spreading_weights(angles, n_grid, n_spread, tau)
+    indices = indices.ravel()
+
+    grid = np.empty((amplitudes.shape[0], n_grid), dtype=complex)
+    for i_lead, amplitude in enumerate(amplitudes):
+        values = (amplitude[:, np.newaxis] * weights).ravel()
+        grid[i_lead].real = np.bincount(indices, values.real, minlength=n_grid)
+        grid[i_lead].imag = np.bincount(indices, values.imag, minlength=n_grid)
+
+    modes = get_fft_backend(fft_backend).ifft(grid, axis=-1)
+    i_modes, factors = _nufft_deconvolution(nx_points, n_grid, tau)
+    result = modes[:, i_modes] * factors
+
+    return result.reshape(lead_shape + (nx_points,))
+
+
+def nufft2d(
+    amplitudes,
+    kx_nodes,
+    ky_nodes,
+    x_start,
+    y_start,
+    delta_x,
+    delta_y,
+    nx_points,
+    ny_points,
+    tolerance=1e-10,
+    oversampling=2,
+    fft_backend=None,
+):
+    """
+    Calculate the Fourier sum of non-uniform 2D wave vectors on a uniform spatial mesh
+    with a non-uniform FFT
+
+    Parameters
+    ----------
+    amplitudes: ndarray
+        Complex amplitudes of the wave vectors. Any shape is allowed as long as it is
+        equal to the shape of *kx_nodes* and *ky_nodes*
+    kx_nodes: ndarray
+        x-component of the wave vectors
+    ky_nodes: ndarray
+        y-component of the wave vectors
+    x_start: float
+        Position of the first spatial point in x direction
+    y_start: float
+        Position of the first spatial point in y direction
+    delta_x: float
+        Distance between the spatial points in x direction
+    delta_y: float
+        Distance between the spatial points in y direction
+    nx_points: int
+        Number of spatial points in x direction
+    ny_points: int
+        Number of spatial points in y direction
+    tolerance: float, optional
+        Requested relative accuracy of the transform. Default = 1e-10
+    oversampling: float, optional
+        Oversampling ratio of the fine grid. Default = 2
+    fft_backend: str or FFTBackend, optional
+        Backend used for the inverse FFT of the oversampled grid. Default = None, i.e.
+        the default backend of the *fft_backends* module
+
+    Returns
+    -------
+    ndarray
+        nx_points x ny_points complex array with the Fourier sum on the spatial mesh
+
+    Notes
+    -----
+    The 2D version of *nufft1d* for the sum
+
+    .. math::
+
+        f(x_n, y_m) = \\sum_j A_j \\exp(j (k_{x,j} x_n + k_{y,j} y_m))
+
+    The Gaussian kernel is the tensor product of the 1D kernels. The sources are
+    spread in chunks to limit the memory of the (2 M_{sp})^2 weights per source.
+    """
+    amplitudes = np.asarray(amplitudes, dtype=complex).ravel()
+    kx_nodes = np.asarray(kx_nodes, dtype=float).ravel()
+    ky_nodes = np.asarray(ky_nodes, dtype=float).ravel()
+
+    nx_grid, nx_spread, tau_x = _nufft_gaussian_kernel(
+        nx_points, tolerance, oversampling
+    )
+    ny_grid, ny_spread, tau_y = _nufft_gaussian_kernel(
+        ny_points, tolerance, oversampling
+    )
+
+    # shift the origin to the center mode of the output mesh
+    x_center = x_start + (nx_points // 2) * delta_x
+    y_center = y_start + (ny_points // 2) * delta_y
+    amplitudes = amplitudes * np.exp(1j * (kx_nodes * x_center + ky_nodes * y_center))
+
+    x_angles = np.mod(kx_nodes * delta_x, 2 * np.pi)
+    y_angles = np.mod(ky_nodes * delta_y, 2 * np.pi)
+
+    grid_real = np.zeros(nx_grid * ny_grid)
+    grid_imag = np.zeros(nx_grid * ny_grid)
+    n_chunk = max(1, 2**20 // (4 * nx_spread * ny_spread))
+    for i_start in range(0, amplitudes.size, n_chunk):
+        chunk = slice(i_start, i_start + n_chunk)
+        ix, wx = _nufft_spreading_weights(x_angles[chunk], nx_grid, nx_spread, tau_x)
+        iy, wy = _nufft_spreading_weights(y_angles[chunk], ny_grid, ny_spread, tau_y)
+        indices = (ix[:, :, np.newaxis] * ny_grid + iy[:, np.newaxis, :]).ravel()
+        values = (
+            amplitudes[chunk, np.newaxis, np.newaxis]
+            * wx[:, :, np.newaxis]
+            * wy[:, np.newaxis, :]
+        ).ravel()
+        grid_real += np.bincount(indices, values.real, minlength=grid_real.size)
+        grid_imag += np.bincount(indices, values.imag, minlength=grid_imag.size)
+
+    grid = (grid_real + 1j * grid_imag).reshape(nx_grid, ny_grid)
+    modes = get_fft_backend(fft_backend).ifft2(grid)
+
+    i_x, x_factors = _nufft_deconvolution(nx_points, nx_grid, tau_x)
+    i_y, y_factors = _nufft_deconvolution(ny_points, ny_grid, tau_y)
+
+    return modes[np.ix_(i_x, i_y)] * np.outer(x_factors, y_factors)
+
+
 if __name__ == "__main":
     import doctest
 
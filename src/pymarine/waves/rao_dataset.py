@@ -0,0 +1,290 @@
+"""
+Lazy access to the RAOs stored in a NetCDF file.
+
+The RAO data files store the magnitude and phase of the RAO of each degree of freedom
+(DOF) as separate variables *<dof>_abs* and *<dof>_phase* on a (frequency, direction)
+grid, such as *data/RAO_7.nc*. A :class:`RAODataset` keeps the file open and only reads
+the hyperslabs of the requested DOF, frequency band and directions. The slabs read
+recently are kept in a small least recently used (LRU) cache, such that the memory
+usage stays flat when only a few headings and frequency bands are used.
+
+Examples
+--------
+
+>>> with RAODataset("RAO_7.nc") as dataset:
+...     print(dataset.dof_names[:2])
+...     rao = dataset.read_rao("TowO_ACC_AX", frequency_range=(0.2, 1.0))
+['TowO_ACC_AX', 'TowO_ACC_AY']
+>>> rao.shape
+(81, 24)
+
+"""
+
+import logging
+from collections import OrderedDict
+
+import netCDF4 as nc
+import numpy as np
+
+from pymarine.waves.wave_spectra import heading_roll_indices
+
+logger = logging.getLogger(__name__)
+
+
+class RAODataset:
+    """
+    Lazily sliced RAOs of a NetCDF file
+
+    Parameters
+    ----------
+    file_name: str
+        Name of the NetCDF file
+    max_cached_slabs: int, optional
+        Maximum number of slabs in the LRU cache. A slab is the complex RAO of one DOF
+        for one frequency band and one direction. Default = 64
+    frequency_name: str, optional
+        Name of the frequency variable. Default = "frequency"
+    direction_name: str, optional
+        Name of the direction variable. Default = "direction"
+
+    Attributes
+    ----------
+    frequencies: ndarray
+        Frequencies of the RAOs in rad/s
+    directions: ndarray
+        Directions of the RAOs in rad
+    dof_names: list
+        Names of the DOFs, i.e. the names of the variables without the *_abs* and
+        *_phase* extensions
+    n_cache_hits: int
+        Number of slabs taken from the cache
+    n_cache_misses: int
+        Number of slabs read from the file
+
+    Notes
+    -----
+    * Only the frequency and direction coordinates are read at construction
+    * The file stays open until *close* is called, or the end of a *with* block
+    """
+
+    def __init__(
+        self,
+        file_name,
+        max_cached_slabs=64,
+        frequency_name="frequency",
+        direction_name="direction",
+    ):
+        self.file_name = file_name
+        self.max_cached_slabs = max_cached_slabs
+
+        self.dataset = nc.Dataset(file_name)
+        self.dataset.set_auto_mask(False)
+
+        self.frequencies = self.dataset.variables[frequency_name][:]
+        self.directions = self.dataset.variables[direction_name][:]
+
+        variables = self.dataset.variables
+        self.dof_names = [
+            name[: -len("_abs")]
+            for name in variables
+            if name.endswith("_abs") and name[: -len("_abs")] + "_phase" in variables
+        ]
+
+        self.slabs = OrderedDict()
+        self.n_cache_hits = 0
+        self.n_cache_misses = 0
+
+        logger.debug(
+            "Opened {} with {} DOFs on {} frequencies and {} directions".format(
+                file_name,
+                len(self.dof_names),
+                self.frequencies.size,
+                self.directions.size,
+            )
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the NetCDF file and clear the cache"""
+        self.dataset.close()
+        self.slabs.clear()
+
+    def frequency_slice(self, frequency_range=None):
+        """
+        Get the slice of the frequencies within a range
+
+        Parameters
+        ----------
+        frequency_range: tuple, optional
+            Minimum and maximum frequency in rad/s, both included. Default = None, i.e.
+            all frequencies
+
+        Returns
+        -------
+        slice
+            Slice of the frequency axis
+        """
+        if frequency_range is None:
+            return slice(0, self.frequencies.size)
+        f_min, f_max = frequency_range
+        i_start = int(np.searchsorted(self.frequencies, f_min, side="left"))
+        i_end = int(np.searchsorted(self.frequencies, f_max, side="right"))
+        return slice(i_start, i_end)
+
+    def read_rao(self, dof, frequency_range=None, direction_indices=None):
+        """
+        Read the complex RAO of a DOF for a frequency band and a set of directions
+
+        Parameters
+        ----------
+        dof: str or int
+            Name or index of the DOF
+        frequency_range: tuple, optional
+            Minimum and maximum frequency in rad/s. Default = None, i.e. all
+            frequencies
+        direction_indices: array_like, optional
+            Indices of the directions. Default = None, i.e. all directions
+
+        Returns
+        -------
+        ndarray
+            Complex array of shape (n_frequencies, n_directions) with the RAO
+
+        Raises
+        ------
+        ValueError
+            In case the DOF is not in the file
+        """
+        if isinstance(dof, (int, np.integer)):
+            dof = self.dof_names[dof]
+        elif dof not in self.dof_names:
+            raise ValueError(
+                "DOF {} not found in {}. Available: {}".format(
+                    dof, self.file_name, self.dof_names
+                )
+            )
+
+        frequency_slice = self.frequency_slice(frequency_range)
+        if direction_indices is None:
+            direction_indices = np.arange(self.directions.size)
+        direction_indices = np.atleast_1d(direction_indices) % self.directions.size
+
+        band = (frequency_slice.start, frequency_slice.stop)
+        columns = dict()
+        for i_dir in np.unique(direction_indices):
+            key = (dof, band, int(i_dir))
+            if key in self.slabs:
+                self.slabs.move_to_end(key)
+                columns[int(i_dir)] = self.slabs[key]
+        missing = [
+            int(i_dir) for i_dir in np.unique(direction_indices) if i_dir not in columns
+        ]
+        self.n_cache_hits += len(columns)
+        self.n_cache_misses += len(missing)
+
+        # read the hyperslab of all the missing directions at once
+        if missing:
+            rao_abs = self.dataset.variables[dof + "_abs"][frequency_slice, missing]
+            rao_phase = self.dataset.variables[dof + "_phase"][frequency_slice, missing]
+            rao = rao_abs * np.exp(1j * rao_phase)
+            for j_column, i_dir in enumerate(missing):
+                # copy the column, such that its memory is released on removal from
+                # the cache
+                columns[i_dir] = rao[:, j_column].copy()
+                self._store_slab((dof, band, i_dir), columns[i_dir])
+
+        return np.stack([columns[int(i_dir)] for i_dir in direction_indices], axis=-1)
+
+    def read_rao_at_heading(
+        self,
+        dof,
+        heading,
+        frequency_range=None,
+        direction_indices=None,
+        heading_reverse=True,
+    ):
+        """
+        Read the RAO of a DOF rolled to a heading
+
+        Parameters
+        ----------
+        dof: str or int
+            Name or index of the DOF
+        heading: float
+            Heading in degrees defined as where the bow is going to. See *set_heading*
+        frequency_range: tuple, optional
+            Minimum and maximum frequency in rad/s. Default = None, i.e. all
+            frequencies
+        direction_indices: array_like, optional
+            Indices of the wave directions required. Default = None, i.e. all
+            directions
+        heading_reverse: bool, optional
+            Swap the heading by 180 degrees, as in *set_heading*. Default = True
+
+        Returns
+        -------
+        ndarray
+            Complex array of shape (n_frequencies, n_directions) equal to the columns
+            *direction_indices* of the RAO rolled with *set_heading*
+
+        Notes
+        -----
+        Only the directions of the RAO which end up at *direction_indices* after the
+        roll are read
+        """
+        shift = heading_roll_indices(
+            self.directions, heading, heading_reverse=heading_reverse
+        )
+        if direction_indices is None:
+            direction_indices = np.arange(self.directions.size)
+        direction_indices = np.atleast_1d(direction_indices)
+
+        return self.read_rao(
+            dof,
+            frequency_range=frequency_range,
+            direction_indices=direction_indices - shift,
+        )
+
+    def read_raos(self, dofs=None, frequency_range=None, direction_indices=None):
+        """
+        Read the RAOs of a list of DOFs
+
+        Parameters
+        ----------
+        dofs: list, optional
+            Names or indices of the DOFs. Default = None, i.e. all DOFs
+        frequency_range: tuple, optional
+            Minimum and maximum frequency in rad/s. Default = None, i.e. all
+            frequencies
+        direction_indices: array_like, optional
+            Indices of the directions. Default = None, i.e. all directions
+
+        Returns
+        -------
+        ndarray
+            Complex array of shape (n_dof, n_frequencies, n_directions), as used by
+            :class:`~pymarine.waves.wave_responses.RAOResponse`
+        """
+        if dofs is None:
+            dofs = self.dof_names
+        return np.stack(
+            [
+                self.read_rao(
+                    dof,
+                    frequency_range=frequency_range,
+                    direction_indices=direction_indices,
+                )
+                for dof in dofs
+            ]
+        )
+
+    def _store_slab(self, key, slab):
+        """Store a slab in the cache and remove the least recently used slabs"""
+        self.slabs[key] = slab
+        while len(self.slabs) > self.max_cached_slabs:
+            self.slabs.popitem(last=False)
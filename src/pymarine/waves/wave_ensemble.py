@@ -0,0 +1,264 @@
+"""
+Monte Carlo ensembles of realisations of a sea state.
+
+A :class:`~pymarine.waves.wave_fields.Wave1D` or
+:class:`~pymarine.waves.wave_fields.Wave2D` object holds a single realisation of a sea
+state, defined by the random phases belonging to its seed. For extreme value studies,
+many realisations of the same sea state are required. The :class:`WaveEnsemble`
+generates the realisations of a list of seeds from a single wave object. For each seed
+only the random phases are drawn: the wave vector mesh, spectrum, spreading function and
+dispersion of the wave are calculated once and reused.
+
+Examples
+--------
+
+Create an ensemble of 100 realisations of a 1D wave
+
+>>> wave = Wave1D(Lx=1000, nx_points=256, n_kx_nodes=256)
+>>> ensemble = WaveEnsemble(wave, seeds=range(1, 101))
+
+The complex amplitudes and wave surfaces of all the realisations are stacked along the
+first axis
+
+>>> ensemble.complex_amplitudes().shape
+(100, 256)
+>>> ensemble.surfaces(time=0).shape
+(100, 256)
+
+For long time series the fields of all the realisations do not fit in memory. The
+significant wave height and maximum crest per realisation can be obtained with a pool
+of 4 processes without storing the fields
+
+>>> statistics = ensemble.statistics(times=np.arange(0, 600, 0.5), n_workers=4)
+>>> statistics.columns.to_list()
+['Hs', 'crest_max']
+
+"""
+
+import copy
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+from pymarine.waves.wave_fields import Wave2D
+
+logger = logging.getLogger(__name__)
+
+# wave object of the worker processes, set once per process by the pool initializer
+_worker_wave = None
+
+
+def _initialize_worker(wave):
+    """Store the wave object in the worker process such that it is only sent once"""
+    global _worker_wave
+    _worker_wave = wave
+
+
+def _realisation_statistics(wave, seed, times, n_times_chunk):
+    """
+    Calculate the significant wave height and maximum crest of one realisation
+
+    Parameters
+    ----------
+    wave: Wave1D or Wave2D
+        Wave object defining the sea state
+    seed: int
+        Seed of the random phases of the realisation
+    times: ndarray
+        Times in s at which the wave surface is evaluated
+    n_times_chunk: int
+        Number of time steps evaluated at once
+
+    Returns
+    -------
+    tuple
+        The significant wave height 4 std(eta) and the maximum crest max(eta) over all
+        the times and spatial points
+    """
+    realisation = _realisation(wave, seed)
+
+    # accumulate the statistics over chunks of time, such that only one chunk of the
+    # wave field is in memory
+    n_values = 0
+    sum_values = 0.0
+    sum_squares = 0.0
+    crest_max = -np.inf
+    for i_time in range(0, times.size, n_times_chunk):
+        surfaces = realisation.surface_at(times[i_time : i_time + n_times_chunk])
+        surfaces = surfaces.astype(float, copy=False)
+        n_values += surfaces.size
+        sum_values += surfaces.sum()
+        sum_squares += np.square(surfaces).sum()
+        crest_max = max(crest_max, surfaces.max())
+
+    mean = sum_values / n_values
+    variance = max(sum_squares / n_values - mean**2, 0.0)
+
+    return 4 * np.sqrt(variance), crest_max
+
+
+def _worker_statistics(seed, times, n_times_chunk):
+    """Calculate the statistics of a realisation of the wave of the worker process"""
+    return _realisation_statistics(_worker_wave, seed, times, n_times_chunk)
+
+
+def _realisation(wave, seed):
+    """
+    Get a shallow copy of the wave with the complex amplitudes of the realisation *seed*
+
+    Notes
+    -----
+    Only the complex amplitudes of the copy are replaced, all other (cached) arrays are
+    shared with *wave*, which is not changed
+    """
+    realisation = copy.copy(wave)
+    complex_amplitudes = wave.complex_amplitudes_of_seed(seed)
+    if isinstance(wave, Wave2D):
+        realisation.E_wave_complex_amplitudes = complex_amplitudes
+    else:
+        realisation.complex_amplitudes = complex_amplitudes
+    return realisation
+
+
+class WaveEnsemble:
+    """
+    Ensemble of realisations of the sea state of a wave for a list of seeds
+
+    Parameters
+    ----------
+    wave: Wave1D or Wave2D
+        Wave object defining the sea state. All the settings, such as the spectrum,
+        domain, and wave construction method, are taken from this wave
+    seeds: array_like
+        Seeds of the random phases of the realisations. Must be larger than 0 in order
+        to be reproducible. See *phase_generator* of the *wave_spectra* module
+
+    Notes
+    -----
+    * The realisations are obtained by the *complex_amplitudes_of_seed* method of the
+      wave. For a Wave1D, the realisation of a seed equals the wave obtained with the
+      same settings and *seed*
+    * The wave object itself is not changed
+    """
+
+    def __init__(self, wave, seeds):
+        self.wave = wave
+        self.seeds = np.atleast_1d(np.asarray(seeds, dtype=int))
+
+        if np.any(self.seeds <= 0):
+            raise ValueError(
+                "The seeds of an ensemble must be larger than 0. Found {}".format(
+                    self.seeds
+                )
+            )
+
+        if isinstance(wave, Wave2D):
+            self.time = wave.wave1D.time
+        else:
+            self.time = wave.time
+
+    def complex_amplitudes(self):
+        """
+        Calculate the complex amplitudes of all the realisations
+
+        Returns
+        -------
+        ndarray
+            Complex array of shape (n_seeds, ...) with the complex amplitudes of each
+            realisation stacked along the first axis
+        """
+        return np.stack(
+            [self.wave.complex_amplitudes_of_seed(seed) for seed in self.seeds]
+        )
+
+    def surfaces(self, time=None):
+        """
+        Calculate the wave surface of all the realisations at a given time
+
+        Parameters
+        ----------
+        time: float, optional
+            Time in s. Default = None, i.e. the current time of the wave is used
+
+        Returns
+        -------
+        ndarray
+            Real array of shape (n_seeds, n_x) for a Wave1D or (n_seeds, n_x, n_y) for a
+            Wave2D with the wave surface of each realisation
+        """
+        if time is None:
+            time = self.time
+        return np.stack(
+            [_realisation(self.wave, seed).surface_at([time])[0] for seed in self.seeds]
+        )
+
+    def statistics(self, times=None, n_workers=None, n_times_chunk=16):
+        """
+        Calculate the significant wave height and maximum crest of each realisation
+
+        Parameters
+        ----------
+        times: array_like, optional
+            Times in s at which the wave surfaces are evaluated. Default = None, i.e.
+            only the current time of the wave is used
+        n_workers: int, optional
+            Number of processes over which the realisations are distributed. Default =
+            None, i.e. all realisations are calculated in the current process
+        n_times_chunk: int, optional
+            Number of time steps of which the wave surfaces are evaluated at once by
+            *surface_at*. Default = 16
+
+        Returns
+        -------
+        DataFrame
+            Data frame with the *seed* as index and the columns
+
+            * Hs: significant wave height 4 std(eta) over all times and spatial points
+            * crest_max: maximum wave elevation over all times and spatial points
+
+        Notes
+        -----
+        * The wave surfaces are reduced to the statistics per chunk of time steps, so
+          the memory only scales with *n_times_chunk* times the size of a wave field
+          for each process, and not with the number of seeds or times
+        * With *n_workers*, the wave is sent only once to each process of the pool.
+          The statistics of a realisation do not depend on the number of workers
+        """
+        if times is None:
+            times = [self.time]
+        times = np.atleast_1d(np.asarray(times, dtype=float))
+
+        if n_workers is None or n_workers == 1:
+            results = [
+                _realisation_statistics(self.wave, seed, times, n_times_chunk)
+                for seed in self.seeds
+            ]
+        else:
+            logger.info(
+                "Calculating {} realisations with {} workers".format(
+                    self.seeds.size, n_workers
+                )
+            )
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                initializer=_initialize_worker,
+                initargs=(self.wave,),
+            ) as executor:
+                results = list(
+                    executor.map(
+                        _worker_statistics,
+                        self.seeds,
+                        repeat(times),
+                        repeat(n_times_chunk),
+                    )
+                )
+
+        statistics = pd.DataFrame(
+            results,
+            index=pd.Index(self.seeds, name="seed"),
+            columns=["Hs", "crest_max"],
+        )
+        return statistics
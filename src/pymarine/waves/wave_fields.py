@@ -10,6 +10,7 @@ The theoretical background has the following contents
 * Wave1D_ : Description of the Wave1D class
     - dft1d_ :  Discrete Fourier Transform implementation for 1D wave spectra
     - fft1d_ :  Fast Fourier Transform implementation for 1D waves spectra
+    - nufft_ :  Non-uniform Fast Fourier Transform for non-uniform wave vectors
 * Wave2D_ : Description of the Wave2D class
     - dft2d_ :  Discrete Fourier Transform implementation for 2D wave spectra
     - fft2d_ :  Fast Fourier Transform implementation for 2D wave spectra
@@ -115,6 +116,22 @@ proportional to :math:`N^2`, while the calculation time of an FFT is proportiona
 :math:`N\\log(N)`. The FFT is used for the Wave1D solution when the *wave_construction*
 field is set to *FFT*.
 
+.. _nufft:
+
+Wave equation with NUFFT
+------------------------
+
+The FFT requires the wave vectors to be on the uniform grid belonging to the spatial
+nodes, which rules out a smart (non-uniform) selection of the wave nodes as done with
+the *wave_selection* options *Subrange* and *EqualEnergyBins*. For these selections
+the DFT sum can still be evaluated in :math:`N\\log(N)` with a non-uniform FFT (NUFFT):
+each wave vector is spread to an oversampled uniform grid with a narrow Gaussian kernel,
+the grid is transformed with an FFT, and the Gaussian is deconvolved from the result.
+The accuracy is controlled by the width of the kernel, which follows from the requested
+tolerance. The NUFFT is used when the *wave_construction* field is set to *NUFFTpolar*,
+both for the Wave1D and the Wave2D. See *nufft1d* and *nufft2d* from the *numerical*
+module for the implementation.
+
 .. _Wave2D:
 
 =============================================
@@ -142,6 +159,8 @@ implemented:
 3. *DFTcartesian*: The exact same symmetric spectral amplitudes as the FFT is used, but
    the wave is calculated with a DFT. This is so slow that it is not possible to
    include all wave components, so only used for testing purposes.
+4. *NUFFTpolar*: The same polar wave vectors as the *DFTpolar* are used, but the
+   wave field is calculated with a non-uniform FFT (see nufft_) to a given tolerance.
 
 .. _dft2d:
 
@@ -245,6 +264,9 @@ Start of the *wave_fields* implementation
 """
 
 import logging
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 from os.path import splitext
 
 import colorcet as cc
@@ -259,16 +281,32 @@ import seaborn as sns
 from matplotlib.colors import LightSource
 from numpy.fft import fftshift
 from scipy.constants import g as g0  # gravity constant 9.81 m/s2
+from scipy.fft import next_fast_len
 
 import pymarine.waves.wave_spectra as ms
 from pymarine.utils.coordinate_transformations import polar_to_cartesian
-from pymarine.utils.numerical import find_idx_nearest_val
+from pymarine.utils.fft_backends import FFTBackend, get_fft_backend
+from pymarine.utils.numerical import nufft1d, nufft2d
 from pymarine.utils.plotting import clean_up_artists, set_limits
 
 sns.set(context="notebook")
 
 logger = logging.getLogger(__name__)
 
+# wave constructions which use the (non-uniform) polar wave vectors
+POLAR_CONSTRUCTIONS = ("DFTpolar", "NUFFTpolar")
+
+# real and complex data types of the wave field arrays per precision
+PRECISION_DTYPES = {
+    "double": (np.float64, np.complex128),
+    "single": (np.float32, np.complex64),
+}
+
+# spawn key of the random generator of the Wave2D phases, such that the phases of a
+# Wave2D are independent of the ones of its Wave1D with the same seed. All the phases
+# of a wave are drawn from this one stream, also when the wave field is sharded
+WAVE2D_SPAWN_KEY = (1,)
+
 
 class PlotProperties:
     """
@@ -303,6 +341,103 @@ class PlotProperties:
         self.save_data = False
 
 
+class PhaseRotationStepper:
+    """
+    A class to advance complex spectral amplitudes in time by incremental phase
+    rotation
+
+    Parameters
+    ----------
+    n_steps_reanchor: int, optional
+        Number of incremental steps after which the rotated amplitudes are recalculated
+        exactly from the exponential to prevent the accumulation of round-off errors.
+        Default = 100
+
+    Notes
+    -----
+    * For a fixed time step :math:`\\Delta t` the complex amplitudes at time
+      :math:`t + \\Delta t` follow from the amplitudes at time :math:`t` by one complex
+      multiplication with the pre-calculated :math:`\\exp(-j\\omega\\Delta t)`. This
+      saves the evaluation of the exponential over the whole spectral mesh for each
+      time step.
+    * If the time did not advance with exactly one time step (or the amplitudes or
+      angular frequencies were changed) the rotated amplitudes are re-anchored, i.e.,
+      calculated exactly as :math:`\\hat{A}\\exp(-j\\omega t)`
+    * A change of the amplitudes is detected by a new array object or a new *version*.
+      Arrays modified in place are only detected with a *version* which is increased
+      on each modification, such as the *amplitudes_version* of the wave classes
+    """
+
+    def __init__(self, n_steps_reanchor=100):
+        self.n_steps_reanchor = n_steps_reanchor
+        self.rotated_amplitudes = None
+        self.time = None
+        self.n_steps = 0
+        self.delta_t = None
+        self.step_rotation = None
+        self.complex_amplitudes = None
+        self.omega = None
+        self.version = None
+
+    def rotate(self, complex_amplitudes, omega, time, delta_t, version=None):
+        """
+        Get the complex amplitudes rotated to the time 'time'
+
+        Parameters
+        ----------
+        complex_amplitudes: ndarray
+            Complex amplitudes at time t=0
+        omega: ndarray
+            Angular frequency of each complex amplitude
+        time: float
+            Current time
+        delta_t: float
+            Time step used for the incremental rotation
+        version: int, optional
+            Version of the complex amplitudes and angular frequencies. The rotation is
+            re-anchored when the version changes. Default = None
+
+        Returns
+        -------
+        ndarray
+            Complex amplitudes multiplied with exp(-j omega time). The returned array
+            is owned by the stepper and should not be modified
+        """
+        same_source = (
+            self.rotated_amplitudes is not None
+            and complex_amplitudes is self.complex_amplitudes
+            and omega is self.omega
+            and version == self.version
+        )
+
+        if same_source and time == self.time:
+            return self.rotated_amplitudes
+
+        if (
+            same_source
+            and self.n_steps < self.n_steps_reanchor
+            and np.isclose(time - self.time, delta_t, rtol=1e-9, atol=0)
+        ):
+            if self.step_rotation is None or delta_t != self.delta_t:
+                self.step_rotation = np.exp(-1j * omega * delta_t).astype(
+                    self.rotated_amplitudes.dtype, copy=False
+                )
+                self.delta_t = delta_t
+            self.rotated_amplitudes *= self.step_rotation
+            self.n_steps += 1
+        else:
+            self.rotated_amplitudes = complex_amplitudes * np.exp(-1j * omega * time)
+            self.complex_amplitudes = complex_amplitudes
+            self.omega = omega
+            self.version = version
+            self.step_rotation = None
+            self.n_steps = 0
+
+        self.time = time
+
+        return self.rotated_amplitudes
+
+
 def _energy_deficit(k, k0, E, Hs, Tp, gamma, spectral_version, spectrum_type, sigma):
     """
     Helper function for fsolve to calculate the integral of the spectrum between k0 and
@@ -358,6 +493,275 @@ def _energy_deficit(k, k0, E, Hs, Tp, gamma, spectral_version, spectrum_type, si
     return delta_e
 
 
+def _dft_in_tiles(complex_amplitudes, kx_nodes, xpoints, memory_budget=256):
+    """
+    Helper function to calculate the sum over A_i exp(j k_i x_p) without storing the
+    full n_k x n_x matrix exp(j k x)
+
+    Parameters
+    ----------
+    complex_amplitudes: ndarray
+        Complex amplitudes of size n_k, or a n_t x n_k matrix in case the surface is
+        calculated for n_t time steps at once
+    kx_nodes: ndarray
+        Wave vector nodes of size n_k
+    xpoints: ndarray
+        Spatial nodes of size n_x
+    memory_budget: float, optional
+        Maximum memory in MB used for a tile of the exp(j k x) matrix. Default = 256 MB
+
+    Returns
+    -------
+    ndarray
+        Complex array with the DFT of size n_x, or n_t x n_x for a 2D input
+
+    Notes
+    -----
+    The exp(j k x) matrix is evaluated in tiles of wave vector rows and spatial columns
+    which fit in the memory budget. The cosine and sine of a tile are written directly
+    into the real and imaginary part of the complex tile to prevent temporaries.
+    """
+    n_k = kx_nodes.size
+    n_x = xpoints.size
+
+    # a tile element costs a complex128 value plus the float64 phase
+    n_elements = max(1, int(memory_budget * 1024**2 / 24))
+    n_k_tile = min(n_k, n_elements)
+    n_x_tile = min(n_x, max(1, n_elements // n_k_tile))
+
+    dft = np.zeros(complex_amplitudes.shape[:-1] + (n_x,), dtype=complex)
+    exp_tile = np.empty((n_k_tile, n_x_tile), dtype=complex)
+    phase_tile = np.empty((n_k_tile, n_x_tile))
+    for i_x in range(0, n_x, n_x_tile):
+        x_tile = xpoints[i_x : i_x + n_x_tile]
+        for i_k in range(0, n_k, n_k_tile):
+            k_tile = kx_nodes[i_k : i_k + n_k_tile]
+            phase = phase_tile[: k_tile.size, : x_tile.size]
+            exp_kx = exp_tile[: k_tile.size, : x_tile.size]
+            np.multiply.outer(k_tile, x_tile, out=phase)
+            np.cos(phase, out=exp_kx.real)
+            np.sin(phase, out=exp_kx.imag)
+            dft[..., i_x : i_x + x_tile.size] += np.dot(
+                complex_amplitudes[..., i_k : i_k + k_tile.size], exp_kx
+            )
+
+    return dft
+
+
+def _dft2d_in_blocks(
+    complex_amplitudes, kx_nodes, ky_nodes, xpoints, ypoints, memory_budget=256
+):
+    """
+    Helper function to calculate the sum over A_i exp(j (kx_i x_p + ky_i y_q)) on a
+    tensor mesh of x and y points for arbitrary (non-uniform) 2D wave vectors
+
+    Parameters
+    ----------
+    complex_amplitudes: ndarray
+        Complex amplitudes of the n_c wave vector components. Any shape equal to the
+        shape of *kx_nodes* and *ky_nodes* is allowed
+    kx_nodes: ndarray
+        x-component of the wave vectors
+    ky_nodes: ndarray
+        y-component of the wave vectors
+    xpoints: ndarray
+        Spatial nodes in x direction of size n_x
+    ypoints: ndarray
+        Spatial nodes in y direction of size n_y
+    memory_budget: float, optional
+        Maximum memory in MB used for a block of the exp(j kx x) and exp(j ky y)
+        matrices. Default = 256 MB
+
+    Returns
+    -------
+    ndarray
+        n_x x n_y complex array with the DFT
+
+    Notes
+    -----
+    The exponential of a single component factorises as exp(j kx x) exp(j ky y), so
+    the contribution of a block of components to the wave field follows from the
+    matrix product (Ex * A) @ Ey^T of the n_x x n_b matrix Ex=exp(j kx x), scaled by
+    the amplitudes, and the n_y x n_b matrix Ey=exp(j ky y). The components are
+    processed in blocks, and the x points in tiles, such that the matrices fit in the
+    memory budget. The cosine and sine are written directly into the real and
+    imaginary part of the blocks and the products are accumulated in place, so no
+    temporary exponentials of the size of the wave field are created.
+    """
+    complex_amplitudes = np.asarray(complex_amplitudes).ravel()
+    kx_nodes = np.asarray(kx_nodes).ravel()
+    ky_nodes = np.asarray(ky_nodes).ravel()
+    n_c = complex_amplitudes.size
+    n_x = xpoints.size
+    n_y = ypoints.size
+
+    # a block element costs a complex128 value plus the float64 phase. Keep at least
+    # half of the budget for the y block, which is not tiled
+    n_elements = max(1, int(memory_budget * 1024**2 / 24))
+    n_x_tile = min(n_x, max(1, n_elements // 2 // n_y))
+    n_c_block = min(n_c, max(1, n_elements // (n_x_tile + n_y)))
+
+    dft = np.zeros((n_x, n_y), dtype=complex)
+    ex_block = np.empty((n_x_tile, n_c_block), dtype=complex)
+    ey_block = np.empty((n_y, n_c_block), dtype=complex)
+    phase_block = np.empty((max(n_x_tile, n_y), n_c_block))
+    product = np.empty((n_x_tile, n_y), dtype=complex)
+    for i_c in range(0, n_c, n_c_block):
+        amplitudes = complex_amplitudes[i_c : i_c + n_c_block]
+        n_b = amplitudes.size
+        phase = phase_block[:n_y, :n_b]
+        ey = ey_block[:, :n_b]
+        np.multiply.outer(ypoints, ky_nodes[i_c : i_c + n_b], out=phase)
+        np.cos(phase, out=ey.real)
+        np.sin(phase, out=ey.imag)
+        for i_x in range(0, n_x, n_x_tile):
+            x_tile = xpoints[i_x : i_x + n_x_tile]
+            phase = phase_block[: x_tile.size, :n_b]
+            ex = ex_block[: x_tile.size, :n_b]
+            np.multiply.outer(x_tile, kx_nodes[i_c : i_c + n_b], out=phase)
+            np.cos(phase, out=ex.real)
+            np.sin(phase, out=ex.imag)
+            ex *= amplitudes
+            out = product[: x_tile.size]
+            np.matmul(ex, ey.T, out=out)
+            dft[i_x : i_x + x_tile.size] += out
+
+    return dft
+
+
+# state of the DFT worker processes, set once per process by the pool initializer
+_dft_worker = None
+
+
+def _initialize_dft_worker(shm_name, shape, grid):
+    """
+    Attach the shared output buffer and store the grid in the DFT worker process
+
+    Parameters
+    ----------
+    shm_name: str
+        Name of the shared memory block holding the n_slots x n_x x n_y partial fields
+    shape: tuple
+        Shape of the array of partial fields in the shared memory block
+    grid: dict
+        Keyword arguments of *_dft2d_shard_field* which are the same for all shards
+    """
+    global _dft_worker
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _dft_worker = dict(
+        shm=shm, fields=np.ndarray(shape, dtype=float, buffer=shm.buf), grid=grid
+    )
+
+
+def _dft2d_shard_field(
+    complex_amplitudes,
+    i_start,
+    i_end,
+    kx_nodes,
+    ky_nodes,
+    xpoints,
+    ypoints,
+    exp_matrix_kx,
+    exp_matrix_ky,
+    memory_budget,
+):
+    """
+    Calculate the partial wave field of a shard of wave components
+
+    Parameters
+    ----------
+    complex_amplitudes: ndarray
+        Complex amplitudes of the wave components of this shard, already rotated to the
+        current time. For the separable DFT, the rows *i_start:i_end* of the kx x ky
+        matrix of amplitudes
+    i_start: int
+        Index of the first wave component (or kx row) of the shard
+    i_end: int
+        Index after the last wave component (or kx row) of the shard
+    kx_nodes: ndarray
+        x-component of all the wave vectors
+    ky_nodes: ndarray
+        y-component of all the wave vectors
+    xpoints: ndarray
+        Spatial nodes in x direction
+    ypoints: ndarray
+        Spatial nodes in y direction
+    exp_matrix_kx: ndarray or None
+        The nx x nkx matrix exp(j kx x) of the separable DFT on the cartesian mesh. If
+        None, the DFT is evaluated in blocks with *_dft2d_in_blocks*
+    exp_matrix_ky: ndarray or None
+        The ny x nky matrix exp(j ky y) of the separable DFT
+    memory_budget: float
+        Memory in MB for the blocks of *_dft2d_in_blocks*
+
+    Returns
+    -------
+    ndarray
+        Real nx x ny partial wave field of the shard
+    """
+    if exp_matrix_kx is not None:
+        return np.real(
+            exp_matrix_kx[:, i_start:i_end] @ complex_amplitudes @ exp_matrix_ky.T
+        )
+    return np.real(
+        _dft2d_in_blocks(
+            complex_amplitudes,
+            kx_nodes[i_start:i_end],
+            ky_nodes[i_start:i_end],
+            xpoints,
+            ypoints,
+            memory_budget=memory_budget,
+        )
+    )
+
+
+def _dft2d_shard(i_slot, complex_amplitudes, i_start, i_end):
+    """Calculate the partial field of a shard into a slot of the shared buffer"""
+    _dft_worker["fields"][i_slot] = _dft2d_shard_field(
+        complex_amplitudes, i_start, i_end, **_dft_worker["grid"]
+    )
+
+
+def _release_dft_pool(pool, shm):
+    """Shut down the pool of the sharded DFT and release its shared memory"""
+    pool.shutdown()
+    shm.close()
+    shm.unlink()
+
+
+def _fft_out(fft_buffers, name, fft_backend, shape, dtype):
+    """
+    Preallocated output array of an inverse FFT
+
+    Parameters
+    ----------
+    fft_buffers: dict
+        Output arrays of the wave per *name*. A new array is only stored when the shape
+        or data type of the output changes
+    name: str
+        Name of the output array
+    fft_backend: FFTBackend
+        Backend carrying out the FFT
+    shape: tuple
+        Shape of the output of the FFT
+    dtype: dtype
+        Data type of the output of the FFT
+
+    Returns
+    -------
+    ndarray or None
+        The output array to pass as *out* to the FFT, or None in case the backend
+        copies the result into *out* anyway, such that it can allocate the output itself
+    """
+    if not fft_backend.writes_to_out:
+        return None
+    out = fft_buffers.get(name)
+    if out is None or out.shape != shape or out.dtype != dtype:
+        out = fft_backend.empty_out(shape, dtype)
+        fft_buffers[name] = out
+    return out
+
+
 class Wave2D:
     """
     A class for linearized solutions of the 2D wave (deep water, linear). The Wave1D is
@@ -407,6 +811,35 @@ class Wave2D:
     Theta_s_spreading_factor: float, optional
         Spreading factor (s-definition) in theta domain. Default = 5 (Typical for wind
         waves, for swell use 13.0)
+    incremental_stepping: bool, optional
+        Advance the complex amplitudes in time by incremental phase rotation with a
+        pre-calculated exp(-j omega delta_t) when the time proceeds with one time step.
+        Default = True
+    n_steps_reanchor: int, optional
+        Number of incremental time steps after which the phase rotation is re-anchored
+        to the exact solution. Default = 100
+    dft_memory_budget: float, optional
+        Maximum memory in MB used for the blocks of exp(j kx x) and exp(j ky y) in the
+        DFTpolar construction. Default = None, i.e. the *dft_memory_budget* of the
+        wave1D is used
+    n_workers: int, optional
+        Number of processes used to calculate the wave field of the DFT constructions.
+        The wave components are divided over *n_shards* shards which are distributed
+        over a process pool. The pool is kept until *close* is called or the end of a
+        *with* block. Default = None, i.e. the wave field is calculated in the current
+        process without sharding
+    n_shards: int, optional
+        Number of shards of wave components used when *n_workers* is given. The
+        sharding does not depend on the number of workers, such that the wave field is
+        bit-for-bit identical for any number of workers. Default = 16
+    fft_backend: {None, "numpy", "scipy", "pyfftw"} or FFTBackend, optional
+        Backend used for the inverse FFTs of this wave. Default = None, i.e. the
+        backend of the wave1D is used
+    fft_padding: bool, optional
+        Carry out the FFT on the next fast FFT lengths *nx_fft* x *ny_fft* with the
+        same spatial resolution and crop the wave field back to *nx_points* x
+        *ny_points*. Only used for the FFT construction. Default = None, i.e. the
+        *fft_padding* of the wave1D is used
     """
 
     def __init__(
@@ -432,6 +865,13 @@ class Wave2D:
         n_theta_nodes=100,
         Theta_0=0,
         Theta_s_spreading_factor=5,
+        incremental_stepping=True,
+        n_steps_reanchor=100,
+        dft_memory_budget=None,
+        n_workers=None,
+        n_shards=16,
+        fft_backend=None,
+        fft_padding=None,
     ):
         logger.info("Initialise JonSwap 1D wave field")
 
@@ -449,6 +889,8 @@ class Wave2D:
             self.name = name
 
         self.wave1D = wave1D
+        # the half plane spectrum is only used for the FFT construction
+        self.half_spectrum = wave1D.half_spectrum and wave1D.wave_construction == "FFT"
         self.Lx = Lx
         self.Ly = Ly
         self.nx_points = nx_points
@@ -487,6 +929,8 @@ class Wave2D:
         self.n_kx_nodes = n_kx_nodes
         self.k_polar_mesh = None
         self.k_polar_bin_area_over_kk = None
+        # increased on each assignment of the complex amplitudes or omega_dispersion
+        self.amplitudes_version = 0
         self.omega_dispersion = None
         self.E_wave_density_polar = None
 
@@ -500,6 +944,8 @@ class Wave2D:
         self.ky_nodes = None
 
         self.k_cartesian_mesh = None
+        self.exp_matrix_kx = None
+        self.exp_matrix_ky = None
         self.kk = None
         self.E_wave_complex_amplitudes = None
         self.omega_sign = None
@@ -512,8 +958,45 @@ class Wave2D:
 
         self.theta_area_fraction = 1
 
-        # use seed to update the random phase if required
+        # stepping of the complex amplitudes in time by incremental phase rotation
+        self.incremental_stepping = incremental_stepping
+        self.phase_rotator = PhaseRotationStepper(n_steps_reanchor=n_steps_reanchor)
+
+        if dft_memory_budget is None:
+            self.dft_memory_budget = wave1D.dft_memory_budget
+        else:
+            self.dft_memory_budget = dft_memory_budget
+
+        self.n_workers = n_workers
+        self.n_shards = n_shards
+        # the process pool and shared output buffer of the sharded DFT
+        self._dft_pool = None
+        self._dft_pool_key = None
+        self._dft_fields = None
+        self._dft_finalizer = None
+
+        if fft_backend is None:
+            self.fft_backend = wave1D.fft_backend
+        elif isinstance(fft_backend, str):
+            self.fft_backend = FFTBackend(fft_backend)
+        else:
+            self.fft_backend = fft_backend
+        # preallocated output arrays of the inverse FFTs
+        self.fft_buffers = dict()
+
+        if fft_padding is None:
+            self.fft_padding = wave1D.fft_padding
+        else:
+            self.fft_padding = fft_padding
+        # number of points of the FFT, which is larger than the number of points for
+        # fft_padding
+        self.nx_fft = nx_points
+        self.ny_fft = ny_points
+
+        # use seed to update the random phase if required. The phases are drawn with
+        # the random generator rng of this object, created from the seed of the wave1D
         self.seed = 1
+        self.rng = None
         self.update_phase = True
 
         self.update_x_k_theta_sample_space()
@@ -522,6 +1005,32 @@ class Wave2D:
         self.calculate_spectral_components()
         self.calculate_wave_surface()
 
+    @property
+    def E_wave_complex_amplitudes(self):
+        """Complex amplitudes of the wave components at t=0
+
+        Notes
+        -----
+        Each assignment increases *amplitudes_version*, which re-anchors the incremental
+        phase rotation. After modifying the amplitudes in place, assign them again
+        """
+        return self._E_wave_complex_amplitudes
+
+    @E_wave_complex_amplitudes.setter
+    def E_wave_complex_amplitudes(self, complex_amplitudes):
+        self._E_wave_complex_amplitudes = complex_amplitudes
+        self.amplitudes_version += 1
+
+    @property
+    def omega_dispersion(self):
+        """Angular frequencies of the components. See *E_wave_complex_amplitudes*"""
+        return self._omega_dispersion
+
+    @omega_dispersion.setter
+    def omega_dispersion(self, omega_dispersion):
+        self._omega_dispersion = omega_dispersion
+        self.amplitudes_version += 1
+
     def make_report(self):
         """Make report of settings for this wave"""
 
@@ -548,6 +1057,9 @@ class Wave2D:
         print(frm.format("Number x - nodes", self.xpoints.size))
         print(frm.format("Number y - nodes", self.ypoints.size))
         print(frm.format("Total number of spatial points", n_x_points_total))
+        if (self.nx_fft, self.ny_fft) != (self.nx_points, self.ny_points):
+            print(frm.format("Number x - nodes FFT (padded)", self.nx_fft))
+            print(frm.format("Number y - nodes FFT (padded)", self.ny_fft))
         if self.kx_nodes is not None:
             print("# Cartesian mesh specifications")
             print(frm.format("Number kx - nodes", self.kx_nodes.size))
@@ -579,6 +1091,7 @@ class Wave2D:
         print("----------- Numerical methods --------")
         print(frm.format("Selection method", self.wave1D.wave_selection))
         print(frm.format("Construction method", self.wave1D.wave_construction))
+        print(frm.format("Precision", self.wave1D.precision))
         print(frm.format("DFT N x N", n_x_points_total * n_k_points_total))
         print(frm.format("FFT N x log(N)", n_x_points_total * np.log(n_x_points_total)))
 
@@ -642,14 +1155,17 @@ class Wave2D:
 
         self.delta_y = self.ypoints[1] - self.ypoints[0]
 
-        self.xy_mesh = np.meshgrid(self.xpoints, self.ypoints, indexing="ij")
+        self.xy_mesh = [
+            mesh.astype(self.wave1D.real_dtype, copy=False)
+            for mesh in np.meshgrid(self.xpoints, self.ypoints, indexing="ij")
+        ]
 
-        self.amplitude = np.zeros(self.xy_mesh[0].shape)
+        self.amplitude = np.zeros(self.xy_mesh[0].shape, dtype=self.wave1D.real_dtype)
 
         self.kx_nyquist = np.pi / self.delta_x
         self.ky_nyquist = np.pi / self.delta_y
 
-        if self.wave1D.wave_construction == "DFTpolar":
+        if self.wave1D.wave_construction in POLAR_CONSTRUCTIONS:
             # take the (non)-uniform wave vectors from the 1D wave
             self.update_k_polar_mesh()
 
@@ -657,8 +1173,19 @@ class Wave2D:
             # For the FFT, the number wave vectors should be equal to the number of x
             # points. For the DFT on the cartesian mesh, we use the same mesh as the
             # FFT, so we can compare the speed of the algorithms
-            self.kx_nodes = 2 * np.pi * np.fft.fftfreq(self.nx_points, self.delta_x)
-            self.ky_nodes = 2 * np.pi * np.fft.fftfreq(self.ny_points, self.delta_y)
+            self.nx_fft = self.nx_points
+            self.ny_fft = self.ny_points
+            if self.wave1D.wave_construction == "FFT" and self.fft_padding:
+                # extend the domain with the same resolution to fast FFT lengths. The
+                # wave field is cropped to nx_points x ny_points afterwards
+                self.nx_fft = next_fast_len(self.nx_points)
+                self.ny_fft = next_fast_len(self.ny_points, real=self.half_spectrum)
+            self.kx_nodes = 2 * np.pi * np.fft.fftfreq(self.nx_fft, self.delta_x)
+            if self.half_spectrum:
+                # only the non-negative half plane ky >= 0 for the real inverse FFT
+                self.ky_nodes = 2 * np.pi * np.fft.rfftfreq(self.ny_fft, self.delta_y)
+            else:
+                self.ky_nodes = 2 * np.pi * np.fft.fftfreq(self.ny_fft, self.delta_y)
 
             self.delta_kx = self.kx_nodes[1] - self.kx_nodes[0]
             self.delta_ky = self.ky_nodes[1] - self.ky_nodes[0]
@@ -670,6 +1197,17 @@ class Wave2D:
                 self.k_cartesian_mesh[0] ** 2 + self.k_cartesian_mesh[1] ** 2
             )
 
+            if self.wave1D.wave_construction == "DFTcartesian":
+                # on the cartesian mesh exp(j (kx x + ky y)) = exp(j kx x) exp(j ky y),
+                # so the DFT factorises into the nx x nkx and ny x nky matrices
+                complex_dtype = self.wave1D.complex_dtype
+                self.exp_matrix_kx = np.exp(
+                    1j * np.outer(self.xpoints, self.kx_nodes)
+                ).astype(complex_dtype, copy=False)
+                self.exp_matrix_ky = np.exp(
+                    1j * np.outer(self.ypoints, self.ky_nodes)
+                ).astype(complex_dtype, copy=False)
+
     def calculate_spreading_function(self):
         """Calculate the spreading function"""
         self.D_spread = ms.spreading_function(
@@ -723,9 +1261,8 @@ class Wave2D:
                 phase_shape_mismatch = False
         if self.phase is None or phase_shape_mismatch or self.update_phase:
             self.E_wave_density_polar = np.zeros(self.k_cartesian_mesh[0].shape)
-            self.phase = ms.initialize_phase(
-                self.E_wave_density_polar, self.wave1D.seed
-            )
+            self.rng = ms.phase_generator(self.wave1D.seed, WAVE2D_SPAWN_KEY)
+            self.phase = ms.initialize_phase(self.E_wave_density_polar, rng=self.rng)
             self.update_phase = False
 
     def calculate_spectral_components(self):
@@ -734,7 +1271,7 @@ class Wave2D:
         angles
         """
 
-        if self.wave1D.wave_construction == "DFTpolar":
+        if self.wave1D.wave_construction in POLAR_CONSTRUCTIONS:
             # the DFT based on a polar mesh is used. Calculate the polar coordinates
             # and turn it in cartesian values
 
@@ -759,26 +1296,47 @@ class Wave2D:
         else:
             # Either a DFT (wave_construction==DFTcartesian) or a FFT
             # (wave_construction==FFT) based on a cartesian mesh is used.
+            # A new generator gives the same phases for the same seed at each call
+            self.rng = ms.phase_generator(self.wave1D.seed, WAVE2D_SPAWN_KEY)
             self.k_cartesian_mesh = self.k_xy_mesh
             self.kk = np.sqrt(self.k_xy_mesh[0] ** 2 + self.k_xy_mesh[1] ** 2)
             self.kk = np.where(
                 abs(self.kk) < ms.TINY, ms.TINY * np.ones(self.kk.shape), self.kk
             )
 
-            (
-                self.E_wave_complex_amplitudes,
-                self.omega_sign,
-            ) = ms.spectrum2d_complex_amplitudes(
-                kx_nodes=self.kx_nodes,
-                ky_nodes=self.ky_nodes,
-                Hs=self.wave1D.Hs,
-                Tp=self.wave1D.Tp,
-                gamma=self.wave1D.gamma,
-                Theta_0=self.Theta_0,
-                Theta_s_spread_kx=self.Theta_s_spreading_factor,
-                spectrum_type=self.wave1D.spectrum_type,
-                spectral_version=self.wave1D.spectral_version,
-            )
+            if self.half_spectrum:
+                (
+                    self.E_wave_complex_amplitudes,
+                    self.omega_sign,
+                ) = ms.spectrum2d_complex_amplitudes_half_plane(
+                    kx_nodes=self.kx_nodes,
+                    ky_nodes=self.ky_nodes,
+                    ny_points=self.ny_fft,
+                    Hs=self.wave1D.Hs,
+                    Tp=self.wave1D.Tp,
+                    gamma=self.wave1D.gamma,
+                    Theta_0=self.Theta_0,
+                    Theta_s_spread_kx=self.Theta_s_spreading_factor,
+                    spectrum_type=self.wave1D.spectrum_type,
+                    spectral_version=self.wave1D.spectral_version,
+                    rng=self.rng,
+                )
+            else:
+                (
+                    self.E_wave_complex_amplitudes,
+                    self.omega_sign,
+                ) = ms.spectrum2d_complex_amplitudes(
+                    kx_nodes=self.kx_nodes,
+                    ky_nodes=self.ky_nodes,
+                    Hs=self.wave1D.Hs,
+                    Tp=self.wave1D.Tp,
+                    gamma=self.wave1D.gamma,
+                    Theta_0=self.Theta_0,
+                    Theta_s_spread_kx=self.Theta_s_spreading_factor,
+                    spectrum_type=self.wave1D.spectrum_type,
+                    spectral_version=self.wave1D.spectral_version,
+                    rng=self.rng,
+                )
 
             k_bin_area = self.delta_kx * self.delta_ky
             # area_polar = self.wave1D.kx_nodes * self.k_polar_bin_area_over_kk
@@ -788,18 +1346,117 @@ class Wave2D:
             # calculate the omega values belong to the wave vectors
             self.calculate_omega_dispersion()
 
+        # the spectrum is calculated in double precision. Now store the arrays used to
+        # construct the wave field in the requested precision
+        self.E_wave_complex_amplitudes = self.E_wave_complex_amplitudes.astype(
+            self.wave1D.complex_dtype, copy=False
+        )
+        self.omega_dispersion = self.omega_dispersion.astype(
+            self.wave1D.real_dtype, copy=False
+        )
+        self.k_cartesian_mesh = np.asarray(
+            self.k_cartesian_mesh, dtype=self.wave1D.real_dtype
+        )
+
+    def complex_amplitudes_of_seed(self, seed):
+        """Calculate the complex amplitudes of the realisation with a given seed
+
+        Parameters
+        ----------
+        seed: int
+            Seed of the random phases. See *phase_generator* of the *wave_spectra*
+            module
+
+        Returns
+        -------
+        ndarray
+            Complex amplitudes with the same shape as the *E_wave_complex_amplitudes*
+
+        Notes
+        -----
+        * Only new random phases are drawn. The wave vector mesh, spectrum, spreading
+          and dispersion are reused, such that all the realisations belong to the same
+          sea state
+        * For the polar constructions, the realisation equals the one of a Wave2D of
+          which the wave1D has the same *seed*
+        * For the cartesian constructions, the phase of each conjugated amplitude
+          (with a negative *omega_sign*) is the negated phase of its point mirrored
+          partner, such that the symmetry A(-k) = A^*(k) is kept
+        """
+        key = WAVE2D_SPAWN_KEY
+        if self.wave1D.wave_construction in POLAR_CONSTRUCTIONS:
+            modulus = np.sqrt(
+                2 * self.E_wave_density_polar * self.k_polar_bin_area_over_kk
+            )
+            phase = ms.initialize_phase(modulus, rng=ms.phase_generator(seed, key))
+        else:
+            modulus = abs(self.E_wave_complex_amplitudes)
+            n_kx, n_ky = modulus.shape
+            if self.half_spectrum:
+                # the half plane holds the first columns of the full spectrum, of which
+                # the phases are drawn on the full mesh
+                n_ky = self.ny_fft
+            phase = ms.initialize_phase(
+                np.empty((n_kx, n_ky)), rng=ms.phase_generator(seed, key)
+            )
+            i_mirror = -np.arange(n_kx) % n_kx
+            j_mirror = -np.arange(n_ky) % n_ky
+            phase_mirror = phase[i_mirror][:, j_mirror]
+            n_ky = modulus.shape[1]
+            phase = np.where(
+                self.omega_sign < 0, -phase_mirror[:, :n_ky], phase[:, :n_ky]
+            )
+
+        complex_amplitudes = modulus * np.exp(1j * phase)
+        return complex_amplitudes.astype(self.wave1D.complex_dtype, copy=False)
+
     def calculate_omega_dispersion(self):
         # Calculate the omega frequency belonging to the wave vectors according to the
         # deep water dispersion relation.
         self.omega_dispersion = np.sqrt(g0 * abs(self.kk)) * self.omega_sign
         self.delta_omega = np.diff(self.omega_dispersion)
 
-    def calculate_wave_surface(self):
-        if not self.wave1D.wave_construction == "FFT":
-            # For the DFT directly calculate the wave field from the spectral components
-            self.amplitude = self.dft_complex_amplitudes(
-                self.E_wave_complex_amplitudes, self.omega_dispersion, self.wave1D.time
+    def calculate_wave_surface(self, n_workers=None):
+        """Calculate the wave surface at the current time of the wave1D
+
+        Parameters
+        ----------
+        n_workers: int, optional
+            Number of processes used for the DFT constructions. Default = None, i.e.
+            the *n_workers* attribute is used. See *dft_complex_amplitudes_sharded*
+        """
+        if n_workers is None:
+            n_workers = self.n_workers
+
+        if self.incremental_stepping:
+            # rotate the complex amplitudes to the current time. The rotated amplitudes
+            # already contain exp(-j omega t), so pass time=None
+            complex_amplitudes = self.phase_rotator.rotate(
+                self.E_wave_complex_amplitudes,
+                self.omega_dispersion,
+                self.wave1D.time,
+                self.wave1D.delta_t,
+                version=self.amplitudes_version,
             )
+            time = None
+        else:
+            complex_amplitudes = self.E_wave_complex_amplitudes
+            time = self.wave1D.time
+
+        if self.wave1D.wave_construction == "NUFFTpolar":
+            self.amplitude = self.nufft_amplitude(
+                complex_amplitudes, self.omega_dispersion, time
+            )
+        elif not self.wave1D.wave_construction == "FFT":
+            # For the DFT directly calculate the wave field from the spectral components
+            if n_workers is not None:
+                self.amplitude = self.dft_complex_amplitudes_sharded(
+                    complex_amplitudes, self.omega_dispersion, time, n_workers
+                )
+            else:
+                self.amplitude = self.dft_complex_amplitudes(
+                    complex_amplitudes, self.omega_dispersion, time
+                )
             if self.wave1D.wave_construction == "DFTcartesian":
                 # Scale the amplitude with a factor 2 because we used the two-side
                 # k-space
@@ -807,11 +1464,84 @@ class Wave2D:
         else:
             # get the wave field using an FFT
             self.amplitude = self.fft_amplitude(
-                self.E_wave_complex_amplitudes, self.omega_dispersion, self.wave1D.time
+                complex_amplitudes, self.omega_dispersion, time
             )
 
+        self.amplitude = self.amplitude.astype(self.wave1D.real_dtype, copy=False)
+
         logger.debug(f"H_s of 2D surface {4 * np.std(self.amplitude)}  ")
 
+    def surface_at(self, times):
+        """Calculate the wave surface for a series of times in one call
+
+        Parameters
+        ----------
+        times: array_like
+            Times in s at which the wave surface is evaluated
+
+        Returns
+        -------
+        ndarray
+            Real array of shape (nt, nx, ny) with the wave surface for each time
+
+        Notes
+        -----
+        * The current time and amplitude of the wave are not changed
+        * For the FFT the spectral components for all the times are stacked and
+          transformed with a single batched ifft2 over the last two axes. The DFT and
+          NUFFT constructions are evaluated per time.
+        """
+        times = np.atleast_1d(np.asarray(times, dtype=float))
+
+        if self.wave1D.wave_construction == "FFT":
+            fft_backend = get_fft_backend(self.fft_backend)
+            phasors = np.exp(-1j * np.multiply.outer(times, self.omega_dispersion))
+            phasors *= self.E_wave_complex_amplitudes
+            if self.half_spectrum:
+                N = int(self.nx_fft * self.ny_fft / 2)
+                out = _fft_out(
+                    self.fft_buffers,
+                    "surface_at",
+                    fft_backend,
+                    (times.size, self.nx_fft, self.ny_fft),
+                    np.finfo(phasors.dtype).dtype,
+                )
+                surfaces = fft_backend.irfft2(
+                    phasors, s=(self.nx_fft, self.ny_fft), axes=(-2, -1), out=out
+                )
+            else:
+                N = int(self.E_wave_complex_amplitudes.size / 2)
+                out = _fft_out(
+                    self.fft_buffers,
+                    "surface_at",
+                    fft_backend,
+                    phasors.shape,
+                    phasors.dtype,
+                )
+                surfaces = np.real(fft_backend.ifft2(phasors, axes=(-2, -1), out=out))
+            surfaces = N * surfaces[:, : self.nx_points, : self.ny_points]
+        elif self.wave1D.wave_construction == "NUFFTpolar":
+            surfaces = np.empty((times.size,) + self.xy_mesh[0].shape)
+            for i_time, time in enumerate(times):
+                surfaces[i_time] = self.nufft_amplitude(
+                    self.E_wave_complex_amplitudes, self.omega_dispersion, time
+                )
+        elif self.wave1D.wave_construction == "DFTcartesian":
+            # the separable DFT of all the time steps with two stacked matrix products
+            phasors = np.exp(-1j * np.multiply.outer(times, self.omega_dispersion))
+            phasors *= self.E_wave_complex_amplitudes
+            surfaces = 0.5 * np.real(
+                self.exp_matrix_kx @ phasors @ self.exp_matrix_ky.T
+            )
+        else:
+            surfaces = np.empty((times.size,) + self.xy_mesh[0].shape)
+            for i_time, time in enumerate(times):
+                surfaces[i_time] = self.dft_complex_amplitudes(
+                    self.E_wave_complex_amplitudes, self.omega_dispersion, time
+                )
+
+        return surfaces.astype(self.wave1D.real_dtype, copy=False)
+
     def dft_complex_amplitudes(self, S_tilde, omega, time):
         """Calculate DFT of complex amplitudes at time 'time'
 
@@ -819,7 +1549,8 @@ class Wave2D:
         ----------
         S_tilde: Complex amplitude obtained from
         omega: angular frequency for each node
-        time: current time
+        time: current time. If None, S_tilde is assumed to be rotated to the current
+            time already
 
         Returns
         -------
@@ -830,27 +1561,237 @@ class Wave2D:
         -----
         * The trick with the exponential matrix exp (j*x*k) does not work in 2D because
           you run out of memory too fast.
-          Therefore, calculate the wave field with a loop over the wave vectors.
-        * This algorithm is really slow, so you should use FFT for 2D waves!
+          Therefore, the wave vectors are processed in blocks which fit in the
+          *dft_memory_budget*. Each block is evaluated with the matrix product
+          (Ex * A) @ Ey^T, with Ex=exp(j kx x) and Ey=exp(j ky y).
+        * This algorithm is still slow compared to the FFT, so you should use FFT for
+          2D waves, or the NUFFT for the polar wave vectors. The DFT is the exact
+          reference
+        * For the DFTcartesian the wave vectors lie on a tensor grid, so the
+          exponential factorises as exp(j kx x) exp(j ky y). The wave field then
+          follows from the two matrix products Ex @ (A exp(-j omega t)) @ Ey^T
 
         """
 
-        dft = np.full(self.xy_mesh[0].shape, 0 + 0 * 1j, dtype=complex)
-        KX = self.k_cartesian_mesh[0]
-        KY = self.k_cartesian_mesh[1]
-        for j in range(self.k_cartesian_mesh[0].shape[1]):
-            for i in range(self.k_cartesian_mesh[0].shape[0]):
-                s_theta = S_tilde[i, j]
-                dft += s_theta * np.exp(
-                    1j
-                    * (
-                        self.xy_mesh[0] * KX[i, j]
-                        + self.xy_mesh[1] * KY[i, j]
-                        - omega[i, j] * time
-                    )
-                )
+        if time is None:
+            time = 0
+
+        if self.exp_matrix_kx is not None:
+            # separable DFT on the cartesian mesh
+            M = S_tilde * np.exp(-1j * omega * time)
+            return np.real(self.exp_matrix_kx @ M @ self.exp_matrix_ky.T)
+
+        dft = _dft2d_in_blocks(
+            S_tilde * np.exp(-1j * omega * time),
+            self.k_cartesian_mesh[0],
+            self.k_cartesian_mesh[1],
+            self.xpoints,
+            self.ypoints,
+            memory_budget=self.dft_memory_budget,
+        )
         return np.real(dft)
 
+    def dft_complex_amplitudes_sharded(self, S_tilde, omega, time, n_workers):
+        """Calculate the DFT of the complex amplitudes with a pool of processes
+
+        Parameters
+        ----------
+        S_tilde: ndarray, complex
+            Complex amplitudes of the wave components
+        omega: ndarray
+            Angular frequencies belonging to the wave vectors
+        time: float or None
+            Current time. If None, S_tilde is assumed to be rotated to the current time
+            already
+        n_workers: int
+            Number of processes. For 1, the shards are calculated in the current
+            process
+
+        Returns
+        -------
+        ndarray:
+            2D array with Discrete fourier transform
+
+        Notes
+        -----
+        * The wave components are divided in *n_shards* contiguous shards. For the
+          separable DFT on the cartesian mesh, the shards are blocks of kx rows of the
+          matrix product exp(j kx x) @ A @ exp(j ky y)^T
+        * The process pool and a shared output buffer with one slot per worker are
+          created at the first call and kept, such that the processes are only started
+          once. The grid and the exponential matrices are sent once to each process.
+          Call *close* or use the wave as a context manager to release them
+        * The shards are calculated in rounds of one shard per slot. After each round
+          the partial fields are added to a single accumulator in the fixed order of
+          the shards. Since neither the shards nor the order of the reduction depends
+          on the number of workers, the result is bit-for-bit identical for any number
+          of workers
+        * The shards draw no random numbers. The random phases are part of the complex
+          amplitudes *S_tilde*, which are drawn in the current process with the
+          generator *rng* before the shards are distributed
+        """
+        if time is not None:
+            S_tilde = S_tilde * np.exp(-1j * omega * time)
+
+        if self.exp_matrix_kx is not None:
+            complex_amplitudes = S_tilde
+            n_components = S_tilde.shape[0]
+        else:
+            complex_amplitudes = np.ravel(S_tilde)
+            n_components = complex_amplitudes.size
+
+        n_shards = max(1, min(self.n_shards, n_components))
+        bounds = np.linspace(0, n_components, n_shards + 1).astype(int)
+        shards = list(zip(bounds[:-1], bounds[1:]))
+
+        amplitude = np.zeros(self.xy_mesh[0].shape)
+        if n_workers == 1:
+            grid = self._dft_shard_grid()
+            for i_start, i_end in shards:
+                amplitude += _dft2d_shard_field(
+                    complex_amplitudes[i_start:i_end], i_start, i_end, **grid
+                )
+            return amplitude
+
+        fields = self._dft_shard_fields(n_workers)
+        n_slots = fields.shape[0]
+        for i_round in range(0, n_shards, n_slots):
+            futures = [
+                self._dft_pool.submit(
+                    _dft2d_shard,
+                    i_slot,
+                    complex_amplitudes[i_start:i_end],
+                    i_start,
+                    i_end,
+                )
+                for i_slot, (i_start, i_end) in enumerate(
+                    shards[i_round : i_round + n_slots]
+                )
+            ]
+            for future in futures:
+                future.result()
+            # reduce the partial fields in the fixed order of the shards
+            for field in fields[: len(futures)]:
+                amplitude += field
+
+        return amplitude
+
+    def _dft_shard_grid(self):
+        """Get the arguments of *_dft2d_shard_field* which are equal for all shards"""
+        return dict(
+            kx_nodes=np.ravel(self.k_cartesian_mesh[0]),
+            ky_nodes=np.ravel(self.k_cartesian_mesh[1]),
+            xpoints=self.xpoints,
+            ypoints=self.ypoints,
+            exp_matrix_kx=self.exp_matrix_kx,
+            exp_matrix_ky=self.exp_matrix_ky,
+            memory_budget=self.dft_memory_budget,
+        )
+
+    def _dft_shard_fields(self, n_workers):
+        """
+        Get the shared output buffer of the sharded DFT, creating the pool if required
+
+        Notes
+        -----
+        The pool is created again when the number of workers, the grid or the wave
+        vectors have changed since it was created
+        """
+        key = (
+            n_workers,
+            self.dft_memory_budget,
+            self.xpoints,
+            self.ypoints,
+            self.k_cartesian_mesh,
+            self.exp_matrix_kx,
+        )
+        if self._dft_pool is not None and all(
+            item is pool_item or (np.isscalar(item) and item == pool_item)
+            for item, pool_item in zip(key, self._dft_pool_key)
+        ):
+            return self._dft_fields
+
+        self.close()
+        shape = (n_workers,) + self.xy_mesh[0].shape
+        shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * 8)
+        self._dft_pool = ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_initialize_dft_worker,
+            initargs=(shm.name, shape, self._dft_shard_grid()),
+        )
+        self._dft_fields = np.ndarray(shape, dtype=float, buffer=shm.buf)
+        self._dft_finalizer = weakref.finalize(
+            self, _release_dft_pool, self._dft_pool, shm
+        )
+        self._dft_pool_key = key
+        logger.debug(f"Started a pool of {n_workers} workers for the sharded DFT")
+        return self._dft_fields
+
+    def close(self):
+        """Shut down the process pool and release the shared buffer of the DFT"""
+        if self._dft_finalizer is not None:
+            self._dft_fields = None
+            self._dft_finalizer()
+        self._dft_pool = None
+        self._dft_pool_key = None
+        self._dft_finalizer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getstate__(self):
+        # the process pool and shared buffer are not copied or sent to other processes
+        state = self.__dict__.copy()
+        state.update(
+            _dft_pool=None, _dft_pool_key=None, _dft_fields=None, _dft_finalizer=None
+        )
+        # the FFT output arrays are aligned for FFTW, which is lost on unpickling
+        state["fft_buffers"] = dict()
+        return state
+
+    def nufft_amplitude(self, S_tilde, omega, time):
+        """Calculate the wave field of the polar complex amplitudes using the NUFFT
+
+        Parameters
+        ----------
+        S_tilde: ndarray, complex
+            Complex amplitudes on the polar wave vector mesh
+        omega: ndarray
+            Angular frequencies belonging to the wave vectors
+        time: float or None
+            Current time. If None, S_tilde is assumed to be rotated to the current time
+            already
+
+        Returns
+        -------
+        ndarray
+            nx x ny real array with the wave amplitude at time t
+
+        Notes
+        -----
+        The result equals the *dft_complex_amplitudes* to the relative accuracy
+        *nufft_tolerance* of the wave1D, but is obtained in O(N log N)
+        """
+        if time is not None:
+            S_tilde = S_tilde * np.exp(1j * (-time * omega))
+        ampl = nufft2d(
+            S_tilde,
+            self.k_cartesian_mesh[0],
+            self.k_cartesian_mesh[1],
+            x_start=self.xpoints[0],
+            y_start=self.ypoints[0],
+            delta_x=self.delta_x,
+            delta_y=self.delta_y,
+            nx_points=self.nx_points,
+            ny_points=self.ny_points,
+            tolerance=self.wave1D.nufft_tolerance,
+            fft_backend=self.fft_backend,
+        )
+        return np.real(ampl)
+
     def fft_amplitude(self, S_tilde, omega, time):
         """
         Calculate Fourier transform of S using the FFT
@@ -860,20 +1801,54 @@ class Wave2D:
             Complex array of the fouriern components
         omega: ndarray
             Angular freqyencies belong to the wave vectors
-        time: float
-            Current time
+        time: float or None
+            Current time. If None, S_tilde is assumed to be rotated to the current time
+            already
 
         Returns
         -------
         ndarray
             real array with the DFT of the complex amplitudes
 
+        Notes
+        -----
+        * The inverse FFT is carried out with the *fft_backend*. The input array is
+          only overwritten by the backend if it is a temporary, i.e. when *time* is
+          given
+        * With *fft_padding*, the FFT is carried out on nx_fft x ny_fft points and the
+          wave field is cropped to the nx_points x ny_points of the domain
+        * For a backend writing directly into its output array, the FFT is stored in
+          the preallocated array *fft_buffers["surface"]*, such that only the returned
+          wave field is allocated per call
+
         """
+        fft_backend = get_fft_backend(self.fft_backend)
+        # do not allow the backend to overwrite the (cached) amplitudes passed
+        overwrite_x = None if time is not None else False
+        if time is not None:
+            S_tilde = S_tilde * np.exp(1j * (-time * omega))
+        if self.half_spectrum:
+            # the half plane ky >= 0. irfft2 imposes the symmetry S(k)=S^*(-k) itself
+            N = int(self.nx_fft * self.ny_fft / 2)
+            out = _fft_out(
+                self.fft_buffers,
+                "surface",
+                fft_backend,
+                (self.nx_fft, self.ny_fft),
+                np.finfo(S_tilde.dtype).dtype,
+            )
+            ampl = fft_backend.irfft2(
+                S_tilde, s=(self.nx_fft, self.ny_fft), out=out, overwrite_x=overwrite_x
+            )
+            return N * ampl[: self.nx_points, : self.ny_points]
         N = int(S_tilde.size / 2)
-        ampl = N * np.fft.ifft2(S_tilde * np.exp(1j * (-time * omega)))
+        out = _fft_out(
+            self.fft_buffers, "surface", fft_backend, S_tilde.shape, S_tilde.dtype
+        )
+        ampl = fft_backend.ifft2(S_tilde, out=out, overwrite_x=overwrite_x)
         # ampl should be real already because S_tilde should be symmetrical around
         # k=0 S(k)=S^*(-k) to be sure, take the real value only
-        return np.real(ampl)
+        return N * np.real(ampl[: self.nx_points, : self.ny_points])
 
     def export_complex_amplitudes(self, filename, exportAsHD5=True):
         """Export the calculated complex amplitudes to HDF 5 file
@@ -1474,10 +2449,12 @@ class Wave2D:
             x_label = "k_x [rad/m]"
             y_label = "k_y [rad/m]"
             if self.wave1D.mirror or shift_origin:
-                data_x_2d = fftshift(self.k_cartesian_mesh[0])
-                data_y_2d = fftshift(self.k_cartesian_mesh[1])
-                psd_2d = fftshift(abs(self.E_wave_density_polar))
-                ang_2d = fftshift(np.angle(self.E_wave_complex_amplitudes))
+                # for the half plane, only the kx axis contains negative wave vectors
+                axes = 0 if self.half_spectrum else None
+                data_x_2d = fftshift(self.k_cartesian_mesh[0], axes=axes)
+                data_y_2d = fftshift(self.k_cartesian_mesh[1], axes=axes)
+                psd_2d = fftshift(abs(self.E_wave_density_polar), axes=axes)
+                ang_2d = fftshift(np.angle(self.E_wave_complex_amplitudes), axes=axes)
             else:
                 data_x_2d = self.k_cartesian_mesh[0]
                 data_y_2d = self.k_cartesian_mesh[1]
@@ -1642,7 +2619,7 @@ class Wave1D:
         wheras the "dnv" version has a width based on the *sigma* input argument.
     gravity0: float, optional
         Gravitation constant. Default = g0 = 9.81
-    wave_construction: {"FFT", "DFTpolar", "DFTcartesian"}
+    wave_construction: {"FFT", "DFTpolar", "DFTcartesian", "NUFFTpolar"}
         Method how the wave field is constructed from the spectrum. Default = "FFT". The
         options are
 
@@ -1661,9 +2638,13 @@ class Wave1D:
         * *DFTcartesian*: This choice is for validation purpose only. It assumes the
           same symmetric spectrum as used for the FFT option but then still the slow
           DFT  is used to calculate the wave field.
+        * *NUFFTpolar*: The same wave vectors as the *DFTpolar*, including the wave
+          selection, but the DFT sum is evaluated with a non-uniform FFT to the
+          accuracy given by *nufft_tolerance*. Recommended for non-uniform wave nodes.
     wave_selection: {"All", "EqualEnergyBins", "Subrange"}
-        For the DFTPolar wave construction mode we can make a selection of wave
-        components in order to speed up the wave calculation. Three choices are possible
+        For the DFTPolar and NUFFTpolar wave construction modes we can make a selection
+        of wave components in order to speed up the wave calculation. Three choices are
+        possible
 
         * All: No selection is made so all the wave vectors as defined in the kx_nodes
           domain are used
@@ -1673,9 +2654,52 @@ class Wave1D:
     use_subrange_energy_limits : bool
         If true the wave selection in the EqualEnergyBins mode is also limited by the
         Subrange settings. Default = True
+    equal_energy_solver: {"table", "fsolve"}
+        Method to find the wave vector nodes in the EqualEnergyBins mode. Default =
+        "table". The options are
+
+        * table: all the nodes are obtained at once by inverting a table of the
+          cumulative energy of the spectrum. See *equal_energy_k_nodes* of the
+          *wave_spectra* module
+        * fsolve: each next node is solved with *scipy.optimize.fsolve* on the
+          integral of the spectrum. Slow, only kept to reproduce previous results
     sample_every : int
         Make a wave selection by taking every 'sample_every' point in the wave vector
         domain. Only applicable when the wave_selection modes is *Subrange*
+    incremental_stepping: bool, optional
+        Advance the complex amplitudes in time by incremental phase rotation with a
+        pre-calculated exp(-j omega delta_t) when the time proceeds with one time step.
+        Used by *propagate_wave* and *animate_wave*. Default = True
+    n_steps_reanchor: int, optional
+        Number of incremental time steps after which the phase rotation is re-anchored
+        to the exact solution in order to limit the drift. Default = 100
+    dft_memory_budget: float, optional
+        Maximum memory in MB used to store the n_k x n_x matrix exp(j k x) for the DFT
+        constructions. If the full matrix is larger, it is not stored but evaluated in
+        tiles fitting in this budget for each time step. Default = 256 MB
+    half_spectrum: bool, optional
+        Only used for the FFT wave construction. If True, the complex amplitudes are
+        only stored for the non-negative wave vectors and the wave field is obtained
+        with a real inverse FFT (irfft/irfft2). This halves the memory and the
+        transform time. Default = False
+    nufft_tolerance: float, optional
+        Relative accuracy of the non-uniform FFT used for the *NUFFTpolar* wave
+        construction. Default = 1e-10
+    fft_backend: {None, "numpy", "scipy", "pyfftw"} or FFTBackend, optional
+        Backend used for the inverse FFTs of this wave. Default = None, i.e. the
+        default backend set with *set_default_fft_backend* of the *fft_backends*
+        module is used, which is numpy unless changed
+    precision: {"double", "single"}, optional
+        Floating point precision of the wave arrays. For "single", the complex
+        amplitudes, angular frequencies and wave surface are stored as complex64 and
+        float32, which halves the memory. The spectrum itself is always calculated in
+        double precision. Default = "double"
+    fft_padding: bool, optional
+        Only used for the FFT wave construction. If True, the FFT is carried out on
+        the next fast FFT length *nx_fft* >= *nx_points* with the same spatial
+        resolution *delta_x*, and the wave field is cropped back to the *nx_points*
+        of the domain. This avoids slow transforms for prime or awkward *nx_points*.
+        Note that the wave vector nodes then follow from *nx_fft*. Default = False
 
     Attributes
     ----------
@@ -1690,6 +2714,10 @@ class Wave1D:
        Wave height along x-direction at time t of size :math:`n_x`
     phase : ndarray
        Random phase array of size :math:`n_k`
+    rng : Generator
+       Random generator of this wave used to draw the phases. It is created from a
+       *SeedSequence* of the *seed* attribute each time the phases are updated, so the
+       global random state of numpy is not used
     omega_dispersion : ndarray
        Angular frequency per wave node of size :math:`n_k` following from the deep water
        dispersion relation
@@ -1757,6 +2785,7 @@ class Wave1D:
         n_kx_nodes=512,
         n_bins_equal_energy=64,
         use_subrange_energy_limits=False,
+        equal_energy_solver="table",
         sample_every=1,
         Hs=3.0,
         Tp=10.0,
@@ -1769,6 +2798,14 @@ class Wave1D:
         spectrum_type="jonswap",
         spectral_version="sim",
         gravity0=g0,
+        incremental_stepping=True,
+        n_steps_reanchor=100,
+        dft_memory_budget=256,
+        half_spectrum=False,
+        nufft_tolerance=1e-10,
+        fft_backend=None,
+        precision="double",
+        fft_padding=False,
     ):
         self.spectrum_type = spectrum_type
         self.spectral_version = spectral_version
@@ -1844,6 +2881,25 @@ class Wave1D:
         # set the wave construction
         self.wave_construction = None
         self.mirror = False
+        self.half_spectrum = half_spectrum
+        self.nufft_tolerance = nufft_tolerance
+        self.fft_backend = fft_backend
+        if isinstance(fft_backend, str):
+            # create the backend only once, such that its FFT plans are reused
+            self.fft_backend = FFTBackend(fft_backend)
+        # preallocated output arrays of the inverse FFTs
+        self.fft_buffers = dict()
+        if precision not in PRECISION_DTYPES:
+            raise AssertionError(
+                "precision must be one of {}. Found {}".format(
+                    tuple(PRECISION_DTYPES.keys()), precision
+                )
+            )
+        self.precision = precision
+        self.real_dtype, self.complex_dtype = PRECISION_DTYPES[precision]
+        self.fft_padding = fft_padding
+        # number of points of the FFT, which is larger than nx_points for fft_padding
+        self.nx_fft = nx_points
         self.set_wave_construction(wave_construction)
 
         if self.wave_construction == "FFT" and self.wave_selection != "All":
@@ -1854,8 +2910,10 @@ class Wave1D:
 
         self.lock_nodes_to_wave_one = lock_nodes_to_wave_one
 
-        # use seed to update the random phase if required
+        # use seed to update the random phase if required. The phases are drawn with
+        # the random generator rng of this object, created from the seed
         self.seed = 1
+        self.rng = None
         self.update_phase = True
 
         self.pick_single_wave = False
@@ -1863,10 +2921,21 @@ class Wave1D:
 
         self.n_bins_equal_energy = n_bins_equal_energy
         self.use_subrange_energy_limits = use_subrange_energy_limits
+        if equal_energy_solver not in ("table", "fsolve"):
+            raise AssertionError(
+                "equal_energy_solver must be 'table' or 'fsolve'. Found {}".format(
+                    equal_energy_solver
+                )
+            )
+        self.equal_energy_solver = equal_energy_solver
         self.sample_every = sample_every
 
         self.xpoints = None
         self.phase = None
+        # number of wave nodes on which the phases were drawn and the indices of the
+        # selected wave nodes in them
+        self.n_phase_nodes = None
+        self.i_phase_nodes = None
         self.kx = None
 
         self.amplitude = None
@@ -1893,10 +2962,18 @@ class Wave1D:
         self.varianceW = None
         self.spectrumK = None
 
+        # increased on each assignment of the complex amplitudes or omega_dispersion
+        self.amplitudes_version = 0
         self.omega_dispersion = None
         self.delta_omega = None
 
         self.complex_amplitudes = None
+        self.exp_matrix_kx = None
+        self.dft_memory_budget = dft_memory_budget
+
+        # stepping of the complex amplitudes in time by incremental phase rotation
+        self.incremental_stepping = incremental_stepping
+        self.phase_rotator = PhaseRotationStepper(n_steps_reanchor=n_steps_reanchor)
 
         # the minimum and maximum wave
         self.global_wave_extremes = [0, 0]
@@ -1907,6 +2984,38 @@ class Wave1D:
         self.update_x_k_t_sample_space()
         self.calculate_spectra_modulus()
 
+    @property
+    def complex_amplitudes(self):
+        """Complex amplitudes of the wave components at t=0
+
+        Notes
+        -----
+        Each assignment increases *amplitudes_version*, which re-anchors the incremental
+        phase rotation. After modifying the amplitudes in place, assign them again
+        """
+        return self._complex_amplitudes
+
+    @complex_amplitudes.setter
+    def complex_amplitudes(self, complex_amplitudes):
+        self._complex_amplitudes = complex_amplitudes
+        self.amplitudes_version += 1
+
+    @property
+    def omega_dispersion(self):
+        """Angular frequencies of the wave components. See *complex_amplitudes*"""
+        return self._omega_dispersion
+
+    @omega_dispersion.setter
+    def omega_dispersion(self, omega_dispersion):
+        self._omega_dispersion = omega_dispersion
+        self.amplitudes_version += 1
+
+    def __getstate__(self):
+        # the FFT output arrays are aligned for FFTW, which is lost on unpickling
+        state = self.__dict__.copy()
+        state["fft_buffers"] = dict()
+        return state
+
     def reset_time(self, t_length=None, t_start=0, nt_samples=10000000, delta_t=1):
         """Reset all time properties and allow to recalculate"""
         self.t_start = t_start
@@ -1940,6 +3049,8 @@ class Wave1D:
 
         logger.info("----------- Numerical resolutions --------")
         logger.info(frm.format("Number x - nodes", self.xpoints.size))
+        if self.nx_fft != self.nx_points:
+            logger.info(frm.format("Number x - nodes FFT (padded)", self.nx_fft))
         logger.info(frm.format("Number kx - nodes", self.kx_nodes.size))
         logger.info(frm.format("Delta x [m]", self.delta_x))
         dkx = np.diff(self.kx_nodes)
@@ -1954,6 +3065,7 @@ class Wave1D:
         logger.info("----------- Numerical methodds --------")
         logger.info(frm.format("Selection method", self.wave_selection))
         logger.info(frm.format("Construction method", self.wave_construction))
+        logger.info(frm.format("Precision", self.precision))
 
     def next_time(self):
         """Increase the time"""
@@ -2286,7 +3398,7 @@ class Wave1D:
 
         if add_hs_estimate:
             var_k = np.sum(self.spectrumK * self.delta_kx)
-            if self.wave_construction in ("FFT", "DFTcartesian"):
+            if self.mirror:
                 var_k /= 2.0
             hs_estimate_k = 4 * np.sqrt(var_k)
             axis[0].text(
@@ -2297,7 +3409,7 @@ class Wave1D:
                 va="top",
             )
             var_w = np.sum(self.spectrumW * self.delta_omega)
-            if self.wave_construction in ("FFT", "DFTcartesian"):
+            if self.mirror:
                 var_w /= 2.0
             hs_estimate_w = 4 * np.sqrt(var_w)
             axis[1].text(
@@ -2427,27 +3539,31 @@ class Wave1D:
 
         Parameters
         ----------
-        mode: {"FFT", "DFTpolar", "DFTcartesian"}
+        mode: {"FFT", "DFTpolar", "DFTcartesian", "NUFFTpolar"}
             Construction type of the wave field. In case FFT or DFTcartesian is chosen,
-            the spectrum most be symmetric and therefore mirror must be True
+            the spectrum most be symmetric and therefore mirror must be True, unless
+            the *half_spectrum* attribute is set for the FFT
 
         """
-        if self.wave_selection != "All" and mode != "DFTpolar":
+        if self.wave_selection != "All" and mode not in POLAR_CONSTRUCTIONS:
             logger.warning(
                 "You have set a wave selection but want to use an FFT. Selecting waves "
-                "is only possible for DFTpolar. Setting that now"
+                "is only possible for DFTpolar or NUFFTpolar. Setting DFTpolar now"
             )
             mode = "DFTpolar"
 
         self.wave_construction = mode
-        if mode in ("FFT", "DFTcartesian"):
+        if mode == "FFT" and self.half_spectrum:
+            # only the non-negative half of the spectrum is stored, no mirroring
+            self.mirror = False
+        elif mode in ("FFT", "DFTcartesian"):
             self.mirror = True
-        elif mode == "DFTpolar":
+        elif mode in POLAR_CONSTRUCTIONS:
             self.mirror = False
         else:
             raise AssertionError(
-                "Wave construction must be FFT, DFTcartesian, or DFTpolar. Found {}"
-                "".format(mode)
+                "Wave construction must be FFT, DFTcartesian, DFTpolar, or NUFFTpolar. "
+                "Found {}".format(mode)
             )
 
     def update_x_k_t_sample_space(self):
@@ -2461,7 +3577,7 @@ class Wave1D:
 
         self.xpoints = np.linspace(self.xmin, self.xmax, self.nx_points, endpoint=True)
 
-        self.amplitude = np.zeros(self.xpoints.shape)
+        self.amplitude = np.zeros(self.xpoints.shape, dtype=self.real_dtype)
 
         self.delta_x = self.xpoints[1] - self.xpoints[0]
 
@@ -2472,7 +3588,7 @@ class Wave1D:
         )
         self.kx_nyquist = np.pi / self.delta_x
 
-        if self.wave_construction == "DFTpolar":
+        if self.wave_construction in POLAR_CONSTRUCTIONS:
             # If a DDT is used for the wave field calculation, you can use any amount
             # of wave vectors
             if self.kx_max > self.kx_nyquist:
@@ -2489,7 +3605,16 @@ class Wave1D:
             # for the FFT the number wave vectors should be equal to the number of
             # x-points the DFT based on cartesian values in this case take the same
             # mesh as FFT but then uses the DFT algorith for comparison
-            self.kx_nodes = 2 * np.pi * np.fft.fftfreq(self.nx_points, self.delta_x)
+            self.nx_fft = self.nx_points
+            if self.wave_construction == "FFT" and self.fft_padding:
+                # extend the domain with the same delta_x to a fast FFT length. The
+                # wave field is cropped to the nx_points afterwards
+                self.nx_fft = next_fast_len(self.nx_points, real=self.half_spectrum)
+            if self.wave_construction == "FFT" and self.half_spectrum:
+                # only the non-negative wave vectors for the real inverse FFT
+                self.kx_nodes = 2 * np.pi * np.fft.rfftfreq(self.nx_fft, self.delta_x)
+            else:
+                self.kx_nodes = 2 * np.pi * np.fft.fftfreq(self.nx_fft, self.delta_x)
             self.delta_kx = self.kx_nodes[1] - self.kx_nodes[0]
 
             logger.debug(
@@ -2503,7 +3628,10 @@ class Wave1D:
             or self.kx_nodes.shape != self.phase.shape
             or self.update_phase
         ):
-            self.phase = ms.initialize_phase(self.kx_nodes, self.seed)
+            self.rng = ms.phase_generator(self.seed)
+            self.phase = ms.initialize_phase(self.kx_nodes, rng=self.rng)
+            self.n_phase_nodes = self.kx_nodes.size
+            self.i_phase_nodes = np.arange(self.kx_nodes.size)
             self.update_phase = False
 
         self.t_end = self.t_start + self.t_length
@@ -2564,7 +3692,10 @@ class Wave1D:
 
         # Select a sub range of the wave vectors. In case that fft is used, this is
         # not possible.
-        if self.wave_construction == "DFTpolar" and self.wave_selection == "Subrange":
+        if (
+            self.wave_construction in POLAR_CONSTRUCTIONS
+            and self.wave_selection == "Subrange"
+        ):
             # extra wave vectors based on the range k_low,k_high
 
             # Create a mask array to select the wave vectors within the subrange k_low
@@ -2575,6 +3706,7 @@ class Wave1D:
             self.kx_nodes = np.extract([mask], [self.kx_nodes])
             self.spectrumK = np.extract([mask], [self.spectrumK])
             self.phase = np.extract([mask], [self.phase])
+            self.i_phase_nodes = np.extract([mask], [self.i_phase_nodes])
 
             # Subsample the wave vectors and frequencies bin in case sample_every is
             # larger than one
@@ -2582,94 +3714,122 @@ class Wave1D:
                 self.kx_nodes = self.kx_nodes[:: self.sample_every]
                 self.spectrumK = self.spectrumK[:: self.sample_every]
                 self.phase = self.phase[:: self.sample_every]
+                self.i_phase_nodes = self.i_phase_nodes[:: self.sample_every]
 
         elif (
-            self.wave_construction == "DFTpolar"
+            self.wave_construction in POLAR_CONSTRUCTIONS
             and self.wave_selection == "EqualEnergyBins"
         ):
             # If EqualEnergy bins is selected, make a selection of frequency bins such
             # that the energy per interval S*dk remains constant to Ebin (the mean
             # energy per bin based on the total energy and number of bins
             self.Ebin = self.varianceK / self.n_bins_equal_energy
-            kx_nodes = []
             kk = self.kx_min
             if self.use_subrange_energy_limits:
                 kk = self.k_low
-            kx_nodes.append(kk)
-            logger.debug("Start solving the euqal energy bins...")
-            n_trail_max = 10
-            while kk < self.kx_max:
-                logger.debug(f"Solving bin for kk = {kk}")
-                # Calculate the next wave vector such that S*dk (energy in this bin)
-                # equals Ebin by solving the integral int_k0^knew Sdk. kk+delta_kx is
-                # just a first guess
-                delta_kx = self.delta_kx
-                n_trail = n_trail_max
-                found_solution = False
-                while not found_solution and n_trail > 0:
-                    ans = sp.optimize.fsolve(
-                        _energy_deficit,
-                        kk + delta_kx,
-                        args=(
-                            kk,
-                            self.Ebin,
-                            self.Hs,
-                            self.Tp,
-                            self.gamma,
-                            self.spectral_version,
-                            self.spectrum_type,
-                            self.sigma,
-                        ),
-                    )
-                    if ans[0] > 0:
-                        found_solution = True
-                        kk = ans[0]
-                    else:
-                        delta_kx /= 2
-                        n_trail -= 1
-                        # we could not find a solution. Try again with a smaller offset
+            if self.equal_energy_solver == "table":
+                # all nodes at once from the inverse of the cumulative energy
+                kx_nodes = ms.equal_energy_k_nodes(
+                    kk,
+                    self.kx_max,
+                    self.Ebin,
+                    Hs=self.Hs,
+                    Tp=self.Tp,
+                    gamma=self.gamma,
+                    sigma=self.sigma,
+                    spectrum_type=self.spectrum_type,
+                    spectral_version=self.spectral_version,
+                )
+                if self.use_subrange_energy_limits:
+                    kx_nodes = kx_nodes[kx_nodes <= self.k_high]
+            else:
+                kx_nodes = [kk]
+                logger.debug("Start solving the euqal energy bins...")
+                n_trail_max = 10
+                while kk < self.kx_max:
+                    logger.debug(f"Solving bin for kk = {kk}")
+                    # Calculate the next wave vector such that S*dk (energy in this
+                    # bin) equals Ebin by solving the integral int_k0^knew Sdk.
+                    # kk+delta_kx is just a first guess
+                    delta_kx = self.delta_kx
+                    n_trail = n_trail_max
+                    found_solution = False
+                    while not found_solution and n_trail > 0:
+                        ans = sp.optimize.fsolve(
+                            _energy_deficit,
+                            kk + delta_kx,
+                            args=(
+                                kk,
+                                self.Ebin,
+                                self.Hs,
+                                self.Tp,
+                                self.gamma,
+                                self.spectral_version,
+                                self.spectrum_type,
+                                self.sigma,
+                            ),
+                        )
+                        if ans[0] > 0:
+                            found_solution = True
+                            kk = ans[0]
+                        else:
+                            delta_kx /= 2
+                            n_trail -= 1
+                            # we could not find a solution. Try again with a smaller
+                            # offset
+                            logger.debug(
+                                "Failed to find a solution for kk. Try again for "
+                                "smaller delta kx {} {}".format(delta_kx, n_trail)
+                            )
+                    if n_trail < 0:
+                        logger.warning(
+                            "Tried {} times without succes. Stop solving, "
+                            "hope for the best".format(n_trail)
+                        )
+                        break
+                    # check if kk is within subrange is requested and then add it to
+                    # the list
+                    if kk < self.kx_max and not (
+                        self.use_subrange_energy_limits
+                        and (kk < self.k_low or kk > self.k_high)
+                    ):
                         logger.debug(
-                            "Failed to find a solution for kk. Try again for smaller"
-                            " delta kx {} {}".format(delta_kx, n_trail)
+                            "Storing bin kk = {} with k_low = {} k_high ={}"
+                            "".format(kk, self.k_low, self.k_high)
                         )
-                if n_trail < 0:
-                    logger.warning(
-                        "Tried {} times without succes. Stop solving, "
-                        "hope for the best".format(n_trail)
-                    )
-                    break
-                # check if kk is within subrange is requested and then add it to the
-                # list
-                if kk < self.kx_max and not (
-                    self.use_subrange_energy_limits
-                    and (kk < self.k_low or kk > self.k_high)
-                ):
-                    logger.debug(
-                        "Storing bin kk = {} with k_low = {} k_high ={}"
-                        "".format(kk, self.k_low, self.k_high)
-                    )
-                    kx_nodes.append(kk)
+                        kx_nodes.append(kk)
             logger.debug("Done")
 
             # turn the create kx_node list into a nparray
             if self.lock_nodes_to_wave_one:
                 # If lock_nodes_to_wave_one is true, then the k values calculated above
                 # are all # locked to the wave vectors of the full wave domain by
-                # finding the nearest wave value
-                mask = np.full(self.kx_nodes.shape, False, dtype=np.bool)
-                for kk in kx_nodes:
-                    kinx = find_idx_nearest_val(self.kx_nodes, kk)
-                    mask[kinx] = True
+                # finding the nearest wave value. The wave vectors are sorted, so the
+                # nearest ones of all the nodes follow from a single binary search
+                kx_nodes = np.asarray(kx_nodes)
+                i_right = np.clip(
+                    np.searchsorted(self.kx_nodes, kx_nodes), 1, self.kx_nodes.size - 1
+                )
+                i_left = i_right - 1
+                left_is_nearest = (kx_nodes - self.kx_nodes[i_left]) < (
+                    self.kx_nodes[i_right] - kx_nodes
+                )
+                mask = np.full(self.kx_nodes.shape, False, dtype=bool)
+                mask[np.where(left_is_nearest, i_left, i_right)] = True
 
                 # select the  kx and phase at the nodes
                 self.kx_nodes = np.extract(mask, self.kx_nodes)
                 self.phase = np.extract(mask, self.phase)
+                self.i_phase_nodes = np.extract(mask, self.i_phase_nodes)
             else:
                 # in case the nodes do not have to be locked to the first wave,
                 # convert the created list of wave vectors into a numpy array, calculate
                 # a new phase and the corresponding modulus
                 self.kx_nodes = np.array(kx_nodes)
-                self.phase = ms.initialize_phase(self.kx_nodes, self.seed)
+                self.rng = ms.phase_generator(self.seed)
+                self.phase = ms.initialize_phase(self.kx_nodes, rng=self.rng)
+                self.n_phase_nodes = self.kx_nodes.size
+                self.i_phase_nodes = np.arange(self.kx_nodes.size)
 
             # Based on the locked or non-locked kx_nodes with fixed and non-fixed
             # phases, calculate the spectrumK
@@ -2749,9 +3909,26 @@ class Wave1D:
             spectral_modulus=self.spectrumK,
             phase=self.phase,
             mirror=self.mirror,
+        ).astype(self.complex_dtype, copy=False)
+
+        # the spectrum is calculated in double precision. Now store the arrays used to
+        # construct the wave field in the requested precision
+        self.omega_dispersion = self.omega_dispersion.astype(
+            self.real_dtype, copy=False
         )
 
-        if not self.wave_construction == "FFT":
+        exp_matrix_size = self.kx_nodes.size * self.xpoints.size * 16 / 1024**2
+        if self.wave_construction in ("FFT", "NUFFTpolar"):
+            self.exp_matrix_kx = None
+        elif exp_matrix_size > self.dft_memory_budget:
+            # the matrix does not fit in the memory budget. It will be evaluated in
+            # tiles for each time step
+            logger.info(
+                "exp(j k x) matrix of {:.1f} MB exceeds the memory budget of {} MB. "
+                "Evaluate in tiles".format(exp_matrix_size, self.dft_memory_budget)
+            )
+            self.exp_matrix_kx = None
+        else:
             # create the maxtrix exp (j * kx_nodes * x_nodes) where kx_nodes * x_nodes
             # is the matrix following from the vector procuct of the vectos k^T and x
             # only calculate this for DFT
@@ -2759,7 +3936,43 @@ class Wave1D:
                 1j
                 * self.kx_nodes.reshape(self.kx_nodes.size, 1)
                 * self.xpoints.reshape((1, self.xpoints.size))
-            )
+            ).astype(self.complex_dtype, copy=False)
+
+    def complex_amplitudes_of_seed(self, seed):
+        """Calculate the complex amplitudes of the realisation with a given seed
+
+        Parameters
+        ----------
+        seed: int
+            Seed of the random phases. See *phase_generator* of the *wave_spectra*
+            module
+
+        Returns
+        -------
+        ndarray
+            Complex amplitudes with the same size as the *complex_amplitudes*
+
+        Notes
+        -----
+        Only new random phases are drawn, the spectrum *spectrumK* is reused. The phases
+        are drawn on the same wave nodes as in *update_x_k_t_sample_space*, after which
+        the selection of the wave nodes is applied. The result therefore equals the
+        complex amplitudes of a Wave1D with the same settings and *seed*, also for a
+        *Subrange* selection of the wave nodes
+        """
+        rng = ms.phase_generator(seed)
+        if self.i_phase_nodes is None:
+            phase = ms.initialize_phase(self.kx_nodes, rng=rng)
+        else:
+            phase = ms.initialize_phase(np.empty(self.n_phase_nodes), rng=rng)
+            phase = phase[self.i_phase_nodes]
+        complex_amplitudes = ms.spectrum_to_complex_amplitudes(
+            self.kx_nodes,
+            spectral_modulus=self.spectrumK,
+            phase=phase,
+            mirror=self.mirror,
+        )
+        return complex_amplitudes.astype(self.complex_dtype, copy=False)
 
     def calculate_wave_surface(self):
         """
@@ -2782,36 +3995,162 @@ class Wave1D:
           compare the DFT and DFT in calculation time and outcome with the exact same
           outcome (as the input nodes can be the same). The scaling with 0.5 due to the
           double spectrum (as it is symmetric) is taken care of here.
+        * NUFFTpolar: the same wave vectors as the DFTpolar, but the sum is evaluated
+          with a non-uniform FFT to the accuracy *nufft_tolerance*.
+
+        In case *incremental_stepping* is True, the complex amplitudes are advanced to
+        the current time by a phase rotation with exp(-j omega delta_t) if the time has
+        proceeded with one time step since the previous call.
         """
 
+        if self.incremental_stepping:
+            # rotate the complex amplitudes to the current time. The rotated amplitudes
+            # already contain exp(-j omega t), so pass time=None
+            complex_amplitudes = self.phase_rotator.rotate(
+                self.complex_amplitudes,
+                self.omega_dispersion,
+                self.time,
+                self.delta_t,
+                version=self.amplitudes_version,
+            )
+            time = None
+        else:
+            complex_amplitudes = self.complex_amplitudes
+            time = self.time
+
         if self.wave_construction in ("DFTpolar", "DFTcartesian"):
             self.amplitude = self.dft_complex_amplitudes(
-                self.complex_amplitudes,
+                complex_amplitudes,
                 self.exp_matrix_kx,
                 self.omega_dispersion,
-                self.time,
+                time,
+                kx_nodes=self.kx_nodes,
+                xpoints=self.xpoints,
+                memory_budget=self.dft_memory_budget,
             )
             if self.wave_construction == "DFTcartesian":
                 # The DFTcartesian uses a symmetric spectrum, just as you do with the
                 # FFT. Therefore you have to scale the energy with a half
                 self.amplitude *= 0.5
+        elif self.wave_construction == "NUFFTpolar":
+            self.amplitude = self.nufft_amplitude(
+                complex_amplitudes, self.omega_dispersion, time
+            )
         elif self.wave_construction == "FFT":
             # the fft is used
+            fft_backend = get_fft_backend(self.fft_backend)
+            if time is None:
+                dtype = complex_amplitudes.dtype
+            else:
+                # the data type of the amplitudes rotated to the time
+                dtype = np.result_type(
+                    complex_amplitudes, self.omega_dispersion, np.complex64
+                )
+            if self.half_spectrum:
+                shape, dtype = (self.nx_fft,), np.finfo(dtype).dtype
+            else:
+                shape = complex_amplitudes.shape
             self.amplitude = self.fft_amplitude(
-                self.complex_amplitudes, self.omega_dispersion, self.time
-            )
+                complex_amplitudes,
+                self.omega_dispersion,
+                time,
+                nx_points=self.nx_fft if self.half_spectrum else None,
+                fft_backend=fft_backend,
+                out=_fft_out(self.fft_buffers, "surface", fft_backend, shape, dtype),
+            )[: self.nx_points]
         else:
             raise (
                 AssertionError(
-                    "wave_construction should be either FFT, DFTpolar, or DFTcartesian."
-                    " Found {}".format(self.wave_construction)
+                    "wave_construction should be either FFT, DFTpolar, DFTcartesian, "
+                    "or NUFFTpolar. Found {}".format(self.wave_construction)
                 )
             )
 
+        self.amplitude = self.amplitude.astype(self.real_dtype, copy=False)
+
         logger.debug(f"H_s of 1D surface {4 * np.std(self.amplitude)} ")
 
+    def surface_at(self, times):
+        """
+        Calculate the wave surface for a series of times in one call
+
+        Parameters
+        ----------
+        times: array_like
+            Times in s at which the wave surface is evaluated
+
+        Returns
+        -------
+        ndarray
+            Real array of shape (nt, nx) with the wave surface for each time
+
+        Notes
+        -----
+        * The current time and amplitude of the wave are not changed
+        * For the DFT constructions the surface follows from one complex matrix
+          product of the nt x nk matrix A_i exp(-j omega_i t) with the cached nk x nx
+          matrix exp(j k x). For the FFT all the time steps are stacked and
+          transformed with a single batched ifft along the last axis. The NUFFT
+          transforms all the time steps in one call as well
+        """
+        times = np.atleast_1d(np.asarray(times, dtype=float))
+
+        # nt x nk matrix with the complex amplitudes rotated to each time
+        phasors = np.exp(-1j * np.multiply.outer(times, self.omega_dispersion))
+        phasors *= self.complex_amplitudes
+
+        if self.wave_construction in ("DFTpolar", "DFTcartesian"):
+            if self.exp_matrix_kx is not None:
+                surfaces = np.real(np.dot(phasors, self.exp_matrix_kx))
+            else:
+                surfaces = np.real(
+                    _dft_in_tiles(
+                        phasors,
+                        self.kx_nodes,
+                        self.xpoints,
+                        memory_budget=self.dft_memory_budget,
+                    )
+                )
+            if self.wave_construction == "DFTcartesian":
+                surfaces *= 0.5
+        elif self.wave_construction == "NUFFTpolar":
+            surfaces = self.nufft_amplitude(phasors, self.omega_dispersion, None)
+        elif self.wave_construction == "FFT" and self.half_spectrum:
+            N = self.nx_fft / 2
+            fft_backend = get_fft_backend(self.fft_backend)
+            out = _fft_out(
+                self.fft_buffers,
+                "surface_at",
+                fft_backend,
+                (times.size, self.nx_fft),
+                np.finfo(phasors.dtype).dtype,
+            )
+            surfaces = fft_backend.irfft(phasors, n=self.nx_fft, axis=-1, out=out)
+            surfaces = N * surfaces[:, : self.nx_points]
+        elif self.wave_construction == "FFT":
+            N = self.complex_amplitudes.size / 2
+            fft_backend = get_fft_backend(self.fft_backend)
+            out = _fft_out(
+                self.fft_buffers,
+                "surface_at",
+                fft_backend,
+                phasors.shape,
+                phasors.dtype,
+            )
+            surfaces = np.real(fft_backend.ifft(phasors, axis=-1, out=out))
+            surfaces = N * surfaces[:, : self.nx_points]
+        else:
+            raise AssertionError(
+                "wave_construction should be either FFT, DFTpolar, DFTcartesian, or "
+                "NUFFTpolar. Found {}".format(self.wave_construction)
+            )
+
+        return surfaces.astype(self.real_dtype, copy=False)
+
     @staticmethod
-    def dft_complex_amplitudes(S_tilde, exp_kx, omega, time):
+    def dft_complex_amplitudes(
+        S_tilde, exp_kx, omega, time, kx_nodes=None, xpoints=None, memory_budget=256
+    ):
         """
         Calculate the wave height from the complex amplitudes at given time
 
@@ -2819,13 +4158,22 @@ class Wave1D:
         ----------
         S_tilde: complex ndarray
             vector Nx1 with the complex amplitudes
-        exp_kx: ndarray array
+        exp_kx: ndarray array or None
             NxM matrix with exp(k * x) where k is Nx1 k waves vectors and x is 1XM
-            spatial nodes
+            spatial nodes. If None, the matrix is evaluated in tiles from *kx_nodes*
+            and *xpoints*
         omega: ndarray
             N ndvector
-        time: float
-            Current time
+        time: float or None
+            Current time. If None, S_tilde is assumed to be rotated to the current time
+            already
+        kx_nodes: ndarray, optional
+            N wave vector nodes. Only required if *exp_kx* is None
+        xpoints: ndarray, optional
+            M spatial nodes. Only required if *exp_kx* is None
+        memory_budget: float, optional
+            Memory in MB available for a tile of exp(j k x) in case *exp_kx* is None.
+            Default = 256 MB
         Returns
         -------
         ndarray array
@@ -2835,17 +4183,58 @@ class Wave1D:
         -----
         Calculate the vector height(x0,x1,..xM) = real(sum_k A*exp(j(k*x-w*t))), where
         the MxN matrix exp(k*x) and the Nx1 vector A (with the complex amplitudes) have
-        been pre-calculated and exp(j*w*t) is put here in a NxN diagonal matrix.
+        been pre-calculated and A is scaled element-wise with exp(-j*w*t).
         Return the Mx1 vector with height for each position x
         """
-        N = S_tilde.size
-        omega_matrix = np.eye(N) * np.exp(-1j * omega * time)
-        M = np.dot(S_tilde, omega_matrix)
-        dft = np.dot(M, exp_kx)
+        if time is not None:
+            M = S_tilde * np.exp(-1j * omega * time)
+        else:
+            M = S_tilde
+        if exp_kx is not None:
+            dft = np.dot(M, exp_kx)
+        else:
+            dft = _dft_in_tiles(M, kx_nodes, xpoints, memory_budget=memory_budget)
         return np.real(dft)
 
+    def nufft_amplitude(self, S_tilde, omega, time):
+        """Calculate the amplitude at time using the non-uniform FFT
+
+        Parameters
+        ----------
+        S_tilde: ndarray
+            Complex amplitudes of the n_k wave vectors, or a n_t x n_k matrix for n_t
+            time steps at once
+        omega: ndarray
+            n_k array with the angular frequency rad/s per wave vector k
+        time:  float or None
+            Current time. If None, S_tilde is assumed to be rotated to the current time
+            already
+
+        Returns
+        -------
+        ndarray
+            real array with the wave amplitude of size n_x, or n_t x n_x
+
+        Notes
+        -----
+        The result equals the *dft_complex_amplitudes* to the relative accuracy
+        *nufft_tolerance*, but is obtained in O(N log N)
+        """
+        if time is not None:
+            S_tilde = S_tilde * np.exp(-1j * omega * time)
+        ampl = nufft1d(
+            S_tilde,
+            self.kx_nodes,
+            x_start=self.xpoints[0],
+            delta_x=self.delta_x,
+            nx_points=self.nx_points,
+            tolerance=self.nufft_tolerance,
+            fft_backend=self.fft_backend,
+        )
+        return np.real(ampl)
+
     @staticmethod
-    def fft_amplitude(S_tilde, omega, time):
+    def fft_amplitude(S_tilde, omega, time, nx_points=None, fft_backend=None, out=None):
         """Calculate the amplitude at time using the FFT
 
         Parameters
@@ -2854,8 +4243,20 @@ class Wave1D:
             Nx1 array with the complex amplitudes of the wave spectrum
         omega: ndarray
             N x 1 array with the real angular frequency rad/s per wave vector k
-        time:  float
-            Current time
+        time:  float or None
+            Current time. If None, S_tilde is assumed to be rotated to the current time
+            already
+        nx_points: int, optional
+            If given, S_tilde only contains the non-negative half of the spectrum and
+            the real inverse FFT is used to obtain *nx_points* spatial points.
+            Default = None, i.e. the full mirrored spectrum is passed
+        fft_backend: str or FFTBackend, optional
+            Backend used for the inverse FFT. Default = None, i.e. the default backend
+            of the *fft_backends* module is used
+        out: ndarray, optional
+            Preallocated output array of the inverse FFT, which is reused over the
+            calls. Only saves an allocation for a backend writing directly into *out*,
+            see :attr:`FFTBackend.writes_to_out`. Default = None
 
         Returns
         -------
@@ -2864,12 +4265,27 @@ class Wave1D:
 
         Notes
         -----
-        Since the FFT is used, the  S_tilde should by symmetrical around k=0 such that
-        S(k)=S^*(-k)
+        * Since the FFT is used, the  S_tilde should by symmetrical around k=0 such
+          that S(k)=S^*(-k)
+        * The returned array is always newly allocated, also if *out* is given
 
         """
+        fft_backend = get_fft_backend(fft_backend)
+        # do not allow the backend to overwrite the (cached) amplitudes passed
+        overwrite_x = None if time is not None else False
+        if time is not None:
+            S_tilde = S_tilde * np.exp(1j * (-time * omega))
+        if nx_points is not None:
+            # the half spectrum. irfft imposes the symmetry S(k)=S^*(-k) itself
+            return (
+                nx_points
+                / 2
+                * fft_backend.irfft(
+                    S_tilde, n=nx_points, out=out, overwrite_x=overwrite_x
+                )
+            )
         N = S_tilde.size / 2
-        ampl = N * np.fft.ifft(S_tilde * np.exp(1j * (-time * omega)))
+        ampl = fft_backend.ifft(S_tilde, out=out, overwrite_x=overwrite_x)
         # ampl should be real already because S_tilde should by symmetrical around k=0
         # S(k)=S^*(-k) to be sure, take the real value only
-        return np.real(ampl)
+        return N * np.real(ampl)
@@ -0,0 +1,259 @@
+"""
+Response spectra of a vessel for a range of headings.
+
+The response of a vessel to a sea state follows from its Response Amplitude Operators
+(RAOs) and the 2D wave spectrum. For a heading of the vessel, the RAOs are rolled over
+the direction axis with *set_heading* of the *wave_spectra* module and the response
+spectrum of each degree of freedom (DOF) is obtained by integrating the product of the
+squared RAO magnitude and the wave spectrum over the directions
+
+.. math ::
+
+    S_r(\\omega) = \\sum_{\\theta} |RAO(\\omega, \\theta)|^2 S(\\omega, \\theta)
+    \\Delta\\theta
+
+The :class:`RAOResponse` evaluates the response spectra and spectral moments for all
+the DOFs and all the headings at once, and also for a stack of wave spectra.
+
+Examples
+--------
+
+Create the response of the 6 DOFs of the RAO data file for 36 headings. The RAOs are
+stored as n_directions x n_frequencies x n_dof and are transposed to the DOFs first
+
+>>> import os
+>>> from pymarine.utils.numerical import loadmat
+>>> from pymarine.waves.wave_spectra import spectrum_jonswap
+>>> data = loadmat(filename=os.path.join("..", "data", "RAO_7.mat"))
+>>> frequencies = data["FreqRange"]
+>>> directions = np.deg2rad(data["DirRange"])
+>>> response = RAOResponse(
+...     raos=np.transpose(data["RAO"], (2, 1, 0)),
+...     frequencies=frequencies,
+...     directions=directions,
+...     headings=np.arange(0, 360, 10),
+... )
+
+Build a 2D wave spectrum on the same frequencies and directions from a JONSWAP
+spectrum and a cosine squared spreading function. The response spectra have one row
+per heading and DOF
+
+>>> spreading = np.cos((directions - 1) / 2) ** 2
+>>> spectrum_2d = spectrum_jonswap(frequencies, Hs=3, Tp=9)[:, None] * spreading
+>>> response.response_spectra(spectrum_2d).shape
+(36, 6, 250)
+
+"""
+
+import logging
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.integrate import trapezoid
+
+from pymarine.waves.wave_spectra import heading_roll_indices
+
+logger = logging.getLogger(__name__)
+
+
+def rolled_direction_views(data, shifts):
+    """
+    Get the data rolled backwards over the last axis for a list of shifts
+
+    Parameters
+    ----------
+    data: ndarray
+        Array with the directions on the last axis
+    shifts: array_like
+        Integer array with the number of direction bins of each roll
+
+    Returns
+    -------
+    ndarray
+        Array of shape (..., n_shifts, n_directions) with *np.roll(data, -shift,
+        axis=-1)* for each shift
+
+    Notes
+    -----
+    The data is concatenated once with itself over the last axis, such that all the
+    rolls are windows in a strided view. Only the selection of the windows of the
+    shifts is copied
+    """
+    n_directions = data.shape[-1]
+    shifts = np.asarray(shifts) % n_directions
+    doubled = np.concatenate((data, data[..., :-1]), axis=-1)
+    windows = sliding_window_view(doubled, n_directions, axis=-1)
+    return windows[..., shifts, :]
+
+
+def spectral_moments(spectra, frequencies, orders=(0, 1, 2)):
+    """
+    Calculate the spectral moments of spectra over the last axis
+
+    Parameters
+    ----------
+    spectra: ndarray
+        Array with the spectral densities on the last axis
+    frequencies: ndarray
+        1D array with the frequencies in rad/s of the last axis
+    orders: array_like, optional
+        Orders n of the moments. Default = (0, 1, 2)
+
+    Returns
+    -------
+    ndarray
+        Array of shape (n_orders, ...) with the moments of all the spectra
+
+    Notes
+    -----
+    The moment of order n is
+
+    .. math ::
+
+        m_n = \\int \\omega^n S(\\omega) d\\omega
+
+    which is integrated with the trapezoidal rule for all the orders at once
+    """
+    orders = np.asarray(orders, dtype=float)
+    frequencies = np.asarray(frequencies, dtype=float)
+    weights = frequencies ** orders.reshape((-1,) + (1,) * np.ndim(spectra))
+    return trapezoid(weights * spectra, x=frequencies, axis=-1)
+
+
+class RAOResponse:
+    """
+    Response spectra of a vessel for a list of headings
+
+    Parameters
+    ----------
+    raos: ndarray
+        Complex or magnitude RAOs of shape (n_dof, n_omega, n_directions)
+    frequencies: ndarray
+        1D array with the n_omega frequencies in rad/s of the RAOs
+    directions: ndarray
+        1D array with the n_directions equidistant directions in rad of the RAOs,
+        covering the full circle
+    headings: array_like
+        Headings in degrees defined as where the bow is going to. See *set_heading*
+    heading_reverse: bool, optional
+        Swap the headings by 180 degrees, as in *set_heading*. Default = True
+
+    Notes
+    -----
+    * The response spectra of a heading are equal to the direction integral of the
+      RAOs rolled with *set_heading* times the wave spectrum
+    * The rolled RAOs are selected from a strided view of the squared RAO magnitudes,
+      once per unique roll index at construction. Headings with the same roll index
+      share the rolled RAOs, so the memory and the work do not grow with the number
+      of headings beyond the number of directions
+    * The direction sums of all the sea states, DOFs and roll indices are carried
+      out as a single matrix product per frequency, such that many sea states can be
+      evaluated at once
+    """
+
+    def __init__(self, raos, frequencies, directions, headings, heading_reverse=True):
+        raos = np.asarray(raos)
+        if raos.ndim != 3:
+            raise ValueError(
+                "The RAOs must have the shape (n_dof, n_omega, n_directions). "
+                "Found {}".format(raos.shape)
+            )
+
+        self.frequencies = np.asarray(frequencies, dtype=float)
+        self.directions = np.asarray(directions, dtype=float)
+        self.headings = np.atleast_1d(np.asarray(headings, dtype=float))
+        self.heading_reverse = heading_reverse
+
+        if raos.shape[1:] != (self.frequencies.size, self.directions.size):
+            raise ValueError(
+                "The RAOs of shape {} do not match {} frequencies and {} directions"
+                "".format(raos.shape, self.frequencies.size, self.directions.size)
+            )
+
+        self.n_dof = raos.shape[0]
+        self.delta_direction = 2 * np.pi / self.directions.size
+
+        shifts = np.atleast_1d(
+            heading_roll_indices(
+                self.directions, self.headings, heading_reverse=heading_reverse
+            )
+        )
+        self.shifts, self.i_shifts = np.unique(shifts, return_inverse=True)
+
+        # the squared magnitudes rolled for each unique roll index with the
+        # frequencies first, as the frequencies are the batch dimension of the matrix
+        # products. Shape n_omega x n_directions x (n_dof x n_shifts)
+        rao_squared = np.transpose(abs(raos) ** 2, (1, 0, 2))
+        rao_rolled = rolled_direction_views(rao_squared, -self.shifts)
+        self.rao_rolled = np.ascontiguousarray(
+            np.transpose(rao_rolled, (0, 3, 1, 2))
+        ).reshape(self.frequencies.size, self.directions.size, -1)
+
+    def response_spectra(self, spectrum_2d):
+        """
+        Calculate the response spectra of all the DOFs and headings
+
+        Parameters
+        ----------
+        spectrum_2d: ndarray
+            Wave spectrum of shape (n_omega, n_directions) on the frequencies and
+            directions of the RAOs, or a stack of spectra of shape (..., n_omega,
+            n_directions)
+
+        Returns
+        -------
+        ndarray
+            Response spectra of shape (..., n_headings, n_dof, n_omega)
+        """
+        spectrum_2d = np.asarray(spectrum_2d, dtype=float)
+        batch_shape = spectrum_2d.shape[:-2]
+        n_omega, n_directions = spectrum_2d.shape[-2:]
+
+        # put the sea states in the rows of the matrix product of each frequency:
+        # (n_omega, n_spectra, n_directions) x (n_omega, n_directions, n_dof x n_shifts)
+        spectra = np.moveaxis(spectrum_2d.reshape(-1, n_omega, n_directions), 1, 0)
+        response = np.matmul(spectra, self.rao_rolled)
+        response *= self.delta_direction
+
+        # select the roll index of each heading and put the frequencies last
+        response = response.reshape(n_omega, -1, self.n_dof, self.shifts.size)
+        response = np.transpose(response[..., self.i_shifts], (1, 3, 2, 0))
+
+        return response.reshape(batch_shape + response.shape[1:])
+
+    def spectral_moments(self, spectrum_2d, orders=(0, 1, 2)):
+        """
+        Calculate the spectral moments of the response of all the DOFs and headings
+
+        Parameters
+        ----------
+        spectrum_2d: ndarray
+            Wave spectrum or stack of wave spectra. See *response_spectra*
+        orders: array_like, optional
+            Orders of the moments. Default = (0, 1, 2)
+
+        Returns
+        -------
+        ndarray
+            Moments of shape (n_orders, ..., n_headings, n_dof)
+        """
+        return spectral_moments(
+            self.response_spectra(spectrum_2d), self.frequencies, orders=orders
+        )
+
+    def significant_amplitudes(self, spectrum_2d):
+        """
+        Calculate the significant response amplitudes of all the DOFs and headings
+
+        Parameters
+        ----------
+        spectrum_2d: ndarray
+            Wave spectrum or stack of wave spectra. See *response_spectra*
+
+        Returns
+        -------
+        ndarray
+            Significant amplitudes :math:`2\\sqrt{m_0}` of shape (..., n_headings,
+            n_dof)
+        """
+        return 2 * np.sqrt(self.spectral_moments(spectrum_2d, orders=(0,))[0])
@@ -16,7 +16,7 @@ from scipy.interpolate import interp1d
 from scipy.ndimage import rotate
 
 import pymarine.utils.coordinate_transformations as acf
-from pymarine.utils.numerical import find_idx_nearest_val
+from pymarine.utils.numerical import interp1d_columns
 
 logger = logging.getLogger()
 
@@ -660,6 +660,85 @@ def spectrum_wave_k_domain(
     return spectrum_vs_k
 
 
+def equal_energy_k_nodes(
+    k_start,
+    k_end,
+    energy_per_bin,
+    Hs=1.0,
+    Tp=10.0,
+    gamma=3.3,
+    sigma=0.0625,
+    spectrum_type="jonswap",
+    spectral_version="sim",
+    n_table=16384,
+):
+    """Calculate the wave vector nodes dividing the spectrum in bins of equal energy
+
+    Parameters
+    ----------
+    k_start : float
+        First wave vector node in rad/m
+    k_end : float
+        All the nodes are below this wave vector in rad/m
+    energy_per_bin : float
+        Energy of the spectrum between two successive nodes
+    Hs : float, optional
+        significant wave height (Default value = 1.0)
+    Tp : float, optional
+        Peak period (Default value = 10.0)
+    gamma : float, optional
+        peaking factor (Default value = 3.3)
+    sigma : float, optional
+        The width of the spectrum; only used for a Gauss spectrum. Default = 0.0625
+    spectrum_type : {"jonswap", "gauss"}
+        type of  spectrum used. Default = "jonswap"
+    spectral_version: {"sim", "dnv"}
+        type of spectrum_type used. Default = "sim"
+    n_table : int, optional
+        Number of points of the table with the cumulative energy between *k_start*
+        and *k_end*. Default = 16384
+
+    Returns
+    -------
+    ndarray
+        The wave vector nodes :math:`k_0=k_{start}, k_1, ..., k_n < k_{end}` for
+        which the integral of :math:`S(k)` between two successive nodes equals
+        *energy_per_bin*
+
+    Notes
+    -----
+    The cumulative energy :math:`E(k)=\\int_{k_{start}}^k S(k') dk'` is tabulated
+    once with the trapezoidal rule on a fine grid. As :math:`E(k)` is monotonically
+    increasing, all the nodes follow at once from the inverse
+    :math:`k_i = E^{-1}(i E_{bin})`, obtained with a binary search in the table and a
+    linear interpolation between the table points.
+    """
+    k_table = np.linspace(k_start, k_end, n_table)
+    spectrum = spectrum_wave_k_domain(
+        k_table,
+        Hs=Hs,
+        Tp=Tp,
+        gamma=gamma,
+        sigma=sigma,
+        spectrum_type=spectrum_type,
+        spectral_version=spectral_version,
+    )
+    energy = np.zeros(n_table)
+    energy[1:] = np.cumsum(0.5 * (spectrum[1:] + spectrum[:-1]) * np.diff(k_table))
+
+    n_bins = int(energy[-1] / energy_per_bin)
+    energy_targets = energy_per_bin * np.arange(1, n_bins + 1)
+    energy_targets = energy_targets[energy_targets < energy[-1]]
+
+    # energy[i_right - 1] < target <= energy[i_right], so the interval is not empty
+    i_right = np.searchsorted(energy, energy_targets, side="left")
+    i_left = i_right - 1
+    fraction = (energy_targets - energy[i_left]) / (energy[i_right] - energy[i_left])
+    k_nodes = k_table[i_left] + fraction * (k_table[i_right] - k_table[i_left])
+
+    return np.concatenate(([k_start], k_nodes))
+
+
 def spectrum_jonswap_k_domain_2(
     k_waves, Hs=1.0, Tp=10.0, gamma=3.3, spectral_version="sim"
 ):
@@ -832,6 +911,7 @@ def spectrum_complex_amplitudes_on_k_mesh(
     spectral_version="sim",
     spectrum_type="jonswap",
     seed=None,
+    rng=None,
 ):
     """
     Calculate the complex amplitudes based on a spectrum with a random phase on a wave
@@ -867,6 +947,9 @@ def spectrum_complex_amplitudes_on_k_mesh(
         *wave_spectra* module for more details.
     seed :
         seed for the random phase (Default value = None)
+    rng : Generator, optional
+        Random generator for the phases, see *phase_generator*. If given, *seed* is not
+        used and the global random state of numpy is not touched. Default = None
 
     Returns
     -------
@@ -882,60 +965,62 @@ def spectrum_complex_amplitudes_on_k_mesh(
     delta_ky = ky_nodes[1]
     dkxdky = delta_kx * delta_ky
 
-    # Initialise an array of complex amplitudes
-    complex_amplitudes = np.zeros((nx, ny), complex)
+    # Initialise the global random generator if no generator is passed
+    if rng is None:
+        if seed is None:
+            np.random.seed(0)
+        else:
+            np.random.seed(seed)
+
+    # Create the mesh with ky along the rows and kx along the columns. This way, the
+    # row-major order of the mesh follows the ky outer and kx inner loop over the nodes
+    # used to draw the random phases one by one, such that the same phases are obtained
+    # for a given seed
+    kx_mesh, ky_mesh = np.meshgrid(kx_nodes, ky_nodes)
+    (kk_mesh, theta_mesh) = acf.cartesian_to_polar(kx_mesh, ky_mesh)
+
+    # the marine definition of theta puts the theta=0 towards the positive
+    # y-axis and is clockwise rotating
+    theta_mesh = np.pi / 2 - theta_mesh
+
+    # the complex amplitude at kk=0 is zero. Only calculate the other wave vectors
+    is_wave = kk_mesh != 0.0
+    kk = kk_mesh[is_wave]
+    theta = theta_mesh[is_wave]
+
+    # spreading factor
+    # Divided by kk to convert the Dspread from polar to cartesian coordinates
+    Dspread = (
+        spreading_function(
+            theta=theta, theta0=theta_0, s_spreading_factor=theta_s_spreading
+        )
+        / kk
+    )
 
-    # Initialise the random generator
-    if seed is None:
-        np.random.seed(0)
-    else:
-        np.random.seed(seed)
+    spectrum = spectrum_wave_k_domain(
+        kk,
+        Hs=Hs,
+        Tp=Tp,
+        gamma=gamma,
+        sigma=sigma,
+        spectral_version=spectral_version,
+        spectrum_type=spectrum_type,
+    )
 
-    # Calculate the spectrum for all the quadrants over kx. We are going to point mirror
-    # later
-    for j in range(0, ny, 1):
-        for i in range(0, nx, 1):
-            (kk, theta) = acf.cartesian_to_polar(kx_nodes[i], ky_nodes[j])
+    # get random phase between 0~2pi.
+    if rng is None:
+        phase = 2 * np.pi * np.random.random(kk.size)
+    else:
+        phase = 2 * np.pi * rng.random(kk.size)
 
-            # the marine definition of theta puts the theta=0 towards the positive
-            # y-axis and is clockwise rotating
-            theta = np.pi / 2 - theta
+    # create the complex wave amplitudes for all wave vectors kx, ky
+    complex_amplitudes = np.zeros((ny, nx), complex)
+    complex_amplitudes[is_wave] = np.sqrt(2.0 * spectrum * Dspread * dkxdky) * np.exp(
+        1j * phase
+    )
 
-            if kk == 0.0:
-                complex_amplitudes[i, j] = 0.0 + 0.0j
-            else:
-                # spreading factor
-                # Divided by kk to convert the Dspread from polar to cartesian
-                # coordinates
-                Dspread = (
-                    spreading_function(
-                        theta=theta,
-                        theta0=theta_0,
-                        s_spreading_factor=theta_s_spreading,
-                    )
-                    / kk
-                )
-
-                spectrum = spectrum_wave_k_domain(
-                    kk,
-                    Hs=Hs,
-                    Tp=Tp,
-                    gamma=gamma,
-                    sigma=sigma,
-                    spectral_version=spectral_version,
-                    spectrum_type=spectrum_type,
-                )
-
-                # get random phase between 0~2pi.
-                phase = 2 * np.pi * np.random.random()
-
-                # create the complex wave amplitude for the current wave vector kx, ky
-                amplitude = np.sqrt(2.0 * spectrum * Dspread * dkxdky) * np.exp(
-                    1j * phase
-                )
-                # amplitude is a ndarray of size 1. Get the first value for the complex
-                # amplitude
-                complex_amplitudes[i, j] = amplitude[0]
+    # transpose back to the nx x ny layout with kx along the rows
+    complex_amplitudes = np.ascontiguousarray(complex_amplitudes.T)
 
     return complex_amplitudes
 
@@ -953,6 +1038,7 @@ def spectrum2d_complex_amplitudes(
     spectral_version="sim",
     mirror=True,
     seed=None,
+    rng=None,
 ):
     """
     Calculate the spectral complex amplitude on a cartesian wave vector mesh with a
@@ -987,6 +1073,9 @@ def spectrum2d_complex_amplitudes(
         and *spectrum_gauss* from the *wave_spectra* module for more details.
     seed :
         seed for the random phase (Default value = None)
+    rng : Generator, optional
+        Random generator for the phases, see *phase_generator*. If given, *seed* is not
+        used. Default = None
 
     Returns
     -------
@@ -1086,6 +1175,7 @@ def spectrum2d_complex_amplitudes(
         spectrum_type=spectrum_type,
         spectral_version=spectral_version,
         seed=seed,
+        rng=rng,
     )
 
     # get the size of the wave vector mesh
@@ -1214,6 +1304,100 @@ def spectrum2d_complex_amplitudes(
     return c_ampl, s_ampl
 
 
+def spectrum2d_complex_amplitudes_half_plane(
+    kx_nodes,
+    ky_nodes,
+    ny_points,
+    Hs=1.0,
+    Tp=10.0,
+    gamma=3.3,
+    sigma=0.0625,
+    Theta_0=0.0,
+    Theta_s_spread_kx=5,
+    spectrum_type="jonswap",
+    spectral_version="sim",
+    seed=None,
+    rng=None,
+):
+    """
+    Calculate the spectral complex amplitudes on the non-negative half plane
+    :math:`k_y \\ge 0` of a cartesian wave vector mesh
+
+    Parameters
+    ----------
+    kx_nodes : ndarray
+        list of kx nodes as obtained from fftfreq. Should start at kx=0
+    ky_nodes : ndarray
+        list of non-negative ky nodes as obtained from rfftfreq. Should start at ky=0
+    ny_points : int
+        Number of spatial points in y direction passed to rfftfreq to obtain
+        *ky_nodes*. Required to evaluate the spectrum on the full ky range
+    Hs : float, optional
+        significant wave height (Default value = 1.0)
+    Tp : float, optional
+        peak period (Default value = 10)
+    gamma : float, optional
+        peak enhancement factor (Default value = 3.3)
+    sigma : float, optional
+        Width of the spectrum. Only used when the spectrum_type=gauss spectrum is used
+    Theta_0 : float, optional
+        mean direction theta (Default value = 0.0)
+    Theta_s_spread_kx : float, optional
+        s factor to control spreading of waves (Default value = 5)
+    spectrum_type : {"jonswap", "gauss"}
+        type of  spectrum used. Either "jonswap" or "gauss". Default = "jonswap"
+    spectral_version : {"sim", "dnv"}
+        Which spectral distribution version to use. Default is "sim".
+    seed :
+        seed for the random phase (Default value = None)
+    rng : Generator, optional
+        Random generator for the phases, see *phase_generator*. If given, *seed* is not
+        used. Default = None
+
+    Returns
+    -------
+    (c_ampl, s_ampl)
+        * c_ampl: 2D ndarray with complex amplitudes of shape nkx x nky
+        * s_ampl: 2D ndarray with sign to apply on the angular frequency of the
+          conjugated complex amplitudes
+
+    Notes
+    -----
+    * The returned amplitudes can be passed to *irfft2* which assumes the Hermitian
+      symmetry :math:`A(-\\mathbf{k}) = A^\\ast(\\mathbf{k})` for the missing half
+      plane. This halves the memory and the transform time of the wave field compared
+      to the full mirrored spectrum of *spectrum2d_complex_amplitudes*
+    * The spectrum is evaluated on the full ky range, such that the largest amplitude
+      of each point mirrored pair of wave vectors is kept, also if it lies in the
+      half plane :math:`k_y < 0`. The returned amplitudes are the columns
+      :math:`k_y \\ge 0` of the full spectrum of *spectrum2d_complex_amplitudes*
+      with the same phases, so both give the same wave field for any *Theta_0*
+    """
+    # the full ky range of fftfreq with the same spacing as the half plane
+    delta_ky = ky_nodes[1] - ky_nodes[0] if ky_nodes.size > 1 else 0.0
+    ky_nodes_full = np.fft.fftfreq(ny_points, 1 / ny_points) * delta_ky
+
+    c_ampl, s_ampl = spectrum2d_complex_amplitudes(
+        kx_nodes=kx_nodes,
+        ky_nodes=ky_nodes_full,
+        Hs=Hs,
+        Tp=Tp,
+        gamma=gamma,
+        sigma=sigma,
+        Theta_0=Theta_0,
+        Theta_s_spread_kx=Theta_s_spread_kx,
+        spectrum_type=spectrum_type,
+        spectral_version=spectral_version,
+        seed=seed,
+        rng=rng,
+    )
+
+    # the first ny_points // 2 + 1 columns are the ky >= 0 nodes of rfftfreq. For an
+    # even number of points the Nyquist column is -ny/2, which is aliased to +ny/2
+    n_ky = ky_nodes.size
+    return c_ampl[:, :n_ky], s_ampl[:, :n_ky]
+
+
 def rotate_fft_2d(data2d, angle=0, pivot_x=0, pivot_y=0):
     """Rotate a 2D array around a pivot
 
@@ -1464,6 +1648,47 @@ def omega_vs_omega_e(omega, velocity):
     return omega1, omega2
 
 
+def omega_vs_omega_e_array(omega, velocity):
+    """Calculate the relation between the true and encountered frequency for arrays
+
+    Parameters
+    ----------
+    omega: array_like
+        Encountered frequencies in rad/s
+    velocity: array_like
+        The velocity of the monitor point in the direction of the wave vector k.
+        Broadcasted against *omega*
+
+    Returns
+    -------
+    tuple:
+        (omega_1, omega_2): 2 arrays with the real frequencies belonging to the
+        encountered frequencies. Where only one solution is available, *omega_2* is
+        NaN and where no solution exists both are NaN
+
+    Notes
+    -----
+    The array version of *omega_vs_omega_e*, which gives the same solutions element
+    wise, with NaN instead of None
+    """
+    omega, velocity = np.broadcast_arrays(
+        np.asarray(omega, dtype=float), np.asarray(velocity, dtype=float)
+    )
+    is_moving = abs(velocity) >= TINY
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        omega_c = np.where(is_moving, g0 / (2 * velocity), np.nan)
+        determinant = 1 - 2 * omega / omega_c
+        det_sqrt = np.sqrt(np.where(determinant >= 0, determinant, np.nan))
+
+    omega1 = np.where(is_moving, omega_c * (1 + det_sqrt), omega)
+    omega2 = np.where(
+        is_moving & (abs(determinant) >= TINY), omega_c * (1 - det_sqrt), np.nan
+    )
+
+    return omega1, omega2
+
+
 def spectrum_to_spectrum_encountered(spectrum, frequencies, velocity, debug_plot=False):
     """Apply a velocity shift on a 1d spectrum density to obtain the encountered
        spectrum
@@ -1644,28 +1869,17 @@ def spectrum2d_to_spectrum2d_encountered(
     # Interpolate back to the uniform mesh via the cumulative energy
     cum_sum_energy = np.cumsum(spectrum_2d_e * abs(delta_omega_e_swap), axis=0)
 
-    cum_sum_energy_new = np.zeros(spectrum_2d.shape)
-    spectrum_2d_e_int = np.zeros(spectrum_2d.shape)
-
     # the delta frequency adn delta direction of the original input
     df = np.diff(frequencies[:, 0])[0]
     dd = np.diff(directions[0, :])[0]
 
-    # loop over all the directions and interpolate the frequency axis to put the
+    # interpolate the frequency axis of all the directions at once to put the
     # encountered frequency on the same mesh as the original frequencies
-    for cnt in range(directions.shape[1]):
-        # make interpolation function
-        f_inter = interp1d(
-            omega_e_swap[:, cnt],
-            cum_sum_energy[:, cnt],
-            bounds_error=False,
-            fill_value="extrapolate",
-        )
-        cum_sum_energy_new[:, cnt] = f_inter(frequencies[:, cnt])
+    cum_sum_energy_new = interp1d_columns(frequencies, omega_e_swap, cum_sum_energy)
 
-        # go from the cumulative distribution back to the spectral density by taking the
-        # gradient and dividing by df
-        spectrum_2d_e_int[:, cnt] = np.gradient(cum_sum_energy_new[:, cnt] / df)
+    # go from the cumulative distribution back to the spectral density by taking the
+    # gradient along the frequency axis and dividing by df
+    spectrum_2d_e_int = np.gradient(cum_sum_energy_new / df, axis=0)
 
     if debug_plot:
         # use this to make some plots for debugging
@@ -1683,6 +1897,121 @@ def spectrum2d_to_spectrum2d_encountered(
     return spectrum_2d_e_int
 
 
+def spectrum2d_to_spectrum2d_encountered_grid(
+    spectrum_2d, frequencies, directions, velocities, headings, n_speeds_chunk=1
+):
+    """Apply the velocity shift on a 2d spectrum density for a grid of speeds and
+    headings
+
+    Parameters
+    ----------
+    spectrum_2d : ndarray
+        2d array with dimensions n_omega x n_directions
+    frequencies : ndarray
+        2d array with frequencies in rad/s (created with meshgrid)
+    directions : ndarray
+        2d array with directions in rad (created with mesh grid)
+    velocities : array_like
+        1d array with the n_speeds velocities of the ship in m/s
+    headings : array_like
+        1d array with the n_headings headings in rad of the ship relative to the
+        directions of the spectrum
+    n_speeds_chunk : int, optional
+        Number of velocities which are processed at once. Larger values require more
+        memory and are in general not faster, as the arrays of a chunk do not fit in
+        the cache anymore. Default = 1
+
+    Returns
+    -------
+    ndarray:
+        4d array with dimensions n_speeds x n_headings x n_omega x n_directions with
+        the encountered spectrum for each combination of velocity and heading
+
+    Notes
+    -----
+    * The encountered spectrum of velocity *velocities[i]* and heading *headings[j]*
+      is the same as the one obtained with *spectrum2d_to_spectrum2d_encountered* for
+      the velocity *velocities[i]* and the directions *directions - headings[j]*
+    * The frequency axis, the spectrum, and the relative directions of all headings
+      are calculated once and broadcast over the grid
+    * The encountered frequencies, their derivative and the interpolation intervals
+      only depend on the velocity parallel to the wave vector. They are calculated
+      once for each unique parallel velocity, which are a lot less than the number of
+      combinations of velocity, heading and direction in case the headings coincide
+      with the directions of the spectrum
+    """
+    velocities = np.atleast_1d(np.asarray(velocities, dtype=float))
+    headings = np.atleast_1d(np.asarray(headings, dtype=float))
+
+    n_omega, n_directions = spectrum_2d.shape
+
+    # the terms which are shared over the whole grid. The frequencies are put on the
+    # last axis such that the operations along the frequency axis are contiguous
+    omega = frequencies[:, 0]
+    spectrum_t = spectrum_2d.T
+    df = np.diff(frequencies[:, 0])[0]
+
+    # the cosine of the wave directions relative to each heading
+    cos_relative = np.cos(directions[0] - headings[:, None])
+
+    spectrum_e = np.empty((velocities.size, headings.size, n_omega, n_directions))
+    for i_start in range(0, velocities.size, n_speeds_chunk):
+        velocity = velocities[i_start : i_start + n_speeds_chunk, None, None]
+        n_speeds = velocity.shape[0]
+
+        # the encountered frequencies only depend on the velocity parallel to the wave
+        # vector, which is shared by many combinations of velocity, heading and
+        # direction. Calculate them once per unique parallel velocity
+        u_parallel = cos_relative * velocity
+        u_unique, i_unique = np.unique(u_parallel.ravel(), return_inverse=True)
+        u_unique = u_unique[:, None]
+
+        omega_e = omega_e_vs_omega(omega, u_unique)
+        d_omega_e_d_omega = d_omega_e_prime(omega, u_unique)
+        d_omega_e_d_omega = np.where(
+            abs(d_omega_e_d_omega) < TINY,
+            np.sign(d_omega_e_d_omega) * TINY,
+            d_omega_e_d_omega,
+        )
+        with np.errstate(divide="ignore"):
+            omega_critical = g0 / (2 * u_unique)
+        omega_e_swap = np.where(
+            d_omega_e_d_omega > 0, omega_e, omega_critical - omega_e
+        )
+        delta_omega_e_swap = np.gradient(omega_e_swap, axis=-1)
+
+        # the cumulative energy of all the directions of all velocities and headings,
+        # with shape (n_speeds_chunk x n_headings x n_directions) x n_omega
+        spectrum_columns = np.broadcast_to(
+            spectrum_t, (n_speeds, headings.size) + spectrum_t.shape
+        ).reshape(-1, n_omega)
+        cum_sum_energy = np.cumsum(
+            spectrum_columns
+            / abs(d_omega_e_d_omega)[i_unique]
+            * abs(delta_omega_e_swap)[i_unique],
+            axis=-1,
+        )
+
+        # interpolate the cumulative energy back to the original frequencies. The
+        # interpolation intervals are searched once per unique parallel velocity
+        cum_sum_energy_new = interp1d_columns(
+            np.broadcast_to(omega[:, None], omega_e_swap.T.shape),
+            omega_e_swap.T,
+            cum_sum_energy.T,
+            i_columns=i_unique,
+        )
+
+        spectrum_e[i_start : i_start + n_speeds] = np.moveaxis(
+            np.gradient(cum_sum_energy_new / df, axis=0).reshape(
+                n_omega, n_speeds, headings.size, n_directions
+            ),
+            0,
+            2,
+        )
+
+    return spectrum_e
+
+
 def mask_out_of_range(kx, kmin, kmax):
     """Create a mask array with the values in between kmin and kmax True
 
@@ -1722,7 +2051,48 @@ def mask_out_of_range(kx, kmin, kmax):
     return mask
 
 
-def initialize_phase(k_waves, seed=1):
+def phase_generator(seed=1, spawn_key=()):
+    """
+    Create a random generator for the phases of the wave components
+
+    Parameters
+    ----------
+    seed : int, optional
+        Entropy of the *SeedSequence* of the generator such that every run you get the
+        same random results for the same seed. Default value = 1. If seed = 0, fresh
+        entropy is taken from the operating system, which results in a different
+        result each run
+    spawn_key : tuple of int, optional
+        Spawn key of the *SeedSequence*. Different spawn keys of the same seed give
+        independent streams of random numbers, e.g. for the Wave1D and Wave2D or for
+        multiple realisations drawn by separate workers. Default = ()
+
+    Returns
+    -------
+    Generator
+        A :class:`numpy.random.Generator` which only depends on the *seed* and
+        *spawn_key*
+
+    Notes
+    -----
+    In contrast to *initialize_phase* without a generator, the global state of the
+    :mod:`numpy.random` module is not used. Therefore, each object can own its
+    generator and objects can be created concurrently in threads or processes with
+    deterministic results.
+
+    The phases of a wave are drawn from a single generator in the process owning the
+    wave. The shards of the sharded DFT of the :class:`Wave2D` only receive the complex
+    amplitudes and do not draw random numbers, so they do not need streams of their
+    own
+    """
+    if seed > 0:
+        seed_sequence = np.random.SeedSequence(seed, spawn_key=spawn_key)
+    else:
+        seed_sequence = np.random.SeedSequence(spawn_key=spawn_key)
+    return np.random.default_rng(seed_sequence)
+
+
+def initialize_phase(k_waves, seed=1, rng=None):
     r"""
     Initialise a random phase is in the range :math:`0\sim 2\pi` for all the nodes of
     the input vector *k_waves*
@@ -1734,7 +2104,11 @@ def initialize_phase(k_waves, seed=1):
     seed : int, optional
         See the random generator with an integer such that every run you get the same
         random results for the same seed. Default value = 1. If seed = 0, no seed is
-        used and this will result in a different result each random run
+        used and this will result in a different result each random run. Only used if
+        *rng* is None
+    rng : Generator, optional
+        Random generator used to draw the phases, see *phase_generator*. Default =
+        None, i.e. the global random state of numpy is seeded with *seed*
 
     Returns
     -------
@@ -1743,6 +2117,9 @@ def initialize_phase(k_waves, seed=1):
         range :math:`0\sim 2\pi`
 
     """
+    if rng is not None:
+        return 2 * np.pi * rng.random(np.shape(k_waves))
+
     if seed > 0:
         np.random.seed(seed)
     else:
@@ -1981,6 +2358,61 @@ def rayleigh_cdf(omega, sigma):
     return cdf
 
 
+def heading_roll_indices(directions, headings, heading_reverse=True):
+    """Get the number of direction bins by which *set_heading* rolls the data
+
+    Parameters
+    ----------
+    directions : ndarray
+        1D array with the directions in rad of the RAO
+    headings : float or array_like
+        Heading or array of headings in degrees defined as where the bow is going to
+    heading_reverse : bool, optional
+        Swap the heading by 180 degrees, as in *set_heading* (Default value = True)
+
+    Returns
+    -------
+    int or ndarray
+        The roll index of the heading, or an integer array with the roll index of
+        each heading
+
+    Notes
+    -----
+    The roll index is the index of the direction which is nearest to the heading,
+    found for all the headings at once with the same rules as *find_idx_nearest_val*
+    """
+    headings = np.asarray(headings, dtype=float)
+
+    # The heading in lift dyn is just the opposite: a heading of 0 is stern to the front
+    if heading_reverse:
+        headings = headings + 180
+
+    # Note that directions is in radians
+    dir_in_range = np.angle(np.exp(1j * np.asarray(directions)))
+    heading_rad_in_range = np.angle(np.exp(1j * np.deg2rad(headings)))
+
+    idx_sorted = np.argsort(dir_in_range)
+    sorted_directions = dir_in_range[idx_sorted]
+    n_directions = sorted_directions.size
+    idx = np.searchsorted(sorted_directions, heading_rad_in_range, side="left")
+
+    # take the lower neighbour only if it is strictly closer than the upper one
+    idx_low = np.clip(idx - 1, 0, n_directions - 1)
+    idx_high = np.clip(idx, 0, n_directions - 1)
+    take_low = (idx >= n_directions) | (
+        (idx > 0)
+        & (
+            abs(heading_rad_in_range - sorted_directions[idx_low])
+            < abs(heading_rad_in_range - sorted_directions[idx_high])
+        )
+    )
+    indices = idx_sorted[np.where(take_low, idx_low, idx_high)]
+
+    if indices.ndim == 0:
+        return int(indices)
+    return indices
+
+
 def set_heading(data, directions, heading, heading_reverse=True, direction_axis=2):
     """Rotate the data with the heading of the RAO
 
@@ -2011,14 +2443,9 @@ def set_heading(data, directions, heading, heading_reverse=True, direction_axis=
 
     """
 
-    # The heading in lift dyn is just the opposite: a heading of 0 is stern to the front
-    if heading_reverse:
-        heading += 180
-
-    # Note that directions is in radians
-    dir_in_range = np.angle(np.exp(1j * directions))
-    heading_rad_in_range = np.angle(np.exp(1j * np.deg2rad(heading)))
-    index_direction_deg = find_idx_nearest_val(dir_in_range, heading_rad_in_range)
+    index_direction_deg = heading_roll_indices(
+        directions, heading, heading_reverse=heading_reverse
+    )
     try:
         data_shifted = np.roll(data, index_direction_deg, axis=direction_axis)
     except ValueError:
@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_almost_equal, assert_equal
+
+from pymarine.utils.fft_backends import (
+    FFTBackend,
+    get_fft_backend,
+    set_default_fft_backend,
+)
+from pymarine.waves.wave_fields import Wave1D, Wave2D
+
+try:
+    import pyfftw
+except ImportError:
+    pyfftw = None
+
+
+def test_fft_backends():
+    np.random.seed(0)
+    spectrum = np.random.randn(16, 12) + 1j * np.random.randn(16, 12)
+
+    numpy_backend = FFTBackend("numpy")
+    scipy_backend = FFTBackend("scipy", workers=2)
+
+    # the numpy backend is identical to numpy.fft
+    assert_equal(numpy_backend.ifft2(spectrum), np.fft.ifft2(spectrum))
+    assert_equal(numpy_backend.irfft(spectrum, n=22), np.fft.irfft(spectrum, n=22))
+
+    for kind in ("ifft", "ifft2", "irfft", "irfft2"):
+        expected = getattr(np.fft, kind)(spectrum)
+        assert_almost_equal(getattr(scipy_backend, kind)(spectrum), expected)
+
+        # store the result into a given output buffer
+        out = np.empty(expected.shape, dtype=expected.dtype)
+        result = getattr(scipy_backend, kind)(spectrum, out=out)
+        assert result is out
+        assert_almost_equal(out, expected)
+
+    with pytest.raises(ValueError):
+        FFTBackend("not_a_backend")
+
+
+def test_default_fft_backend():
+    assert_equal(get_fft_backend().name, "numpy")
+    try:
+        set_default_fft_backend("scipy", workers=1)
+        assert_equal(get_fft_backend().name, "scipy")
+        wave1d_scipy = Wave1D(n_kx_nodes=128, Lx=1000, nx_points=128)
+        wave2d_scipy = Wave2D(wave1D=wave1d_scipy, nx_points=32, ny_points=48)
+    finally:
+        set_default_fft_backend("numpy")
+
+    # a wave with its own backend does not depend on the default backend
+    wave1d = Wave1D(n_kx_nodes=128, Lx=1000, nx_points=128, fft_backend="scipy")
+    wave2d = Wave2D(wave1D=wave1d, nx_points=32, ny_points=48)
+    assert_equal(wave2d.fft_backend, wave1d.fft_backend)
+    assert_equal(get_fft_backend(wave1d.fft_backend).name, "scipy")
+
+    wave1d_numpy = Wave1D(n_kx_nodes=128, Lx=1000, nx_points=128)
+    wave2d_numpy = Wave2D(wave1D=wave1d_numpy, nx_points=32, ny_points=48)
+    for wave_1d in (wave1d, wave1d_scipy, wave1d_numpy):
+        wave_1d.calculate_wave_surface()
+    assert_almost_equal(wave1d.amplitude, wave1d_numpy.amplitude)
+    assert_almost_equal(wave1d_scipy.amplitude, wave1d_numpy.amplitude)
+    assert_almost_equal(wave2d.amplitude, wave2d_numpy.amplitude)
+    assert_almost_equal(wave2d_scipy.amplitude, wave2d_numpy.amplitude)
+
+
+@pytest.mark.skipif(pyfftw is None, reason="the pyfftw backend requires pyFFTW")
+def test_pyfftw_reuses_plans_and_buffers():
+    wave1d = Wave1D(n_kx_nodes=128, Lx=1000, nx_points=128, fft_backend="pyfftw")
+    wave2d = Wave2D(wave1D=wave1d, nx_points=32, ny_points=48)
+    wave1d_numpy = Wave1D(n_kx_nodes=128, Lx=1000, nx_points=128)
+    wave2d_numpy = Wave2D(wave1D=wave1d_numpy, nx_points=32, ny_points=48)
+
+    backend = wave1d.fft_backend
+    buffers = None
+    for time in (0.0, 1.0, 2.0):
+        # the Wave2D follows the time of its Wave1D
+        wave1d.time = wave1d_numpy.time = time
+        for wave in (wave1d, wave2d, wave1d_numpy, wave2d_numpy):
+            wave.calculate_wave_surface()
+        assert_almost_equal(wave1d.amplitude, wave1d_numpy.amplitude)
+        assert_almost_equal(wave2d.amplitude, wave2d_numpy.amplitude)
+
+        # the plans and output arrays are created at the first time step only
+        assert_equal(len(backend.plans), 2)
+        current = (wave1d.fft_buffers["surface"], wave2d.fft_buffers["surface"])
+        if buffers is not None:
+            assert current[0] is buffers[0]
+            assert current[1] is buffers[1]
+        buffers = current
+
+        # the returned wave field does not share memory with the reused buffer
+        assert not np.shares_memory(wave2d.amplitude, wave2d.fft_buffers["surface"])
+
+    # the numpy backend copies into out, so no output arrays are kept
+    assert_equal(wave2d_numpy.fft_buffers, dict())
+
+
+def test_fft_out_copies_for_numpy():
+    wave1d = Wave1D(n_kx_nodes=128, Lx=1000, nx_points=128, fft_backend="scipy")
+    wave1d.calculate_wave_surface()
+    assert not wave1d.fft_backend.writes_to_out
+    assert_equal(wave1d.fft_buffers, dict())
+    out = wave1d.fft_backend.empty_out((4, 3), np.float64)
+    assert_equal(out.shape, (4, 3))
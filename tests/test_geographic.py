@@ -3,7 +3,19 @@ import pandas as pd
 from numpy.testing import assert_equal, assert_almost_equal
 from pandas.testing import assert_frame_equal
 
-from pymarine.utils.geographic import import_way_points, LocationCheck
+from pymarine.utils.geographic import (
+    EARTH_RADIUS,
+    LocationCheck,
+    MultiLocationCheck,
+    get_speed_from_distance_and_time,
+    great_circle_distance_and_bearing,
+    haversine_distance_and_bearing,
+    import_way_points,
+    process_trajectory_chunks,
+    trajectories_by_vessel,
+    travel_distance_and_heading_from_coordinates,
+    vincenty_distance_and_bearing,
+)
 
 
 def test_import_way_points():
@@ -105,6 +117,7 @@ def test_import_way_points_interpolated():
     except FileNotFoundError:
         data_kml = import_way_points("data/madeira_ivory.kml", n_distance_points=None)
 
+    data_kml_all = data_kml
     data_kml = data_kml.head(5)
     data_kml_expected = pd.DataFrame(
         index=np.array(
@@ -132,20 +145,23 @@ def test_import_way_points_interpolated():
         data_int = import_way_points("data/madeira_ivory.kml", n_distance_points=2000)
 
     # select only the first 5 rows for testing purpose and remove the empty column
+    data_int_all = data_int
     data_int = data_int.head(5)
 
     data_expected = pd.DataFrame(
-        index=np.array([0.0, 2.44157154192, 3.6625019557, 4.88352875138, 6.10465189836])
+        index=np.array(
+            [0.0, 1.26029857493, 2.52059714986, 3.78089572479, 5.04119429971]
+        )
     )
     data_expected.index.name = "travel_distance"
     data_expected["heading"] = np.array(
-        [225.526534405, 225.528796643, 225.533362888, 225.537926615, 225.542487823]
+        [225.799220253, 225.789738824, 225.780264317, 225.770796730, 225.761336058]
     )
     data_expected["latitude"] = np.array(
-        [32.4, 32.3714285714, 32.3571428571, 32.3428571429, 32.3285714286]
+        [32.4, 32.3853240417, 32.3706455875, 32.3559646398, 32.3412812006]
     )
     data_expected["longitude"] = np.array(
-        [-17.18, -17.2142857143, -17.2314285714, -17.2485714286, -17.2657142857]
+        [-17.18, -17.1977837523, -17.2155617267, -17.2333339274, -17.2511003585]
     )
 
     data_int = data_int[data_expected.columns]
@@ -157,6 +173,13 @@ def test_import_way_points_interpolated():
     first_location_dat = [data_int.loc[0, "latitude"], data_int.loc[0, "longitude"]]
     assert_almost_equal([first_location_kml], [first_location_dat])
 
+    # the resampled points are equidistant and the last point is the last way point
+    assert_almost_equal(np.diff(data_int_all.index.values), data_int_all.index[1])
+    assert_almost_equal(
+        data_int_all[["latitude", "longitude"]].values[-1],
+        data_kml_all[["latitude", "longitude"]].values[-1],
+    )
+
 
 def test_location_check():
     location_check = LocationCheck(
@@ -176,10 +199,192 @@ def test_location_check():
     assert_almost_equal(location_check.distance, 1.3807122835704022)
 
 
+def test_multi_location_check():
+    generator = np.random.default_rng(4)
+    target_latitudes = generator.uniform(-80, 80, 50)
+    target_longitudes = generator.uniform(-180, 180, 50)
+    targets = MultiLocationCheck(
+        latitudes=target_latitudes,
+        longitudes=target_longitudes,
+        distance_deviation_allowed=500,
+    )
+
+    # positions near the targets, including across the 180th meridian
+    latitudes = np.append(
+        target_latitudes[:20] + generator.normal(0, 3, 20), [0.0, 0.0, np.nan]
+    )
+    longitudes = np.append(
+        target_longitudes[:20] + generator.normal(0, 3, 20), [179.9, -179.9, 0.0]
+    )
+    out_of_range = targets.out_of_range(latitudes, longitudes)
+
+    # compare with a scalar location check of each position against all targets
+    for i_position in range(latitudes.size - 1):
+        distances = []
+        for latitude, longitude in zip(target_latitudes, target_longitudes):
+            location_check = LocationCheck(latitude=latitude, longitude=longitude)
+            location_check.out_of_range(latitudes[i_position], longitudes[i_position])
+            distances.append(location_check.distance)
+        assert_equal(targets.i_target[i_position], np.argmin(distances))
+        assert_almost_equal(targets.distance[i_position], np.min(distances), decimal=6)
+        assert_equal(out_of_range[i_position], np.min(distances) > 500)
+
+    # invalid positions are not out of range
+    assert_equal(targets.i_target[-1], -1)
+    assert_equal(out_of_range[-1], False)
+
+    # the target to the north is nearer on the ellipsoid, but not on the sphere
+    for n_candidates in (1, 2):
+        targets = MultiLocationCheck(
+            latitudes=[1.0, 0.0], longitudes=[0.0, 0.999], n_candidates=n_candidates
+        )
+        distance, i_target = targets.nearest_target(0.0, 0.0)
+        assert_equal(i_target, 0)
+        assert_almost_equal(distance, 110.574389, decimal=6)
+
+
+def test_vincenty_distance_and_bearing():
+    # the example of Vincenty (1975): Flinders Peak to Buninyong
+    latitude_1 = -(37 + 57 / 60 + 3.72030 / 3600)
+    longitude_1 = 144 + 25 / 60 + 29.52440 / 3600
+    latitude_2 = -(37 + 39 / 60 + 10.15610 / 3600)
+    longitude_2 = 143 + 55 / 60 + 35.38390 / 3600
+    distance, bearing = vincenty_distance_and_bearing(
+        latitude_1, longitude_1, latitude_2, longitude_2
+    )
+    assert_almost_equal(distance, 54972.271, decimal=3)
+    assert_almost_equal(bearing % 360, 306 + 52 / 60 + 5.37 / 3600, decimal=5)
+
+    # crossing the 180-meridian, coincident points and invalid coordinates
+    distance, bearing = vincenty_distance_and_bearing(
+        [0.0, 10.0, np.nan], [179.5, 4.0, 3.0], [0.0, 10.0, 55.0], [-179.5, 4.0, 3.0]
+    )
+    assert_almost_equal(distance[:2], [111319.491, 0.0], decimal=3)
+    assert_almost_equal(bearing[0], 90.0)
+    assert np.isnan(distance[2]) and np.isnan(bearing[2])
+
+
+def test_haversine_distance_and_bearing():
+    distance, bearing = haversine_distance_and_bearing(
+        [0.0, 0.0], [0.0, 10.0], [90.0, 0.0], [0.0, 9.0]
+    )
+    distance_expected = [np.pi / 2 * EARTH_RADIUS, np.pi / 180 * EARTH_RADIUS]
+    assert_almost_equal(distance, distance_expected)
+    assert_almost_equal(bearing, [0.0, -90.0])
+
+    # the same as vincenty within the flattening of the ellipsoid
+    distance_vincenty, _ = great_circle_distance_and_bearing(
+        0.0, 0.0, 90.0, 0.0, method="vincenty"
+    )
+    assert abs(distance[0] / distance_vincenty - 1) < 3.5e-3
+
+
+def test_travel_distance_and_heading_from_coordinates():
+    data = pd.DataFrame(
+        {
+            "GPS_LATITUDE": [55.4, 55.3, np.nan, 55.1, 55.0],
+            "GPS_LONGITUDE": [3.3, 3.3, 3.2, 3.1, 3.0],
+        }
+    )
+    data = travel_distance_and_heading_from_coordinates(data)
+
+    # the invalid row does not add to the travel distance. The next row is measured from
+    # the last valid row and both rows get the heading between the valid rows
+    assert_almost_equal(
+        data["travel_distance"].values,
+        [0.0, 6.011337, 6.011337, 19.861318, 26.792604],
+        decimal=6,
+    )
+    assert_almost_equal(
+        data["HEADING"].values,
+        [180.0, 209.850257, 209.850257, 209.902348, 209.902348],
+        decimal=6,
+    )
+    data_valid = travel_distance_and_heading_from_coordinates(data.drop(index=2))
+    assert_almost_equal(
+        data["travel_distance"].values[[0, 1, 3, 4]],
+        data_valid["travel_distance"].values,
+    )
+
+    data = travel_distance_and_heading_from_coordinates(data, method="haversine")
+    assert_almost_equal(data["HEADING"].values[0], 180.0)
+
+
+def test_process_trajectory_chunks():
+    generator = np.random.default_rng(1)
+    n_rows = 57
+    data = pd.DataFrame(
+        index=pd.date_range(start="20200101", periods=n_rows, freq="10min")
+    )
+    data["GPS_LATITUDE"] = 50 + np.cumsum(generator.normal(0, 0.02, n_rows))
+    data["GPS_LONGITUDE"] = 3 + np.cumsum(generator.normal(0, 0.02, n_rows))
+    data.iloc[[5, 6, 20, n_rows - 1], 0] = np.nan
+
+    for speed_max_clip in (None, 8.0):
+        data_expected = get_speed_from_distance_and_time(
+            travel_distance_and_heading_from_coordinates(data.copy()),
+            speed_max_clip=speed_max_clip,
+        )
+
+        # the result may not depend on the size of the chunks
+        for chunk_size in (1, 2, 7, n_rows, 100):
+            chunks = (
+                data.iloc[i_start : i_start + chunk_size]
+                for i_start in range(0, n_rows, chunk_size)
+            )
+            result = pd.concat(
+                process_trajectory_chunks(chunks, speed_max_clip=speed_max_clip)
+            )
+            assert_frame_equal(
+                result, data_expected, check_exact=True, check_freq=False
+            )
+
+
+def test_trajectories_by_vessel():
+    generator = np.random.default_rng(3)
+    vessels = []
+    for vessel_id, n_rows in zip([7, 3, 11, 5], [40, 1, 2, 25]):
+        vessel = pd.DataFrame(
+            index=pd.date_range(start="20200101", periods=n_rows, freq="10min")
+        )
+        vessel["MMSI"] = vessel_id
+        vessel["GPS_LATITUDE"] = 50 + np.cumsum(generator.normal(0, 0.02, n_rows))
+        vessel["GPS_LONGITUDE"] = 3 + np.cumsum(generator.normal(0, 0.02, n_rows))
+        if n_rows > 5:
+            vessel.iloc[[2, n_rows - 1], 1] = np.nan
+        vessels.append(vessel)
+
+    # interleave the vessels in order of time
+    data = pd.concat(vessels).sort_index(kind="stable")
+
+    for speed_max_clip, n_workers in ((None, None), (8.0, None), (8.0, 3)):
+        result = trajectories_by_vessel(
+            data, speed_max_clip=speed_max_clip, n_workers=n_workers
+        )
+
+        # the rows keep their order
+        assert_equal(result["MMSI"].values, data["MMSI"].values)
+
+        for vessel_id, vessel in data.groupby("MMSI"):
+            vessel_expected = get_speed_from_distance_and_time(
+                travel_distance_and_heading_from_coordinates(vessel.copy()),
+                speed_max_clip=speed_max_clip,
+            )
+            assert_frame_equal(
+                result[result["MMSI"] == vessel_id], vessel_expected, rtol=1e-12
+            )
+
+
 def main():
     test_import_way_points()
     test_import_way_points_interpolated()
     test_location_check()
+    test_multi_location_check()
+    test_vincenty_distance_and_bearing()
+    test_haversine_distance_and_bearing()
+    test_travel_distance_and_heading_from_coordinates()
+    test_process_trajectory_chunks()
+    test_trajectories_by_vessel()
 
 
 if __name__ == "__main__":
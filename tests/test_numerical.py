@@ -1,8 +1,11 @@
+import json
 import os
 import string
 
+import h5py
 import numpy as np
 import pandas as pd
+import scipy.io as spio
 import statsmodels.api as sm
 from numpy.testing import assert_almost_equal, assert_equal, assert_raises
 from scipy.interpolate import interp1d
@@ -15,8 +18,12 @@ from pymarine.utils.numerical import (
     get_column_with_max_cumulative_value,
     get_range_from_string,
     extrap1d,
+    interp1d_columns,
     loadmat,
+    nufft1d,
+    nufft2d,
     print_mat_nested,
+    searchsorted_columns,
 )
 
 DATA_DIR = "data"
@@ -164,6 +171,41 @@ def test_extrap1d():
     assert_almost_equal(yp_new, yp_exp)
 
 
+def test_searchsorted_columns():
+    rng = np.random.default_rng(1)
+    a = np.sort(rng.integers(0, 10, size=(12, 4)), axis=0)
+    v = rng.integers(-1, 11, size=(7, 4))
+
+    for side in ("left", "right"):
+        indices = searchsorted_columns(a, v, side=side)
+        for j_col in range(a.shape[1]):
+            indices_exp = np.searchsorted(a[:, j_col], v[:, j_col], side=side)
+            assert_equal(indices[:, j_col], indices_exp)
+
+    assert_raises(ValueError, searchsorted_columns, a, v, side="middle")
+
+
+def test_interp1d_columns():
+    rng = np.random.default_rng(2)
+    xp = rng.random((20, 3))
+    fp = rng.random((20, 3))
+    x = rng.uniform(-0.5, 1.5, size=(30, 3))
+
+    f_new = interp1d_columns(x, xp, fp)
+
+    for j_col in range(xp.shape[1]):
+        f_inter = interp1d(
+            xp[:, j_col], fp[:, j_col], bounds_error=False, fill_value="extrapolate"
+        )
+        assert_almost_equal(f_new[:, j_col], f_inter(x[:, j_col]))
+
+    # share the coordinates of the 3 columns over 5 columns of values
+    i_columns = np.array([2, 0, 0, 1, 2])
+    fp_shared = rng.random((20, 5))
+    f_new = interp1d_columns(x, xp, fp_shared, i_columns=i_columns)
+    assert_equal(f_new, interp1d_columns(x[:, i_columns], xp[:, i_columns], fp_shared))
+
+
 def test_load_matlab():
     # construct the matlab and netcdf data file name
     file_name = os.path.join(DATA_DIR, MATLAB_DATAFILE)
@@ -198,3 +240,74 @@ def test_load_matlab():
     print_mat_nested(data)
     print(data_nc.description)
     print(data_nc.description)
+
+
+def test_load_matlab_cache(tmp_path):
+    file_name = os.path.join(DATA_DIR, MATLAB_DATAFILE)
+    if not os.path.exists(file_name):
+        file_name = os.path.join("..", file_name)
+    data_expected = loadmat(filename=file_name)
+
+    # the first call creates the sidecar file, the second one reads it
+    for _ in range(2):
+        data = loadmat(filename=file_name, cache=True, cache_dir=str(tmp_path))
+        assert_equal(sorted(data.keys()), sorted(data_expected.keys()))
+        assert isinstance(data["RAO"], np.memmap)
+        assert_equal(data["RAO"], data_expected["RAO"])
+        assert_equal(data["DirRange"], data_expected["DirRange"])
+        assert_equal(data["__header__"], data_expected["__header__"])
+    assert_equal(len(os.listdir(tmp_path)), 1)
+
+    # nested structures are restored and a changed file replaces the sidecar
+    file_name = str(tmp_path / "nested.mat")
+    for value in (1.0, 2.0):
+        nested = {"a": np.arange(4.0) * value, "b": {"c": 1j * np.eye(2), "d": "text"}}
+        nested["e"] = np.array(["cell", np.arange(3)], dtype=object)
+        nested["f"] = [{"g": value, "h": "first"}, {"g": np.arange(2.0), "h": "last"}]
+        spio.savemat(file_name, {"s": nested})
+        os.utime(file_name, ns=(int(value * 1e9), int(value * 1e9)))
+        data = loadmat(filename=file_name, cache=True)
+        assert_equal(data["s"]["a"], nested["a"])
+        assert_equal(data["s"]["b"]["c"], nested["b"]["c"])
+        assert_equal(data["s"]["b"]["d"], "text")
+        assert_equal(data["s"]["e"][0], "cell")
+        assert_equal(data["s"]["e"][1], nested["e"][1])
+        # the elements of a structure array are restored as matlab structures
+        assert_equal(data["s"]["f"][0].g, value)
+        assert_equal(data["s"]["f"][0]._fieldnames, ["g", "h"])
+        assert_equal(data["s"]["f"][1].g, nested["f"][1]["g"])
+        assert_equal(data["s"]["f"][1].h, "last")
+    assert os.path.exists(file_name + ".cache.h5")
+
+    # the structure is stored as JSON instead of a pickle
+    with h5py.File(file_name + ".cache.h5", "r") as hf:
+        tree = json.loads(hf["tree"][()].tobytes())
+    assert_equal(sorted(tree["dict"].keys()), sorted(data.keys()))
+
+
+def test_nufft():
+    np.random.seed(0)
+    n_waves = 200
+    amplitudes = np.random.randn(n_waves) + 1j * np.random.randn(n_waves)
+    kx_nodes = np.random.uniform(-0.3, 0.3, n_waves)
+    ky_nodes = np.random.uniform(-0.2, 0.4, n_waves)
+
+    # compare with the direct DFT
+    xpoints = -50 + 2.5 * np.arange(101)
+    f_dft = np.dot(amplitudes, np.exp(1j * np.outer(kx_nodes, xpoints)))
+    for tolerance in (1e-6, 1e-12):
+        f_nufft = nufft1d(amplitudes, kx_nodes, -50, 2.5, 101, tolerance=tolerance)
+        error = abs(f_nufft - f_dft).max() / abs(f_dft).max()
+        assert error < 10 * tolerance
+
+    # leading dimensions are transformed separately
+    f_nufft = nufft1d(np.vstack((amplitudes, 2 * amplitudes)), kx_nodes, -50, 2.5, 101)
+    assert_almost_equal(f_nufft[1], 2 * f_nufft[0])
+
+    ypoints = 10 + 3 * np.arange(32)
+    xx, yy = np.meshgrid(xpoints, ypoints, indexing="ij")
+    f_dft = np.zeros(xx.shape, dtype=complex)
+    for amplitude, kx, ky in zip(amplitudes, kx_nodes, ky_nodes):
+        f_dft += amplitude * np.exp(1j * (kx * xx + ky * yy))
+    f_nufft = nufft2d(amplitudes, kx_nodes, ky_nodes, -50, 10, 2.5, 3, 101, 32)
+    assert abs(f_nufft - f_dft).max() / abs(f_dft).max() < 1e-9
@@ -0,0 +1,72 @@
+import os
+
+import numpy as np
+from numpy.testing import assert_almost_equal, assert_equal, assert_raises
+
+from pymarine.utils.numerical import loadmat
+from pymarine.waves.rao_dataset import RAODataset
+from pymarine.waves.wave_spectra import set_heading
+
+DATA_DIR = "data"
+NETCDF_DATAFILE = "RAO_7.nc"
+
+
+def get_file_name():
+    file_name = os.path.join(DATA_DIR, NETCDF_DATAFILE)
+    if not os.path.exists(file_name):
+        file_name = os.path.join("..", file_name)
+    return file_name
+
+
+def test_read_rao():
+    file_name = get_file_name()
+    data = loadmat(os.path.splitext(file_name)[0] + ".mat")
+    raos_expected = np.transpose(data["RAO"], (2, 1, 0))
+
+    with RAODataset(file_name) as dataset:
+        assert_equal(len(dataset.dof_names), 6)
+        assert_almost_equal(dataset.read_raos(), raos_expected)
+
+        frequency_slice = dataset.frequency_slice((0.2, 1.0))
+        assert_almost_equal(dataset.frequencies[frequency_slice][[0, -1]], [0.2, 1.0])
+
+        rao = dataset.read_rao(
+            "TowO_ACC_AZ", frequency_range=(0.2, 1.0), direction_indices=[5, 1]
+        )
+        assert_almost_equal(rao, raos_expected[2, frequency_slice][:, [5, 1]])
+
+        # only the directions required after the roll to the heading are read
+        rao_heading = set_heading(raos_expected, dataset.directions, heading=37)
+        for dof in range(6):
+            assert_almost_equal(
+                dataset.read_rao_at_heading(dof, 37, direction_indices=[0, 12]),
+                rao_heading[dof][:, [0, 12]],
+            )
+
+        assert_raises(ValueError, dataset.read_rao, "NO_DOF")
+
+
+def test_slab_cache():
+    with RAODataset(get_file_name(), max_cached_slabs=4) as dataset:
+        rao = dataset.read_rao(0, frequency_range=(0.5, 1.5), direction_indices=[3, 4])
+        assert_equal(dataset.n_cache_misses, 2)
+
+        # the same slabs are taken from the cache
+        rao_cached = dataset.read_rao(
+            0, frequency_range=(0.5, 1.5), direction_indices=[4, 3]
+        )
+        assert_equal(dataset.n_cache_hits, 2)
+        assert_equal(rao_cached, rao[:, ::-1])
+
+        # the least recently used slabs are removed from the cache
+        dataset.read_rao(1, direction_indices=[0, 1, 2])
+        assert_equal(len(dataset.slabs), 4)
+        frequency_slice = dataset.frequency_slice((0.5, 1.5))
+        band = (frequency_slice.start, frequency_slice.stop)
+        assert (dataset.dof_names[0], band, 3) not in dataset.slabs
+        assert (dataset.dof_names[0], band, 4) in dataset.slabs
+        dataset.read_rao(0, frequency_range=(0.5, 1.5), direction_indices=[3])
+        assert_equal(dataset.n_cache_misses, 6)
+
+        # a request larger than the cache
+        assert_equal(dataset.read_rao(2).shape, (250, 24))
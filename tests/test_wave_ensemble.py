@@ -0,0 +1,75 @@
+import numpy as np
+from numpy.testing import assert_almost_equal, assert_equal
+from pandas.testing import assert_frame_equal
+
+from pymarine.waves.wave_ensemble import WaveEnsemble
+from pymarine.waves.wave_fields import Wave1D, Wave2D
+
+
+def test_wave_ensemble_1d():
+    wave = Wave1D(Lx=1000, nx_points=128, n_kx_nodes=128)
+    ensemble = WaveEnsemble(wave, seeds=[1, 2, 3])
+
+    complex_amplitudes = ensemble.complex_amplitudes()
+    assert_equal(complex_amplitudes.shape, (3, 128))
+
+    # the realisation of a seed equals the wave with the same seed
+    assert_almost_equal(complex_amplitudes[0], wave.complex_amplitudes)
+    wave_3 = Wave1D(Lx=1000, nx_points=128, n_kx_nodes=128)
+    wave_3.seed = 3
+    wave_3.update_phase = True
+    wave_3.update_x_k_t_sample_space()
+    wave_3.calculate_spectra_modulus()
+    assert_almost_equal(complex_amplitudes[2], wave_3.complex_amplitudes)
+
+    surfaces = ensemble.surfaces(time=10.0)
+    assert_almost_equal(surfaces[2], wave_3.surface_at([10.0])[0])
+
+    # the statistics do not depend on the number of workers
+    times = np.arange(0, 50, 0.5)
+    statistics = ensemble.statistics(times=times)
+    assert_frame_equal(statistics, ensemble.statistics(times=times, n_workers=2))
+    assert_almost_equal(statistics.loc[3, "crest_max"], wave_3.surface_at(times).max())
+
+    # with a subrange of the wave nodes, the phases of a seed are selected from the
+    # phases of all the nodes, just as for the wave itself
+    waves = dict()
+    for seed in (1, 7):
+        waves[seed] = Wave1D(
+            Lx=1000,
+            nx_points=128,
+            n_kx_nodes=256,
+            wave_construction="DFTpolar",
+            wave_selection="Subrange",
+        )
+        waves[seed].seed = seed
+        waves[seed].update_phase = True
+        waves[seed].update_x_k_t_sample_space()
+        waves[seed].calculate_spectra_modulus()
+    assert waves[1].kx_nodes.size < 256
+    ensemble = WaveEnsemble(waves[1], seeds=[1, 7])
+    complex_amplitudes = ensemble.complex_amplitudes()
+    assert_almost_equal(complex_amplitudes[0], waves[1].complex_amplitudes)
+    assert_almost_equal(complex_amplitudes[1], waves[7].complex_amplitudes)
+
+
+def test_wave_ensemble_2d():
+    wave = Wave1D(Lx=1000, nx_points=64, n_kx_nodes=64)
+    wave2d = Wave2D(wave1D=wave, nx_points=32, ny_points=33)
+    ensemble = WaveEnsemble(wave2d, seeds=[4, 5])
+
+    complex_amplitudes = ensemble.complex_amplitudes()
+    assert_equal(complex_amplitudes.shape, (2, 32, 33))
+
+    # the spectrum is reused and the point symmetry A(-k) = A^*(k) is kept, so the
+    # inverse FFT of each realisation is real
+    for amplitudes in complex_amplitudes:
+        assert_almost_equal(abs(amplitudes), abs(wave2d.E_wave_complex_amplitudes))
+        assert_almost_equal(np.fft.ifft2(amplitudes).imag, 0)
+    assert not np.allclose(complex_amplitudes[0], complex_amplitudes[1])
+
+    # for the polar construction, the realisation equals the wave with the same seed
+    wave = Wave1D(Lx=1000, nx_points=64, n_kx_nodes=64, wave_construction="DFTpolar")
+    wave2d = Wave2D(wave1D=wave, nx_points=16, ny_points=16, n_theta_nodes=16)
+    ensemble = WaveEnsemble(wave2d, seeds=[wave.seed, 2])
+    assert_almost_equal(ensemble.surfaces()[0], wave2d.amplitude)
@@ -1,6 +1,8 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 from numpy.testing import (assert_almost_equal)
 
@@ -42,3 +44,312 @@ def test_wave_2d():
         # check the significant wave heigt from the amplitude
         hs_out = 4 * wave2d.amplitude.std()
         assert_almost_equal(hs_in, hs_out, decimal=1)
+
+
+def test_surface_at():
+    times = np.linspace(0, 5, 6)
+
+    for wave_construction in ("FFT", "DFTpolar", "DFTcartesian"):
+        wave1d = Wave1D(n_kx_nodes=128, Lx=1000, nx_points=128,
+                        wave_construction=wave_construction)
+
+        surfaces = wave1d.surface_at(times)
+        assert surfaces.shape == (times.size, wave1d.xpoints.size)
+
+        # the batched surfaces must be equal to the surfaces obtained per time step
+        for i_time, time in enumerate(times):
+            wave1d.time = time
+            wave1d.calculate_wave_surface()
+            assert_almost_equal(surfaces[i_time], wave1d.amplitude)
+
+    wave1d = Wave1D(n_kx_nodes=64, Lx=1000, nx_points=64)
+    wave2d = Wave2D(wave1D=wave1d, nx_points=32, ny_points=48)
+    surfaces = wave2d.surface_at(times)
+    assert surfaces.shape == (times.size, 32, 48)
+    for i_time, time in enumerate(times):
+        wave1d.time = time
+        wave2d.calculate_wave_surface()
+        assert_almost_equal(surfaces[i_time], wave2d.amplitude)
+
+
+def test_incremental_stepping():
+    n_steps = 250
+
+    for wave_construction in ("FFT", "DFTpolar"):
+        wave_exact = Wave1D(n_kx_nodes=128, Lx=1000, nx_points=128, delta_t=0.5,
+                            wave_construction=wave_construction,
+                            incremental_stepping=False)
+        wave_step = Wave1D(n_kx_nodes=128, Lx=1000, nx_points=128, delta_t=0.5,
+                           wave_construction=wave_construction, n_steps_reanchor=100)
+        for i_step in range(n_steps):
+            wave_exact.propagate_wave()
+            wave_step.propagate_wave()
+            assert_almost_equal(wave_step.amplitude, wave_exact.amplitude, decimal=10)
+
+    wave1d = Wave1D(n_kx_nodes=64, Lx=1000, nx_points=64, delta_t=0.5)
+    wave2d = Wave2D(wave1D=wave1d, nx_points=32, ny_points=32)
+    amplitudes = list()
+    for i_step in range(n_steps):
+        wave2d.propagate_wave()
+        amplitudes.append(wave2d.amplitude)
+    times = wave1d.delta_t * np.arange(1, n_steps + 1)
+    assert_almost_equal(np.array(amplitudes), wave2d.surface_at(times), decimal=10)
+
+    # amplitudes modified in place and assigned again re-anchor the phase rotation
+    wave_step = Wave1D(n_kx_nodes=128, Lx=1000, nx_points=128, delta_t=0.5)
+    for i_step in range(3):
+        wave_step.propagate_wave()
+    complex_amplitudes = wave_step.complex_amplitudes
+    complex_amplitudes *= 2
+    wave_step.complex_amplitudes = complex_amplitudes
+    wave_step.propagate_wave()
+    surface = wave_step.surface_at([wave_step.time])[0]
+    assert_almost_equal(wave_step.amplitude, surface, decimal=10)
+
+
+def test_dft_memory_budget():
+    times = np.linspace(0, 5, 3)
+    wave_full = Wave1D(n_kx_nodes=300, Lx=1000, nx_points=200,
+                       wave_construction="DFTpolar")
+    # a memory budget of 0.1 MB is too small for the 300 x 200 matrix exp(j k x)
+    wave_tiled = Wave1D(n_kx_nodes=300, Lx=1000, nx_points=200,
+                        wave_construction="DFTpolar", dft_memory_budget=0.1)
+    assert wave_full.exp_matrix_kx is not None
+    assert wave_tiled.exp_matrix_kx is None
+
+    wave_full.calculate_wave_surface()
+    wave_tiled.calculate_wave_surface()
+    assert_almost_equal(wave_tiled.amplitude, wave_full.amplitude)
+    assert_almost_equal(wave_tiled.surface_at(times), wave_full.surface_at(times))
+
+
+def test_half_spectrum():
+    # for an odd number of points there is no Nyquist bin, and the half spectrum carries
+    # the same random phases as the full spectrum, so the surfaces are equal
+    nx_points = 255
+    wave_full = Wave1D(n_kx_nodes=nx_points, Lx=1000, nx_points=nx_points)
+    wave_half = Wave1D(n_kx_nodes=nx_points, Lx=1000, nx_points=nx_points,
+                       half_spectrum=True)
+    assert wave_half.complex_amplitudes.size == nx_points // 2 + 1
+    for time in (0.0, 5.0):
+        wave_full.time = time
+        wave_half.time = time
+        wave_full.calculate_wave_surface()
+        wave_half.calculate_wave_surface()
+        assert_almost_equal(wave_half.amplitude, wave_full.amplitude)
+
+    hs_in = 3.0
+    wave1d = Wave1D(Hs=hs_in, n_kx_nodes=128, Lx=1000, nx_points=128,
+                    half_spectrum=True)
+    wave2d = Wave2D(wave1D=wave1d)
+    assert wave2d.E_wave_complex_amplitudes.shape == (64, 33)
+    assert wave2d.amplitude.shape == (64, 64)
+    assert_almost_equal(hs_in, 4 * wave2d.amplitude.std(), decimal=1)
+    assert_almost_equal(wave2d.surface_at([0.0])[0], wave2d.amplitude)
+
+    # the waves travelling into -y are kept as well, so for all headings the half
+    # spectrum gives the wave field of the full spectrum
+    wave1d_full = Wave1D(Hs=hs_in, n_kx_nodes=128, Lx=1000, nx_points=128)
+    for theta_0 in (np.pi / 4, np.pi / 2, -np.pi / 2, np.pi):
+        wave2d_full = Wave2D(wave1D=wave1d_full, Theta_0=theta_0)
+        wave2d_half = Wave2D(wave1D=wave1d, Theta_0=theta_0)
+        hs_full = 4 * wave2d_full.amplitude.std()
+        assert_almost_equal(4 * wave2d_half.amplitude.std(), hs_full)
+        assert_almost_equal(hs_in, hs_full, decimal=1)
+        assert_almost_equal(wave2d_half.amplitude, wave2d_full.amplitude)
+        assert_almost_equal(wave2d_half.surface_at([5.0]),
+                            wave2d_full.surface_at([5.0]))
+
+
+def test_nufft_polar():
+    times = np.linspace(0, 5, 3)
+    for wave_selection in ("All", "Subrange"):
+        wave_dft = Wave1D(n_kx_nodes=256, Lx=1000, nx_points=200,
+                          wave_construction="DFTpolar", wave_selection=wave_selection)
+        wave_nufft = Wave1D(n_kx_nodes=256, Lx=1000, nx_points=200,
+                            wave_construction="NUFFTpolar",
+                            wave_selection=wave_selection)
+        wave_dft.calculate_wave_surface()
+        wave_nufft.calculate_wave_surface()
+        assert_almost_equal(wave_nufft.amplitude, wave_dft.amplitude)
+        assert_almost_equal(wave_nufft.surface_at(times), wave_dft.surface_at(times))
+
+    wave1d_dft = Wave1D(n_kx_nodes=64, Lx=1000, nx_points=64,
+                        wave_construction="DFTpolar")
+    wave1d_nufft = Wave1D(n_kx_nodes=64, Lx=1000, nx_points=64,
+                          wave_construction="NUFFTpolar")
+    wave2d_dft = Wave2D(wave1D=wave1d_dft, nx_points=32, ny_points=48,
+                        n_theta_nodes=30)
+    wave2d_nufft = Wave2D(wave1D=wave1d_nufft, nx_points=32, ny_points=48,
+                          n_theta_nodes=30)
+    assert_almost_equal(wave2d_nufft.amplitude, wave2d_dft.amplitude)
+
+
+def test_dft_cartesian_separable():
+    # the separable DFT on the cartesian mesh must reproduce the FFT of the spectrum
+    times = np.linspace(0, 5, 3)
+    waves = dict()
+    for wave_construction in ("FFT", "DFTcartesian"):
+        wave1d = Wave1D(n_kx_nodes=64, Lx=1000, nx_points=64,
+                        wave_construction=wave_construction)
+        waves[wave_construction] = Wave2D(wave1D=wave1d, nx_points=32, ny_points=48)
+
+    assert_almost_equal(waves["DFTcartesian"].amplitude, waves["FFT"].amplitude)
+    assert_almost_equal(waves["DFTcartesian"].surface_at(times),
+                        waves["FFT"].surface_at(times))
+
+
+def test_dft_polar_blocks():
+    wave1d = Wave1D(n_kx_nodes=32, Lx=1000, nx_points=32, wave_construction="DFTpolar")
+    wave1d.time = 3.0
+    # a budget of 0.01 MB forces both blocks of wave vectors and tiles of x points
+    wave2d = Wave2D(wave1D=wave1d, nx_points=24, ny_points=20, n_theta_nodes=16,
+                    dft_memory_budget=0.01)
+    wave2d.calculate_wave_surface()
+
+    # compare with the sum over all the wave components one by one
+    kx_mesh, ky_mesh = wave2d.k_cartesian_mesh
+    x_mesh, y_mesh = wave2d.xy_mesh
+    amplitude = np.zeros(x_mesh.shape)
+    for a_k, kx, ky, omega in zip(wave2d.E_wave_complex_amplitudes.ravel(),
+                                  kx_mesh.ravel(), ky_mesh.ravel(),
+                                  wave2d.omega_dispersion.ravel()):
+        amplitude += np.real(a_k * np.exp(1j * (kx * x_mesh + ky * y_mesh
+                                                - omega * wave1d.time)))
+    assert_almost_equal(wave2d.amplitude, amplitude)
+
+
+def test_sharded_dft():
+    for wave_construction in ("DFTpolar", "DFTcartesian"):
+        wave1d = Wave1D(
+            n_kx_nodes=32, Lx=1000, nx_points=32, wave_construction=wave_construction
+        )
+        wave2d = Wave2D(wave1D=wave1d, nx_points=24, ny_points=20, n_theta_nodes=16)
+        amplitude_serial = wave2d.amplitude.copy()
+
+        # the sharded result does not depend on the number of workers, bit for bit
+        amplitudes = list()
+        for n_workers in (1, 2, 3):
+            wave2d.calculate_wave_surface(n_workers=n_workers)
+            amplitudes.append(wave2d.amplitude.copy())
+        wave2d.close()
+        for amplitude in amplitudes[1:]:
+            assert np.array_equal(amplitude, amplitudes[0])
+        assert_almost_equal(amplitudes[0], amplitude_serial)
+
+    # the pool is created once and reused for all the time steps
+    wave1d = Wave1D(n_kx_nodes=32, Lx=1000, nx_points=32, wave_construction="DFTpolar")
+    with Wave2D(wave1D=wave1d, nx_points=24, ny_points=20, n_workers=2) as wave2d:
+        pool = wave2d._dft_pool
+        for i_step in range(3):
+            wave2d.propagate_wave()
+        assert pool is not None and wave2d._dft_pool is pool
+    assert wave2d._dft_pool is None
+
+
+def test_single_precision():
+    for wave_construction in ("FFT", "DFTpolar"):
+        waves = dict()
+        for precision in ("double", "single"):
+            waves[precision] = Wave1D(
+                Hs=3.0,
+                n_kx_nodes=256,
+                Lx=2000,
+                nx_points=256,
+                wave_construction=wave_construction,
+                precision=precision,
+            )
+        for i_step in range(150):
+            for wave in waves.values():
+                wave.propagate_wave()
+        assert waves["single"].complex_amplitudes.dtype == np.complex64
+        assert waves["single"].amplitude.dtype == np.float32
+
+        # the significant wave height in single precision agrees within 1e-5 m
+        hs_double = 4 * waves["double"].amplitude.std()
+        hs_single = 4 * waves["single"].amplitude.std()
+        assert abs(hs_single - hs_double) < 1e-5
+        assert_almost_equal(waves["single"].amplitude, waves["double"].amplitude, 4)
+
+        wave2d_double = Wave2D(wave1D=waves["double"], nx_points=32, ny_points=32)
+        wave2d_single = Wave2D(wave1D=waves["single"], nx_points=32, ny_points=32)
+        assert wave2d_single.amplitude.dtype == np.float32
+        assert wave2d_single.xy_mesh[0].dtype == np.float32
+        assert wave2d_single.E_wave_complex_amplitudes.dtype == np.complex64
+        hs_double = 4 * wave2d_double.amplitude.std()
+        hs_single = 4 * wave2d_single.amplitude.std()
+        assert abs(hs_single - hs_double) < 1e-5
+
+
+def test_fft_padding():
+    wave = Wave1D(Lx=1000, nx_points=251, fft_padding=True)
+    wave_ref = Wave1D(Lx=1000, nx_points=251)
+
+    # the domain and resolution are kept, only the internal FFT size is increased
+    assert wave.nx_fft == 252
+    assert wave.kx_nodes.size == wave.nx_fft
+    assert_almost_equal(wave.xpoints, wave_ref.xpoints)
+    assert_almost_equal(wave.delta_x, wave_ref.delta_x)
+
+    # the cropped FFT equals the DFT of the same wave vectors at the domain points
+    wave.calculate_wave_surface()
+    assert wave.amplitude.shape == (251,)
+    dft = 0.5 * Wave1D.dft_complex_amplitudes(
+        wave.complex_amplitudes,
+        None,
+        wave.omega_dispersion,
+        0.0,
+        kx_nodes=wave.kx_nodes,
+        xpoints=wave.xpoints,
+    )
+    assert_almost_equal(wave.amplitude, dft)
+    assert_almost_equal(wave.surface_at([0.0])[0], wave.amplitude)
+
+    wave2d = Wave2D(wave1D=wave, nx_points=251, ny_points=127)
+    assert (wave2d.nx_fft, wave2d.ny_fft) == (252, 128)
+    assert wave2d.amplitude.shape == (251, 127)
+    assert_almost_equal(wave2d.surface_at([0.0])[0], wave2d.amplitude)
+
+
+def test_equal_energy_bins():
+    waves = dict()
+    for solver in ("table", "fsolve"):
+        waves[solver] = Wave1D(
+            wave_construction="DFTpolar",
+            wave_selection="EqualEnergyBins",
+            n_bins_equal_energy=64,
+            use_subrange_energy_limits=True,
+            equal_energy_solver=solver,
+        )
+    # the inverse of the cumulative energy table gives the nodes solved by fsolve
+    assert_almost_equal(waves["table"].kx_nodes, waves["fsolve"].kx_nodes, decimal=5)
+
+    # the locked nodes are the nearest nodes of the full wave vector domain
+    settings = dict(wave_construction="DFTpolar", wave_selection="EqualEnergyBins")
+    wave = Wave1D(lock_nodes_to_wave_one=False, **settings)
+    wave_locked = Wave1D(lock_nodes_to_wave_one=True, **settings)
+    kx_nodes_full = np.linspace(wave.kx_min, wave.kx_max, wave.n_kx_nodes)
+    distance = np.abs(kx_nodes_full.reshape(-1, 1) - wave.kx_nodes.reshape(1, -1))
+    kx_nodes_nearest = np.unique(kx_nodes_full[np.argmin(distance, axis=0)])
+    assert_almost_equal(wave_locked.kx_nodes, kx_nodes_nearest)
+
+
+def test_concurrent_construction():
+    # the phases are drawn from the generator of each wave, so waves constructed
+    # concurrently in threads equal the ones constructed sequentially
+    def wave_of_seed(seed):
+        wave = Wave1D(Lx=1000, nx_points=128, n_kx_nodes=128)
+        wave.seed = seed
+        wave.update_phase = True
+        wave.update_x_k_t_sample_space()
+        wave.calculate_spectra_modulus()
+        wave2d = Wave2D(wave1D=wave, nx_points=16, ny_points=16)
+        return wave.complex_amplitudes, wave2d.E_wave_complex_amplitudes
+
+    seeds = list(range(1, 9))
+    expected = [wave_of_seed(seed) for seed in seeds]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(wave_of_seed, seeds))
+    for result, result_expected in zip(results, expected):
+        assert_almost_equal(result[0], result_expected[0])
+        assert_almost_equal(result[1], result_expected[1])
@@ -0,0 +1,82 @@
+import os
+
+import numpy as np
+from numpy.testing import assert_almost_equal, assert_equal, assert_raises
+from scipy.integrate import trapezoid
+
+from pymarine.utils.numerical import loadmat
+from pymarine.waves.wave_responses import (
+    RAOResponse,
+    rolled_direction_views,
+    spectral_moments,
+)
+from pymarine.waves.wave_spectra import set_heading, spectrum_jonswap
+
+DATA_DIR = "data"
+MATLAB_DATAFILE = "RAO_7.mat"
+
+
+def load_raos():
+    file_name = os.path.join(DATA_DIR, MATLAB_DATAFILE)
+    if not os.path.exists(file_name):
+        file_name = os.path.join("..", file_name)
+    data = loadmat(filename=file_name)
+
+    # the RAO data is stored as n_directions x n_omega x n_dof
+    raos = np.transpose(data["RAO"], (2, 1, 0))
+    return raos, data["FreqRange"], np.deg2rad(data["DirRange"])
+
+
+def test_rolled_direction_views():
+    data = np.arange(12.0).reshape(2, 6)
+    shifts = [0, 2, -1, 7]
+
+    rolled = rolled_direction_views(data, shifts)
+    assert_equal(rolled.shape, (2, 4, 6))
+    for i_shift, shift in enumerate(shifts):
+        assert_equal(rolled[:, i_shift], np.roll(data, -shift, axis=-1))
+
+
+def test_spectral_moments():
+    frequencies = np.linspace(0.1, 2.0, 40)
+    spectra = np.stack([np.exp(-frequencies), np.exp(-2 * frequencies)])
+
+    moments = spectral_moments(spectra, frequencies, orders=(0, 2))
+    assert_equal(moments.shape, (2, 2))
+    for i_spectrum, spectrum in enumerate(spectra):
+        assert_almost_equal(moments[0, i_spectrum], trapezoid(spectrum, frequencies))
+        assert_almost_equal(
+            moments[1, i_spectrum], trapezoid(frequencies**2 * spectrum, frequencies)
+        )
+
+
+def test_rao_response():
+    raos, frequencies, directions = load_raos()
+    headings = np.array([0, 10, 45, 190, 270, 355])
+    response = RAOResponse(raos, frequencies, directions, headings)
+
+    spreading = np.cos((directions - 1) / 2) ** 2
+    spectrum_2d = spectrum_jonswap(frequencies, Hs=3, Tp=9)[:, None] * spreading
+    response_spectra = response.response_spectra(spectrum_2d)
+    assert_equal(response_spectra.shape, (6, 6, frequencies.size))
+
+    # the same as rolling the RAOs for each heading with set_heading
+    delta_direction = 2 * np.pi / directions.size
+    for i_heading, heading in enumerate(headings):
+        rao_heading = set_heading(raos, directions, heading)
+        response_expected = (abs(rao_heading) ** 2 * spectrum_2d).sum(axis=-1)
+        assert_almost_equal(
+            response_spectra[i_heading], response_expected * delta_direction
+        )
+
+    # a stack of spectra gives the responses of all the sea states
+    spectra = np.stack([spectrum_2d, 4 * spectrum_2d])
+    moments = response.spectral_moments(spectra, orders=(0, 2))
+    assert_equal(moments.shape, (2, 2, 6, 6))
+    assert_almost_equal(moments[:, 1], 4 * moments[:, 0])
+    assert_almost_equal(
+        response.significant_amplitudes(spectra)[0], 2 * np.sqrt(moments[0, 0])
+    )
+
+    assert_raises(ValueError, RAOResponse, raos[0], frequencies, directions, headings)
+    assert_raises(ValueError, RAOResponse, raos, frequencies[1:], directions, headings)
@@ -2,10 +2,14 @@
 import numpy as np
 from numpy import pi
 from numpy.testing import assert_almost_equal, assert_equal
+from scipy.integrate import quad
 
+from pymarine.utils.numerical import find_idx_nearest_val
 from pymarine.waves.wave_spectra import (
     alpha_jonswap,
     d_omega_e_prime,
+    equal_energy_k_nodes,
+    heading_roll_indices,
     initialize_phase,
     mask_out_of_range,
     omega_critical,
@@ -13,12 +17,17 @@ from pymarine.waves.wave_spectra import (
     omega_e_vs_omega,
     omega_peak_jonswap,
     omega_vs_omega_e,
+    omega_vs_omega_e_array,
+    phase_generator,
     rayleigh_cdf,
     rayleigh_pdf,
     set_heading,
     specspecs,
     spectrum2d_complex_amplitudes,
+    spectrum2d_complex_amplitudes_half_plane,
     spectrum2d_to_spectrum2d_encountered,
+    spectrum2d_to_spectrum2d_encountered_grid,
+    spectrum_complex_amplitudes_on_k_mesh,
     spectrum_gauss,
     spectrum_jonswap,
     spectrum_jonswap_k_domain_2,
@@ -273,6 +282,25 @@ def test_omega_deep_water():
     assert_almost_equal(result, result_expected)
 
 
+def test_equal_energy_k_nodes():
+    k_nodes = equal_energy_k_nodes(
+        k_start=0.0, k_end=pi / 2, energy_per_bin=0.01, Hs=3.0, Tp=10.0
+    )
+    assert_almost_equal(k_nodes[0], 0.0)
+    assert k_nodes[-1] < pi / 2
+    assert np.all(np.diff(k_nodes) > 0)
+
+    # the total energy Hs^2/16 = 0.5625 holds 56 bins of 0.01
+    assert_equal(k_nodes.size, 57)
+
+    # the energy of all the bins follows from the integral of the spectrum
+    energy_per_bin = [
+        quad(spectrum_wave_k_domain, k_0, k_1, args=(3.0, 10.0))[0]
+        for k_0, k_1 in zip(k_nodes[:-1], k_nodes[1:])
+    ]
+    assert_almost_equal(energy_per_bin, 0.01, decimal=5)
+
+
 def test_spectrum_jonswap_k_domain():
     n_size = 10
     wave_numbers = np.linspace(0, 2 * np.pi / 100, n_size)
@@ -376,6 +404,21 @@ def test_initialize_phase():
     assert_almost_equal(result, result_expected)
 
 
+def test_phase_generator():
+    wave_numbers = np.linspace(0, 2 * np.pi / 100, 10)
+    global_state = np.random.get_state()[1].copy()
+
+    # the same seed gives the same phases, another spawn key an independent stream
+    phase = initialize_phase(wave_numbers, rng=phase_generator(seed=1))
+    assert_almost_equal(phase, initialize_phase(wave_numbers, rng=phase_generator(1)))
+    phase_spawned = initialize_phase(wave_numbers, rng=phase_generator(1, (1,)))
+    assert not np.allclose(phase, phase_spawned)
+    assert np.all((phase >= 0) & (phase < 2 * pi))
+
+    # the global random state of numpy is not used
+    assert_equal(np.random.get_state()[1], global_state)
+
+
 def test_spectrum_to_complex_amplitudes():
     n_size = 10
     wave_numbers = np.linspace(0, 2 * np.pi / 100, n_size)
@@ -439,6 +482,34 @@ def test_spectrum_to_complex_amplitudes_mirror():
     assert_almost_equal(result, result_expected)
 
 
+def test_spectrum_complex_amplitudes_on_k_mesh():
+    kx_nodes = 2 * pi * np.fft.fftfreq(9, 10.0)
+    ky_nodes = 2 * pi * np.fft.fftfreq(6, 12.0)
+    ak = spectrum_complex_amplitudes_on_k_mesh(
+        kx_nodes, ky_nodes, Hs=2.0, theta_0=pi / 4, seed=3
+    )
+
+    # compare with the spectrum evaluated node by node, drawing the phases with ky in
+    # the outer loop and kx in the inner loop and skipping the origin
+    np.random.seed(3)
+    dkxdky = kx_nodes[1] * ky_nodes[1]
+    ak_exp = np.zeros((kx_nodes.size, ky_nodes.size), complex)
+    for j, ky in enumerate(ky_nodes):
+        for i, kx in enumerate(kx_nodes):
+            kk = np.sqrt(kx**2 + ky**2)
+            if kk == 0:
+                continue
+            theta = pi / 2 - np.arctan2(ky, kx)
+            d_spread = spreading_function(theta=theta, theta0=pi / 4) / kk
+            spectrum = spectrum_wave_k_domain(kk, Hs=2.0)
+            phase = 2 * pi * np.random.random()
+            ak_exp[i, j] = np.sqrt(2 * spectrum * d_spread * dkxdky)[0] * np.exp(
+                1j * phase
+            )
+
+    assert_almost_equal(ak, ak_exp)
+
+
 def test_jonswap2D_complex_amplitudes():
     n_size = 4
     wave_numbers_x = np.linspace(0, 2 * np.pi / 100.0, n_size)
@@ -559,6 +630,23 @@ def test_jonswap2D_complex_amplitudes():
                 check_symmetry(nx, ny, theta_zero=theta_0)
 
 
+def test_jonswap2D_complex_amplitudes_half_plane():
+    for nx, ny in [(16, 16), (17, 16), (16, 17), (17, 17)]:
+        kx_nodes = 2 * np.pi * np.fft.fftfreq(nx, 10.0)
+        ky_nodes = 2 * np.pi * np.fft.rfftfreq(ny, 10.0)
+        ak, os = spectrum2d_complex_amplitudes_half_plane(
+            kx_nodes=kx_nodes, ky_nodes=ky_nodes, ny_points=ny, Theta_0=pi / 6, seed=1
+        )
+        assert_equal(ak.shape, (nx, ny // 2 + 1))
+
+        # the column ky=0 (and the Nyquist column for even ny) must be hermitian in kx
+        columns = [0, -1] if ny % 2 == 0 else [0]
+        for j_col in columns:
+            i_pos = np.arange(1, (nx + 1) // 2)
+            assert_almost_equal(ak[i_pos, j_col], np.conj(ak[nx - i_pos, j_col]))
+            assert_equal(os[i_pos, j_col] * os[nx - i_pos, j_col], -1)
+
+
 def test_omega_e_vs_omega():
     n_size = 10
     frequencies = np.linspace(0, 2.5, n_size)
@@ -625,6 +713,20 @@ def test_omega_vs_omega_e():
     assert_almost_equal(result, result_expected)
 
 
+def test_omega_vs_omega_e_array():
+    omega = np.array([0.1, 1.2, 5.0, 1.2])
+    velocity = np.array([1.2, 1.2, 1.2, 0.0])
+
+    omega1, omega2 = omega_vs_omega_e_array(omega, velocity)
+
+    # the same solutions as the scalar version, with NaN in case no solution exists
+    for i_om in range(omega.size):
+        om1_exp, om2_exp = omega_vs_omega_e(omega[i_om], velocity[i_om])
+        om1_exp = np.nan if om1_exp is None else om1_exp
+        om2_exp = np.nan if om2_exp is None else om2_exp
+        assert_almost_equal([omega1[i_om], omega2[i_om]], [om1_exp, om2_exp])
+
+
 def test_spectrum_to_spectrum_encountered():
     n_size = 4
     frequencies = np.linspace(0, 2.5, n_size)
@@ -665,6 +767,38 @@ def test_spectrum2d_to_spectrum2d_encountered():
     assert_almost_equal(result, result_expected)
 
 
+def test_spectrum2d_to_spectrum2d_encountered_grid():
+    frequencies = np.linspace(0.05, 2.5, 50)
+    directions = np.linspace(0, 2 * pi, 12, endpoint=False)
+    ff_2d, dd_2d = np.meshgrid(frequencies, directions, indexing="ij")
+    s_2d = spectrum_jonswap(frequencies, Hs=2, Tp=8)[:, None] * np.cos(dd_2d / 2) ** 2
+
+    velocities = np.array([0.0, 2.0, 6.0])
+    headings = np.deg2rad([0.0, 30.0, 45.0, 180.0])
+
+    result = spectrum2d_to_spectrum2d_encountered_grid(
+        spectrum_2d=s_2d,
+        frequencies=ff_2d,
+        directions=dd_2d,
+        velocities=velocities,
+        headings=headings,
+        n_speeds_chunk=2,
+    )
+    assert_equal(result.shape, (3, 4, 50, 12))
+
+    # each pair equals the spectrum encountered with the directions relative to the
+    # heading
+    for i_speed, velocity in enumerate(velocities):
+        for j_heading, heading in enumerate(headings):
+            result_expected = spectrum2d_to_spectrum2d_encountered(
+                spectrum_2d=s_2d,
+                frequencies=ff_2d,
+                directions=dd_2d - heading,
+                velocity=velocity,
+            )
+            assert_almost_equal(result[i_speed, j_heading], result_expected)
+
+
 def test_mask_out_of_range():
     n_size = 20
     wave_numbers = np.linspace(0, 2 * np.pi / 100, n_size)
@@ -830,6 +964,23 @@ def test_set_heading():
     assert_almost_equal(result, result_expected)
 
 
+def test_heading_roll_indices():
+    directions = np.deg2rad(np.arange(0, 360, 15))
+    headings = np.arange(-400.0, 400.0, 7.5)
+
+    indices = heading_roll_indices(directions, headings)
+    for heading, index in zip(headings, indices):
+        assert_equal(index, heading_roll_indices(directions, heading))
+
+    # the direction nearest to the reversed heading
+    dir_in_range = np.angle(np.exp(1j * directions))
+    for heading, index in zip(headings, indices):
+        heading_in_range = np.angle(np.exp(1j * np.deg2rad(heading + 180)))
+        assert_equal(index, find_idx_nearest_val(dir_in_range, heading_in_range))
+
+    assert_equal(heading_roll_indices(directions, 10.0, heading_reverse=False), 1)
+
+
 def main():
     """
     Run all the unit test here.
@@ -845,21 +996,27 @@ def main():
     test_spectrum_gauss()
     test_spectrum_jonswap()
     test_omega_deep_water()
+    test_equal_energy_k_nodes()
     test_spectrum_jonswap_k_domain()
     test_spectrum_to_complex_amplitudes()
+    test_spectrum_complex_amplitudes_on_k_mesh()
     test_jonswap2D_complex_amplitudes()
+    test_jonswap2D_complex_amplitudes_half_plane()
     test_omega_e_vs_omega()
     test_d_omega_e_prime()
     test_omega_critical()
     test_omega_vs_omega_e()
+    test_omega_vs_omega_e_array()
     test_spectrum_to_spectrum_encountered()
     test_spectrum2d_to_spectrum2d_encountered()
+    test_spectrum2d_to_spectrum2d_encountered_grid()
     test_mask_out_of_range()
     test_specspecs()
     test_thetaspreadspecs()
     test_rayleigh_pdf()
     test_rayleigh_cdf()
     test_set_heading()
+    test_heading_roll_indices()
 
 
 if __name__ == "__main__":